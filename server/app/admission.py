@@ -0,0 +1,213 @@
+"""Module for admission control of requests by route class."""
+
+from asyncio import Semaphore
+from asyncio import TimeoutError as AsyncTimeoutError
+from asyncio import wait_for
+
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.project_logger import project_logger
+from app.schemas import tuning_settings
+
+FEED_READS_ROUTE_CLASS = "feed_reads"
+WRITES_ROUTE_CLASS = "writes"
+MEDIA_UPLOADS_ROUTE_CLASS = "media_uploads"
+READ_HTTP_METHODS = frozenset(("GET", "HEAD"))
+overloaded_message = {
+    "result": False,
+    "error_type": "Service Unavailable",
+    "error_message": "Server is overloaded, please retry later!",
+}
+
+
+class AdmissionLimiter:
+    """Class AdmissionLimiter.
+
+    Limit number of requests in flight. Requests over the limit wait in the
+    bounded queue for a free slot, requests over the queue size or waiting
+    longer than queue timeout are rejected.
+
+    Attributes:
+        limit (int): max number of requests in flight
+        queue_size (int): max number of waiting requests
+        queue_timeout (float): max time of waiting in queue in seconds
+        in_flight (int): number of requests in flight
+        waiting (int): number of waiting requests
+        rejected (int): total number of rejected requests
+
+    """
+
+    def __init__(
+        self, limit: int, queue_size: int, queue_timeout: float,
+    ) -> None:
+        """Init limiter.
+
+        Args:
+            limit (int): max number of requests in flight
+            queue_size (int): max number of waiting requests
+            queue_timeout (float): max time of waiting in queue in seconds
+
+        """
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._semaphore = Semaphore(limit)
+
+    async def acquire(self) -> bool:
+        """Take slot for request, wait in queue if there is no free slot.
+
+        Returns:
+            bool : True if slot is taken else False
+
+        """
+        if self._semaphore.locked():
+            if self.waiting >= self.queue_size:
+                self.rejected += 1
+                return False
+            self.waiting += 1
+            try:
+                await wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except AsyncTimeoutError:
+                self.rejected += 1
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        """Free slot of finished request."""
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        """Get limiter statistics.
+
+        Returns:
+            dict : in flight, waiting and rejected requests
+
+        """
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+        }
+
+
+def get_route_class(scope: Scope) -> str:
+    """Get route class of request.
+
+    Args:
+        scope (Scope): connection scope
+
+    Returns:
+        str : media uploads, feed reads or writes route class
+
+    """
+    if scope["path"].startswith("/api/medias"):
+        return MEDIA_UPLOADS_ROUTE_CLASS
+    elif scope["method"] in READ_HTTP_METHODS:
+        return FEED_READS_ROUTE_CLASS
+    return WRITES_ROUTE_CLASS
+
+
+def create_admission_limiters() -> dict[str, AdmissionLimiter]:
+    """Create limiters of route classes from tuning settings.
+
+    Returns:
+        dict[str, AdmissionLimiter] : limiters by route class
+
+    """
+    limits = {
+        FEED_READS_ROUTE_CLASS: tuning_settings.admission_feed_reads_limit,
+        WRITES_ROUTE_CLASS: tuning_settings.admission_writes_limit,
+        MEDIA_UPLOADS_ROUTE_CLASS: (
+            tuning_settings.admission_media_uploads_limit
+        ),
+    }
+    return {
+        route_class: AdmissionLimiter(
+            limit,
+            tuning_settings.admission_queue_size,
+            tuning_settings.admission_queue_timeout,
+        )
+        for route_class, limit in limits.items()
+    }
+
+
+class AdmissionMiddleware:
+    """Class AdmissionMiddleware, pure ASGI middleware.
+
+    Pass http request to application if limiter of its route class has a
+    free slot or a slot is freed while request waits in queue. Else send
+    response 503 with header 'Retry-After', so overflow is shed fast instead
+    of piling onto db connection pool.
+
+    Attributes:
+        app (ASGIApp): wrapped ASGI application
+        limiters (dict[str, AdmissionLimiter]): limiters by route class
+        retry_after (int): seconds to retry after for rejected request
+
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiters: dict[str, AdmissionLimiter],
+        retry_after: int,
+    ) -> None:
+        """Init middleware.
+
+        Args:
+            app (ASGIApp): wrapped ASGI application
+            limiters (dict[str, AdmissionLimiter]): limiters by route class
+            retry_after (int): seconds to retry after for rejected request
+
+        """
+        self.app = app
+        self.limiters = limiters
+        self.retry_after = retry_after
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send,
+    ) -> None:
+        """Admit http request or reject it if server is overloaded.
+
+        Args:
+            scope (Scope): connection scope
+            receive (Receive): ASGI receive channel
+            send (Send): ASGI send channel
+
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route_class = get_route_class(scope)
+        limiter = self.limiters[route_class]
+        if not await limiter.acquire():
+            project_logger.info(
+                f"Rejected {route_class=}: {limiter.stats()}",
+            )
+            response = JSONResponse(
+                content=overloaded_message,
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        # Slot is freed even if application raises
+        try:  # noqa: WPS501
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+admission_limiters = create_admission_limiters()
+ADMISSION_RETRY_AFTER = tuning_settings.admission_retry_after
@@ -0,0 +1,138 @@
+"""Module for authentication of requests by header 'api-key'."""
+
+from typing import Annotated, Iterable, Optional
+
+from fastapi import Depends, Header, Request
+from fastapi.responses import JSONResponse
+from starlette.datastructures import URL, Headers
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.cache import api_key_cache, unknown_api_key_cache
+from app.models.users import User
+from app.project_logger import project_logger
+from app.schemas import Principal
+
+unauthorized_message = {
+    "result": False,
+    "error_type": "Unauthorized",
+    "error_message": "You don't have permission to visit website!",
+}
+
+
+async def get_principal_by_api_key(api_key: str) -> Optional[Principal]:
+    """Get principal of user registered with name 'api_key'.
+
+    Known api keys are cached with their principals and unknown api keys are
+    cached for a short time, so db is queried only on cache miss.
+
+    Args:
+        api_key (str): value of header 'api-key'
+
+    Returns:
+        Optional[Principal] : principal if user is registered else None
+
+    """
+    principal = api_key_cache.get(api_key)
+    if principal is not None:
+        return principal
+    if unknown_api_key_cache.get(api_key):
+        return None
+    project_logger.info(f"Api key cache miss: {api_key_cache.stats()}")
+    user_id = await User.get_user_id_by_name(api_key)
+    if user_id is None:
+        unknown_api_key_cache.set(api_key, cache_value=True)
+        return None
+    principal = Principal(id=user_id, name=api_key)
+    api_key_cache.set(api_key, principal)
+    return principal
+
+
+async def get_principal(
+    request: Request, api_key: Annotated[str, Header()],
+) -> Principal:
+    """Get principal resolved by middleware for incoming request.
+
+    Header 'api-key' is declared here only to be documented by OpenAPI.
+
+    Args:
+        request (Request): incoming request
+        api_key (str): value of header 'api-key'
+
+    Returns:
+        Principal : authenticated user
+
+    Raises:
+        StarletteHTTPException: if request was not authenticated
+
+    """
+    principal = getattr(request.state, "principal", None)
+    if principal is None:
+        raise StarletteHTTPException(
+            status_code=401, detail="User is not authenticated!",
+        )
+    return principal
+
+
+CurrentPrincipal = Annotated[Principal, Depends(get_principal)]
+
+
+class AuthMiddleware:
+    """Class AuthMiddleware, pure ASGI middleware.
+
+    Grant permission to access the application if request url is in
+    'open_urls' or request contain header 'api-key' which is register in db,
+    table 'users'. Resolved principal is saved in request state for routes.
+    Else send response with error details. Unlike BaseHTTPMiddleware, it
+    does not wrap request and response in extra task and streams, so
+    streaming responses are passed through as is.
+
+    Attributes:
+        app (ASGIApp): wrapped ASGI application
+        open_urls (frozenset[str]): urls which are accessible without api key
+
+    """
+
+    def __init__(self, app: ASGIApp, open_urls: Iterable[str]) -> None:
+        """Init middleware.
+
+        Args:
+            app (ASGIApp): wrapped ASGI application
+            open_urls (Iterable[str]): urls accessible without api key
+
+        """
+        self.app = app
+        self.open_urls = frozenset(open_urls)
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send,
+    ) -> None:
+        """Check permission of http request and pass it to application.
+
+        Args:
+            scope (Scope): connection scope
+            receive (Receive): ASGI receive channel
+            send (Send): ASGI send channel
+
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_url = str(URL(scope=scope))
+        api_key = Headers(scope=scope).get("api-key")
+        project_logger.info(f"Checking permission: {request_url=}, {api_key=}")
+        if request_url in self.open_urls:
+            project_logger.info("Access granted!")
+            await self.app(scope, receive, send)
+            return
+        principal = None
+        if api_key:
+            principal = await get_principal_by_api_key(api_key)
+        if principal is not None:
+            project_logger.info(f"Access granted: {principal=}")
+            scope.setdefault("state", {})["principal"] = principal
+            await self.app(scope, receive, send)
+            return
+        project_logger.info("Access denied!")
+        response = JSONResponse(content=unauthorized_message, status_code=401)
+        await response(scope, receive, send)
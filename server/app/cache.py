@@ -0,0 +1,169 @@
+"""Module with in-process caches of application."""
+
+from collections import OrderedDict
+from time import monotonic, time_ns
+from typing import Any, Hashable, Optional
+
+from app.schemas import tuning_settings
+
+
+class TTLCache:
+    """Class TTLCache.
+
+    Bounded LRU cache which entries expire after time to live. Cache counts
+    hits and misses to show its hit ratio.
+
+    Attributes:
+        max_size (int): max number of entries in cache
+        ttl (float): time to live of entry in seconds
+        hits (int): total number of found entries
+        misses (int): total number of not found or expired entries
+
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        """Init cache.
+
+        Args:
+            max_size (int): max number of entries in cache
+            ttl (float): time to live of entry in seconds
+
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        """Get number of entries in cache.
+
+        Returns:
+            int : number of entries in cache
+
+        """
+        return len(self._entries)
+
+    @property
+    def hit_ratio(self) -> float:
+        """Get part of found entries from all lookups.
+
+        Returns:
+            float : hit ratio from 0 to 1
+
+        """
+        total_lookups = self.hits + self.misses
+        if not total_lookups:
+            return 0
+        return self.hits / total_lookups
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get value of entry if it is existed and not expired.
+
+        Args:
+            key (Hashable): key of entry
+
+        Returns:
+            Optional[Any] : value of entry
+
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= monotonic():
+            if entry is not None:
+                self._entries.pop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, cache_value: Any) -> None:
+        """Add entry to cache and remove the least recently used if required.
+
+        Args:
+            key (Hashable): key of entry
+            cache_value (Any): value of entry
+
+        """
+        self._entries[key] = (monotonic() + self.ttl, cache_value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove entry from cache if it is existed.
+
+        Args:
+            key (Hashable): key of entry
+
+        """
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries from cache."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Get statistics of cache usage.
+
+        Returns:
+            dict : size, hits, misses and hit ratio of cache
+
+        """
+        return {
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
+
+
+class VersionCounter:
+    """Class VersionCounter.
+
+    Monotonic version of data which is bumped on every change of it. It
+    starts from current time in nanoseconds, so versions of the previous
+    run of application are not repeated after restart.
+
+    Attributes:
+        current (int): current version
+        changed_at (float): monotonic time of the last change or of start
+
+    """
+
+    def __init__(self) -> None:
+        """Init version counter."""
+        self.current = time_ns()
+        self.changed_at = monotonic()
+
+    def bump(self) -> int:
+        """Change version after data is changed.
+
+        Returns:
+            int : new version
+
+        """
+        self.current += 1
+        self.changed_at = monotonic()
+        return self.current
+
+
+tweet_feed_cache = TTLCache(
+    max_size=tuning_settings.tweet_feed_cache_size,
+    ttl=tuning_settings.tweet_feed_cache_ttl,
+)
+tweet_feed_version = VersionCounter()
+api_key_cache = TTLCache(
+    max_size=tuning_settings.api_key_cache_size,
+    ttl=tuning_settings.api_key_cache_ttl,
+)
+unknown_api_key_cache = TTLCache(
+    max_size=tuning_settings.api_key_cache_size,
+    ttl=tuning_settings.unknown_api_key_cache_ttl,
+)
+recent_writers_cache = TTLCache(
+    max_size=tuning_settings.api_key_cache_size,
+    ttl=tuning_settings.read_your_writes_ttl,
+)
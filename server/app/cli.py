@@ -0,0 +1,122 @@
+"""Module with command line interface for maintenance of application db.
+
+Run from the application directory, e.g.:
+python cli.py migrate
+python cli.py seed-demo-data
+python cli.py repair-like-counts
+python cli.py rebuild-timelines
+"""
+
+from argparse import ArgumentParser, Namespace
+from asyncio import run as async_run
+
+from app.models.initialization import seed_db
+from app.models.migrations import migrate
+from app.models.timelines import Timeline
+from app.models.tweets import Tweet
+from app.models.users import User
+from app.project_logger import project_logger
+from connection import close_db_connection
+
+
+async def migrate_db(arguments: Namespace) -> None:
+    """Apply migrations which are not applied to db schema.
+
+    Args:
+        arguments (Namespace): command line arguments
+
+    """
+    applied_migrations = await migrate()
+    project_logger.info(f"Applied {applied_migrations} migrations")
+
+
+async def seed_demo_data(arguments: Namespace) -> None:
+    """Insert demo users, tweets, likes and media files in db.
+
+    Migrate db schema if required then insert demo data if it is not
+    existed.
+
+    Args:
+        arguments (Namespace): command line arguments
+
+    """
+    await migrate()
+    await seed_db()
+
+
+async def repair_like_counts(arguments: Namespace) -> None:
+    """Backfill and repair total likes of tweets.
+
+    Migrate db schema to add column 'like_count' to table 'tweets' if it is
+    not existed then recalculate it from table 'tweets_likes'.
+
+    Args:
+        arguments (Namespace): command line arguments
+
+    """
+    await migrate()
+    repaired_tweets = await Tweet.recalculate_like_counts()
+    project_logger.info(f"Repaired like count of {repaired_tweets} tweets")
+
+
+async def rebuild_timelines(arguments: Namespace) -> None:
+    """Build timelines of all users from tweets of followed users.
+
+    Migrate db schema to create table 'timelines' if it is not existed,
+    repair total followers of users to find celebrities then rebuild
+    timelines.
+
+    Args:
+        arguments (Namespace): command line arguments
+
+    """
+    await migrate()
+    repaired_users = await User.recalculate_follower_counts()
+    project_logger.info(f"Repaired follower count of {repaired_users} users")
+    timelines_tweets = await Timeline.rebuild()
+    project_logger.info(f"Pushed {timelines_tweets} tweets to timelines")
+
+
+def get_argument_parser() -> ArgumentParser:
+    """Create parser of command line arguments.
+
+    Returns:
+        ArgumentParser : parser of command line arguments
+
+    """
+    parser = ArgumentParser(description="Junior Twitter Clone db commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+    migrate_parser = commands.add_parser(
+        "migrate", help="apply migrations of db schema",
+    )
+    migrate_parser.set_defaults(handler=migrate_db)
+    seed_demo_data_parser = commands.add_parser(
+        "seed-demo-data", help="insert demo data if it is not existed",
+    )
+    seed_demo_data_parser.set_defaults(handler=seed_demo_data)
+    repair_like_counts_parser = commands.add_parser(
+        "repair-like-counts",
+        help="backfill and recalculate total likes of tweets",
+    )
+    repair_like_counts_parser.set_defaults(handler=repair_like_counts)
+    rebuild_timelines_parser = commands.add_parser(
+        "rebuild-timelines",
+        help="rebuild timelines of users from tweets of followed users",
+    )
+    rebuild_timelines_parser.set_defaults(handler=rebuild_timelines)
+    return parser
+
+
+async def run_command(arguments: Namespace) -> None:
+    """Run command and close db connection after it.
+
+    Args:
+        arguments (Namespace): command line arguments
+
+    """
+    await arguments.handler(arguments)
+    await close_db_connection()
+
+
+if __name__ == "__main__":
+    async_run(run_command(get_argument_parser().parse_args()))
@@ -2,9 +2,10 @@
 
 from asyncio import run as async_run
 from contextlib import asynccontextmanager
+from time import perf_counter
 from typing import Callable
 
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
@@ -12,11 +13,20 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.requests import Request as StarletteRequest
 from typing_extensions import AsyncGenerator
 
-from app.models.users import User
-from models.connection import close_db_connection
-from models.initialization import init_db
+from app.admission import (
+    ADMISSION_RETRY_AFTER,
+    AdmissionMiddleware,
+    admission_limiters,
+)
+from app.auth import AuthMiddleware
+from app.metrics import MetricsMiddleware, request_metrics
+from app.query_counter import QueryCounterMiddleware
+from app.rate_limit import RateLimitMiddleware, rate_limited_endpoints
+from app.read_your_writes import ReadYourWritesMiddleware
+from app.models.migrations import verify_schema_version
+from connection import close_db_connection, read_async_engine
 from project_logger import project_logger
-from routes import api_medias, api_users, api_tweets
+from routes import api_medias, api_users, api_tweets, metrics
 from schemas import Settings
 
 open_api_urls = (
@@ -24,12 +34,9 @@ open_api_urls = (
     "http://127.0.0.1/docs",
     "http://localhost/openapi.json",
     "http://127.0.0.1/openapi.json",
+    "http://localhost:5000/metrics",
+    "http://127.0.0.1:5000/metrics",
 )
-unauthorized_message = {
-    "result": False,
-    "error_type": "Unauthorized",
-    "error_message": "You don't have permission to visit website!",
-}
 
 
 async def get_junior_twitter_clone() -> FastAPI:
@@ -38,12 +45,16 @@ async def get_junior_twitter_clone() -> FastAPI:
     Returns:
         FastAPI: application
     """
+    created_at = perf_counter()
+
     @asynccontextmanager
     async def lifespan(app: Callable) -> AsyncGenerator:
         """Before starting and stopping app logic.
 
-        Check os environ additional parameters and init db before starting app
-        and close db connection before stopping it.
+        Check os environ additional parameters and that db schema is ready
+        before starting app, log time to ready since creation of app. Close
+        db connection before stopping app. Demo data is not inserted here,
+        it is done by command 'python cli.py seed-demo-data'.
 
         Args:
             app (Callable): FastApi application
@@ -54,43 +65,28 @@ async def get_junior_twitter_clone() -> FastAPI:
         """
         project_logger.info("Started lifespan")
         project_settings = Settings()
-        await init_db()
+        await verify_schema_version()
+        ready_seconds = perf_counter() - created_at
+        project_logger.info(f"Ready in {ready_seconds:.3f} seconds")
         yield
         await close_db_connection()
 
     app = FastAPI(title="junior_twitter_clone", lifespan=lifespan)
-    for api_router in (api_medias, api_users, api_tweets):
+    for api_router in (api_medias, api_users, api_tweets, metrics):
         app.include_router(api_router.router)
-
-    @app.middleware("http")
-    async def intercept_request(
-        request: Request, call_next: Callable,
-    ) -> Response:
-        """Middleware for catching all incoming requests.
-
-        Grant permission to access the application if request url in
-        'open_api_urls' or request contain header 'api-key' which is register
-        in db, table 'users'. Else return response with error details.
-
-        Args:
-            request (Request): incoming request
-            call_next (Callable): pass request to corresponding path operation
-
-        Returns:
-            Response: response generated by the corresponding path operation.
-
-        """
-        api_key = request.headers.get("api-key")
-        request_url = request.url
-        project_logger.info(f"Checking permission: {request.url=}, {api_key=}")
-        if (
-            request_url in open_api_urls or
-            (api_key and await User.is_existed_user_name(api_key))
-        ):
-            project_logger.info("Access granted!")
-            return await call_next(request)
-        project_logger.info("Access denied!")
-        return JSONResponse(content=unauthorized_message, status_code=401)
+    if read_async_engine is not None:
+        app.add_middleware(ReadYourWritesMiddleware)
+    app.add_middleware(
+        RateLimitMiddleware, limited_endpoints=rate_limited_endpoints,
+    )
+    app.add_middleware(AuthMiddleware, open_urls=open_api_urls)
+    app.add_middleware(QueryCounterMiddleware)
+    app.add_middleware(
+        AdmissionMiddleware,
+        limiters=admission_limiters,
+        retry_after=ADMISSION_RETRY_AFTER,
+    )
+    app.add_middleware(MetricsMiddleware, request_metrics=request_metrics)
 
     @app.exception_handler(StarletteHTTPException)
     async def http_exception_handler(
@@ -0,0 +1,470 @@
+"""Module for in-process metrics of application in Prometheus text format.
+
+Metrics are kept per worker in plain counters without locks, because
+worker serves requests in one event loop thread.
+"""
+
+from bisect import bisect_left
+from itertools import accumulate
+from time import perf_counter
+from typing import Iterable, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.admission import AdmissionLimiter
+from app.cache import TTLCache
+from app.rate_limit import TokenBucketLimiter
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED_ROUTE = "unmatched"
+POOL_GAUGES = (
+    "size", "checked_out", "overflow", "overflow_max", "checkout_seconds_max",
+)
+POOL_COUNTERS = ("checkouts", "checkout_timeouts", "checkout_seconds_total")
+REQUEST_LABEL_NAMES = ("method", "route", "status")
+ADMISSION_STATS = (
+    ("in_flight", "gauge", "Admitted requests in flight."),
+    ("waiting", "gauge", "Requests waiting in admission queue."),
+    ("rejected", "counter", "Total number of rejected requests."),
+)
+CACHE_STATS = (
+    ("size", "gauge", "Number of entries in cache."),
+    ("hits", "counter", "Total number of found entries."),
+    ("misses", "counter", "Total number of not found entries."),
+    ("hit_ratio", "gauge", "Part of found entries from all lookups."),
+)
+LABEL_VALUE_ESCAPES = str.maketrans({"\\": r"\\", '"': r'\"', "\n": r"\n"})
+
+
+class LatencyHistogram:
+    """Class LatencyHistogram.
+
+    Histogram of request latencies with buckets 'LATENCY_BUCKETS'.
+
+    Attributes:
+        bucket_counts (list[int]): numbers of latencies in buckets and over
+        sum (float): total of latencies in seconds
+        count (int): number of latencies
+
+    """
+
+    def __init__(self) -> None:
+        """Init empty histogram."""
+        self.bucket_counts = [0 for _ in range(len(LATENCY_BUCKETS) + 1)]
+        self.sum = 0.0  # noqa: WPS358
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        """Record latency.
+
+        Args:
+            seconds (float): latency in seconds
+
+        """
+        self.bucket_counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def get_cumulative_counts(self) -> list[int]:
+        """Get numbers of latencies less or equal to upper bounds of buckets.
+
+        Returns:
+            list[int] : cumulative counts of buckets ending with '+Inf'
+
+        """
+        return list(accumulate(self.bucket_counts))
+
+
+class RequestMetrics:
+    """Class RequestMetrics.
+
+    Latencies of finished http requests by method, route template and
+    status and number of requests in flight.
+
+    Attributes:
+        in_flight (int): number of requests in flight
+        latencies (dict): histograms by method, route template and status
+
+    """
+
+    def __init__(self) -> None:
+        """Init empty metrics."""
+        self.in_flight = 0
+        self.latencies: dict[tuple[str, str, str], LatencyHistogram] = {}
+
+    def observe(
+        self, method: str, route: str, status: str, seconds: float,
+    ) -> None:
+        """Record finished request.
+
+        Args:
+            method (str): http method
+            route (str): route template, e.g. '/api/tweets/{id}/likes'
+            status (str): http status code
+            seconds (float): latency in seconds
+
+        """
+        labels = (method, route, status)
+        if labels not in self.latencies:
+            self.latencies[labels] = LatencyHistogram()
+        self.latencies[labels].observe(seconds)
+
+
+class StatusSender:
+    """Class StatusSender.
+
+    ASGI send channel which remembers status of response. Status is '500'
+    until response is started, e.g. if application raises.
+
+    Attributes:
+        send (Send): wrapped ASGI send channel
+        status (str): http status code of response
+
+    """
+
+    def __init__(self, send: Send) -> None:
+        """Init send channel.
+
+        Args:
+            send (Send): wrapped ASGI send channel
+
+        """
+        self.send = send
+        self.status = "500"
+
+    async def __call__(self, message: Message) -> None:
+        """Remember status of response start and send message.
+
+        Args:
+            message (Message): ASGI message
+
+        """
+        if message["type"] == "http.response.start":
+            self.status = str(message["status"])
+        await self.send(message)
+
+
+class MetricsMiddleware:
+    """Class MetricsMiddleware, pure ASGI middleware.
+
+    Record latency of http request by method, route template and status
+    and number of requests in flight. Requests which are not routed, e.g.
+    rejected by admission control, get route 'unmatched'.
+
+    Attributes:
+        app (ASGIApp): wrapped ASGI application
+        request_metrics (RequestMetrics): metrics of requests
+
+    """
+
+    def __init__(self, app: ASGIApp, request_metrics: RequestMetrics) -> None:
+        """Init middleware.
+
+        Args:
+            app (ASGIApp): wrapped ASGI application
+            request_metrics (RequestMetrics): metrics of requests
+
+        """
+        self.app = app
+        self.request_metrics = request_metrics
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send,
+    ) -> None:
+        """Measure http request.
+
+        Args:
+            scope (Scope): connection scope
+            receive (Receive): ASGI receive channel
+            send (Send): ASGI send channel
+
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status_sender = StatusSender(send)
+        self.request_metrics.in_flight += 1
+        start_time = perf_counter()
+        # Request is recorded even if application raises
+        try:  # noqa: WPS501
+            await self.app(scope, receive, status_sender)
+        finally:
+            self.request_metrics.in_flight -= 1
+            route_path = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            latency = perf_counter() - start_time
+            self.request_metrics.observe(
+                scope["method"], route_path, status_sender.status, latency,
+            )
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    """Format labels of sample with escaped values.
+
+    Args:
+        labels (dict[str, str]): labels of sample
+
+    Returns:
+        str : labels in curly braces or empty string
+
+    """
+    if not labels:
+        return ""
+    formatted_labels = ",".join(
+        '{name}="{label_value}"'.format(
+            name=name,
+            label_value=str(label_value).translate(LABEL_VALUE_ESCAPES),
+        )
+        for name, label_value in labels.items()
+    )
+    return f"{{{formatted_labels}}}"
+
+
+def format_metric(
+    name: str,
+    metric_type: str,
+    help_text: str,
+    samples: Iterable[tuple[dict, float]],
+) -> list[str]:
+    """Format metric with its samples.
+
+    Args:
+        name (str): name of metric
+        metric_type (str): counter, gauge or histogram
+        help_text (str): description of metric
+        samples (Iterable[tuple[dict, float]]): labels and values
+
+    Returns:
+        list[str] : lines of metric
+
+    """
+    lines = [
+        f"# HELP {name} {help_text}",
+        f"# TYPE {name} {metric_type}",
+    ]
+    for labels, sample_value in samples:
+        formatted_labels = format_labels(labels)
+        lines.append(f"{name}{formatted_labels} {sample_value}")
+    return lines
+
+
+def collect_request_metrics(request_metrics: RequestMetrics) -> list[str]:
+    """Get lines of request counters, latency histograms and in flight.
+
+    Args:
+        request_metrics (RequestMetrics): metrics of requests
+
+    Returns:
+        list[str] : lines of metrics
+
+    """
+    lines = format_metric(
+        "http_requests_total",
+        "counter",
+        "Total number of finished http requests.",
+        (
+            (dict(zip(REQUEST_LABEL_NAMES, label_values)), histogram.count)
+            for label_values, histogram in request_metrics.latencies.items()
+        ),
+    )
+    lines.extend(
+        format_metric(
+            "http_requests_in_flight",
+            "gauge",
+            "Number of http requests in flight.",
+            [({}, request_metrics.in_flight)],
+        ),
+    )
+    name = "http_request_duration_seconds"
+    lines.extend(
+        (
+            f"# HELP {name} Latency of http requests in seconds.",
+            f"# TYPE {name} histogram",
+        ),
+    )
+    upper_bounds = [*map(str, LATENCY_BUCKETS), "+Inf"]
+    for request_labels, request_histogram in request_metrics.latencies.items():
+        labels = dict(zip(REQUEST_LABEL_NAMES, request_labels))
+        cumulative_counts = request_histogram.get_cumulative_counts()
+        for upper_bound, total in zip(upper_bounds, cumulative_counts):
+            bucket_labels = format_labels({**labels, "le": upper_bound})
+            lines.append(f"{name}_bucket{bucket_labels} {total}")
+        formatted_labels = format_labels(labels)
+        lines.append(f"{name}_sum{formatted_labels} {request_histogram.sum}")
+        lines.append(
+            f"{name}_count{formatted_labels} {request_histogram.count}",
+        )
+    return lines
+
+
+def collect_admission_metrics(
+    limiters: dict[str, AdmissionLimiter],
+) -> list[str]:
+    """Get lines of admission control gauges and counters.
+
+    Args:
+        limiters (dict[str, AdmissionLimiter]): limiters by route class
+
+    Returns:
+        list[str] : lines of metrics
+
+    """
+    lines = []
+    for stat_name, metric_type, help_text in ADMISSION_STATS:
+        name = f"admission_requests_{stat_name}"
+        if metric_type == "counter":
+            name = f"{name}_total"
+        lines.extend(
+            format_metric(
+                name,
+                metric_type,
+                help_text,
+                (
+                    ({"route_class": route_class}, limiter.stats()[stat_name])
+                    for route_class, limiter in limiters.items()
+                ),
+            ),
+        )
+    return lines
+
+
+def collect_rate_limit_metrics(
+    limiters: dict[str, TokenBucketLimiter],
+) -> list[str]:
+    """Get lines of rate limited requests counters.
+
+    Args:
+        limiters (dict[str, TokenBucketLimiter]): limiters by name
+
+    Returns:
+        list[str] : lines of metrics
+
+    """
+    return format_metric(
+        "rate_limited_requests_total",
+        "counter",
+        "Total number of requests rejected by rate limit.",
+        (
+            ({"limiter": limiter_name}, limiter.limited)
+            for limiter_name, limiter in limiters.items()
+        ),
+    )
+
+
+def collect_pool_metrics(pool_metrics_snapshot: dict) -> list[str]:
+    """Get lines of db connection pool gauges and counters.
+
+    Args:
+        pool_metrics_snapshot (dict): metrics of pool from
+            'get_pool_metrics'
+
+    Returns:
+        list[str] : lines of metrics
+
+    """
+    lines = []
+    for gauge_name in POOL_GAUGES:
+        gauge_value = pool_metrics_snapshot.get(gauge_name)
+        if gauge_value is not None:
+            gauge_text = gauge_name.replace("_", " ")
+            lines.extend(
+                format_metric(
+                    f"db_pool_{gauge_name}",
+                    "gauge",
+                    f"Db connection pool {gauge_text}.",
+                    [({}, gauge_value)],
+                ),
+            )
+    for counter_name in POOL_COUNTERS:
+        name = counter_name.removesuffix("_total")
+        counter_text = name.replace("_", " ")
+        lines.extend(
+            format_metric(
+                f"db_pool_{name}_total",
+                "counter",
+                f"Db connection pool {counter_text} total.",
+                [({}, pool_metrics_snapshot[counter_name])],
+            ),
+        )
+    event_totals = (
+        (event_name.removesuffix("_total"), total)
+        for event_name, total in pool_metrics_snapshot.items()
+        if event_name.endswith("_total")
+    )
+    lines.extend(
+        format_metric(
+            "db_pool_events_total",
+            "counter",
+            "Total number of db connection pool events.",
+            (
+                ({"event": event_name}, total)
+                for event_name, total in event_totals
+                if event_name != "checkout_seconds"
+            ),
+        ),
+    )
+    return lines
+
+
+def collect_cache_metrics(caches: dict[str, TTLCache]) -> list[str]:
+    """Get lines of cache sizes, hits, misses and hit ratios.
+
+    Args:
+        caches (dict[str, TTLCache]): caches by name
+
+    Returns:
+        list[str] : lines of metrics
+
+    """
+    lines = []
+    for stat_name, metric_type, help_text in CACHE_STATS:
+        name = f"cache_{stat_name}"
+        if metric_type == "counter":
+            name = f"{name}_total"
+        lines.extend(
+            format_metric(
+                name,
+                metric_type,
+                help_text,
+                (
+                    ({"cache": cache_name}, cache.stats()[stat_name])
+                    for cache_name, cache in caches.items()
+                ),
+            ),
+        )
+    return lines
+
+
+def render_metrics(
+    request_metrics: RequestMetrics,
+    admission_limiters: dict[str, AdmissionLimiter],
+    rate_limiters: dict[str, TokenBucketLimiter],
+    caches: dict[str, TTLCache],
+    pool_metrics_snapshot: Optional[dict] = None,
+) -> str:
+    """Render all metrics of worker in Prometheus text format.
+
+    Args:
+        request_metrics (RequestMetrics): metrics of requests
+        admission_limiters (dict[str, AdmissionLimiter]): limiters by class
+        rate_limiters (dict[str, TokenBucketLimiter]): limiters by name
+        caches (dict[str, TTLCache]): caches by name
+        pool_metrics_snapshot (Optional[dict]): metrics of db pool
+
+    Returns:
+        str : metrics
+
+    """
+    lines = collect_request_metrics(request_metrics)
+    lines.extend(collect_admission_metrics(admission_limiters))
+    lines.extend(collect_rate_limit_metrics(rate_limiters))
+    lines.extend(collect_cache_metrics(caches))
+    if pool_metrics_snapshot is not None:
+        lines.extend(collect_pool_metrics(pool_metrics_snapshot))
+    lines.append("")
+    return "\n".join(lines)
+
+
+request_metrics = RequestMetrics()
@@ -2,16 +2,46 @@
 
 from os import environ as os_environ
 from sys import exit as sys_exit
+from typing import Optional
 
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
+    AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.pool import NullPool
 
+from app.models.pool_metrics import (
+    MeasuredAsyncAdaptedQueuePool,
+    add_pool_listeners,
+    pool_metrics,
+)
 from app.project_logger import project_logger
+from app.query_counter import add_query_listeners
+from app.read_your_writes import primary_reads
+from app.schemas import TuningSettings, tuning_settings
+
+
+def get_pool_options(settings: TuningSettings = tuning_settings) -> dict:
+    """Get options of production db connection pool from tuning settings.
+
+    Args:
+        settings (TuningSettings): tuning settings of application
+
+    Returns:
+        dict : keyword arguments of pool for 'create_async_engine'
+
+    """
+    return {
+        "poolclass": MeasuredAsyncAdaptedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_timeout": settings.db_pool_timeout,
+    }
 
 
 def get_async_engine() -> AsyncEngine:
@@ -19,7 +49,8 @@ def get_async_engine() -> AsyncEngine:
 
     If 'DATABASE_URL' is not set in os environ, call system exit. Then if
     'PYTEST_ASYNC_ENGINE' is set in os environ return asynchronous engine with
-    set poolclass=NullPool else without setting poolclass.
+    set poolclass=NullPool else with pool options from os environ and
+    listeners of pool metrics. Statements of engine are counted per request.
 
     Returns:
         AsyncEngine : asynchronous engine
@@ -30,18 +61,93 @@ def get_async_engine() -> AsyncEngine:
     if db_url:
         if os_environ.get("PYTEST_ASYNC_ENGINE", None):
             project_logger.info("Creating async engine for pytest")
-            return create_async_engine(db_url, poolclass=NullPool)
-        project_logger.info("Creating async engine for production")
-        return create_async_engine(db_url)
+            engine = create_async_engine(db_url, poolclass=NullPool)
+        else:
+            pool_options = get_pool_options()
+            project_logger.info(
+                f"Creating async engine for production: {pool_options=}",
+            )
+            engine = create_async_engine(db_url, **pool_options)
+            add_pool_listeners(engine.sync_engine, pool_metrics)
+        add_query_listeners(engine.sync_engine)
+        return engine
     sys_exit("DATABASE_URL should be set to run the program!")
 
 
+def get_read_async_engine() -> Optional[AsyncEngine]:
+    """Get asynchronous engine of read replica.
+
+    If 'DATABASE_READ_URL' is not set in os environ return None, so all
+    reads go to primary db. Else return asynchronous engine with the same
+    pool options as the primary one, but without pool metrics. Statements of
+    engine are counted per request.
+
+    Returns:
+        Optional[AsyncEngine] : asynchronous engine of read replica
+
+    """
+    db_read_url = tuning_settings.database_read_url
+    project_logger.info(f"{db_read_url=}")
+    if not db_read_url:
+        return None
+    if os_environ.get("PYTEST_ASYNC_ENGINE", None):
+        read_engine = create_async_engine(db_read_url, poolclass=NullPool)
+    else:
+        pool_options = get_pool_options()
+        pool_options.pop("poolclass")
+        read_engine = create_async_engine(db_read_url, **pool_options)
+    add_query_listeners(read_engine.sync_engine)
+    return read_engine
+
+
+def read_session() -> AsyncSession:
+    """Create session for read only queries.
+
+    Session is bound to read replica if it is set and request did not write
+    recently, else to primary db.
+
+    Returns:
+        AsyncSession : session
+
+    """
+    if read_async_session is None or primary_reads.get():
+        return async_session()
+    return read_async_session()
+
+
+def is_replica_read() -> bool:
+    """Check if read only queries of request go to read replica.
+
+    Returns:
+        bool : True if read replica is set and request did not write
+            recently
+
+    """
+    return read_async_session is not None and not primary_reads.get()
+
+
+def get_pool_metrics() -> dict:
+    """Get metrics of db connection pool.
+
+    Returns:
+        dict : metrics of pool
+
+    """
+    return pool_metrics.snapshot(async_engine.pool)
+
+
 async def close_db_connection() -> None:
     """Dispose connection with db."""
-    project_logger.info("Disposing async engine")
+    project_logger.info(f"Disposing async engine: {get_pool_metrics()}")
     await async_engine.dispose()
+    if read_async_engine is not None:
+        await read_async_engine.dispose()
 
 
 async_engine = get_async_engine()
 async_session = async_sessionmaker(bind=async_engine)
+read_async_engine = get_read_async_engine()
+read_async_session = None
+if read_async_engine is not None:
+    read_async_session = async_sessionmaker(bind=read_async_engine)
 Base = declarative_base()
@@ -1,6 +1,6 @@
 """Module for followers table."""
 
-from sqlalchemy import Column, ForeignKey, Integer, Table
+from sqlalchemy import Column, ForeignKey, Index, Integer, Table
 
 from connection import Base
 
@@ -20,3 +20,8 @@ followers = Table(
         primary_key=True,
     ),
 )
+Index(
+    "ix_followers_followed_id_follower_id",
+    followers.c.followed_id,
+    followers.c.follower_id,
+)
@@ -1,30 +1,23 @@
-"""Module for creating tables and initializing default data in db."""
+"""Module for initializing demo data in db."""
 
 from app.project_logger import project_logger
 from app.models.followers import followers
 from app.models.media_files import MediaFile
+from app.models.timelines import Timeline
 from app.models.tweet_likes import TweetLike
 from app.models.tweets import Tweet
 from app.models.users import User
-from connection import async_engine, async_session, Base
+from connection import async_session
 
 
-async def create_tables() -> None:
-    """Create tables which are not existed in db."""
-    async with async_engine.begin() as conn:
-        project_logger.info("Creating tables which are not existed in db.")
-        await conn.run_sync(Base.metadata.create_all)
-    project_logger.info("Completed creating tables in db.")
+async def seed_db() -> None:
+    """Initialize demo data for db.
 
-
-async def init_db() -> None:
-    """Initialize default data for db.
-
-    Create and insert data in tables if User.name == test is not existed.
+    Insert data in tables if User.name == test is not existed, count
+    followers of users and build timelines of users.
 
     """
-    project_logger.info("initializing db")
-    await create_tables()
+    project_logger.info("Seeding db")
     if not await User.is_existed_user_name("test"):
         project_logger.info("Adding default data in db")
         async with async_session() as session:
@@ -64,21 +57,25 @@ async def init_db() -> None:
                 author_name="Alex",
                 tweet_data="!!!Hala Madrid!!!",
                 tweet_media_ids=[1, 2],
+                like_count=1,
             )
             tweet_2 = Tweet(
                 author_name="Alex",
                 tweet_data="Good morning=))",
                 tweet_media_ids=[3],
+                like_count=2,
             )
             tweet_3 = Tweet(
                 author_name="Petr",
                 tweet_data="Today is a nice day!",
                 tweet_media_ids=[4],
+                like_count=3,
             )
             tweet_4 = Tweet(
                 author_name="Nikole",
                 tweet_data="Awaited vacation after hard working year...",
                 tweet_media_ids=[5],
+                like_count=2,
             )
             tweet_5 = Tweet(
                 author_name="Nikole",
@@ -122,3 +119,5 @@ async def init_db() -> None:
                 ],
             )
             await session.commit()
+        await User.recalculate_follower_counts()
+        await Timeline.rebuild()
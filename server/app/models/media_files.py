@@ -1,12 +1,24 @@
 """Module with CRUD for ORM table media_files."""
 
-from typing import Optional, Union
-
-from sqlalchemy import Column, ForeignKey, delete, func, insert, select
+from typing import Iterable, Optional, Union
+
+from sqlalchemy import (
+    ARRAY,
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    any_,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.project_logger import project_logger
-from connection import async_session, Base
+from connection import async_session, read_session, Base
 
 
 class MediaFile(Base):
@@ -70,7 +82,7 @@ class MediaFile(Base):
         project_logger.info(
             f"Get total media files from table '{cls.__tablename__}'",
         )
-        async with async_session() as session:
+        async with read_session() as session:
             get_query = await session.execute(
                 select(func.count(cls.id)),
             )
@@ -92,7 +104,7 @@ class MediaFile(Base):
 
         """
         project_logger.info(f"Get media file names for {ids_list=}")
-        async with async_session() as session:
+        async with read_session() as session:
             select_query = await session.execute(
                 select(cls.file_name).
                 where(cls.id.in_(ids_list)),
@@ -101,6 +113,36 @@ class MediaFile(Base):
         project_logger.info(f"{file_names=}")
         return file_names
 
+    @classmethod
+    async def get_media_files_names_by_ids(
+        cls, ids_list: Iterable[int],
+    ) -> dict[int, str]:
+        """Get media files names mapped by their ids in one query.
+
+        Media files ids are bound as one array parameter, so number of media
+        files is not limited by max number of query parameters.
+
+        Args:
+            ids_list (Iterable[int]): media files ids
+
+        Returns:
+            dict[int, str] : media files names by media files ids
+
+        """
+        unique_ids = set(ids_list)
+        project_logger.info(f"Get media file names for {unique_ids=}")
+        if not unique_ids:
+            return {}
+        ids_array = literal(list(unique_ids), ARRAY(Integer))
+        async with async_session() as session:
+            select_query = await session.execute(
+                select(cls.id, cls.file_name).
+                where(cls.id == any_(ids_array)),
+            )
+            file_names = dict(select_query.tuples().all())
+        project_logger.info(f"{file_names=}")
+        return file_names
+
     @classmethod
     async def bulk_delete(
         cls, user_name: str, files_ids: list,
@@ -129,3 +171,6 @@ class MediaFile(Base):
                 deleted_file_names = delete_query.scalars().all()
         project_logger.info(f"{deleted_file_names=}")
         return list(deleted_file_names)
+
+
+Index("ix_media_files_user_name", MediaFile.user_name)
@@ -0,0 +1,379 @@
+"""Module with versioned migrations of db schema."""
+
+from asyncio import sleep
+from datetime import datetime
+from sys import exit as sys_exit
+from typing import Awaitable, Callable, NamedTuple, Optional
+
+from sqlalchemy import DateTime, func, select, text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.orm import Mapped, mapped_column
+
+# models are imported to register their tables in 'Base.metadata'
+from app.models.followers import followers  # noqa: F401
+from app.models.media_files import MediaFile  # noqa: F401
+from app.models.timelines import Timeline  # noqa: F401
+from app.models.tweet_likes import TweetLike  # noqa: F401
+from app.models.tweets import Tweet  # noqa: F401
+from app.models.users import User  # noqa: F401
+from app.project_logger import project_logger
+from connection import async_engine, Base
+
+
+class SchemaVersion(Base):
+    """ORM Mapped Class SchemaVersion, parent class Base.
+
+    Class for table 'schema_version' with applied migrations.
+
+    Attributes:
+        version (int): version of applied migration
+        description (str): description of migration
+        applied_at (datetime): time of applying migration
+
+    """
+
+    __tablename__ = "schema_version"
+
+    version: Mapped[int] = mapped_column(primary_key=True)
+    description: Mapped[str] = mapped_column(nullable=False)
+    applied_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False,
+    )
+
+
+class Migration(NamedTuple):
+    """Class Migration, parent class NamedTuple.
+
+    Attributes:
+        version (int): version of schema after migration
+        description (str): description of migration
+        apply (Callable[[AsyncConnection], Awaitable[None]]): schema change
+        in_transaction (bool): False to apply in autocommit mode
+
+    """
+
+    version: int
+    description: str
+    apply: Callable[[AsyncConnection], Awaitable[None]]
+    in_transaction: bool = True
+
+
+# Schema of tables when migrations were introduced, later changes of
+# models are applied by the next migrations, so it must not be changed
+create_tables_queries = (
+    "CREATE TABLE IF NOT EXISTS users ("
+    "id SERIAL PRIMARY KEY, name VARCHAR NOT NULL UNIQUE);",
+    "CREATE TABLE IF NOT EXISTS followers ("
+    "follower_id INTEGER REFERENCES users (id) ON DELETE CASCADE, "
+    "followed_id INTEGER REFERENCES users (id) ON DELETE CASCADE, "
+    "PRIMARY KEY (follower_id, followed_id));",
+    "CREATE TABLE IF NOT EXISTS media_files ("
+    "id SERIAL PRIMARY KEY, file_name VARCHAR NOT NULL, "
+    "user_name VARCHAR NOT NULL REFERENCES users (name) ON DELETE CASCADE);",
+    "CREATE TABLE IF NOT EXISTS tweets ("
+    "id SERIAL PRIMARY KEY, "
+    "author_name VARCHAR NOT NULL REFERENCES users (name) ON DELETE CASCADE, "
+    "tweet_data VARCHAR NOT NULL, tweet_media_ids INTEGER[]);",
+    "CREATE TABLE IF NOT EXISTS tweets_likes ("
+    "id SERIAL PRIMARY KEY, "
+    "tweet_id INTEGER NOT NULL REFERENCES tweets (id) ON DELETE CASCADE, "
+    "user_name VARCHAR NOT NULL REFERENCES users (name) ON DELETE CASCADE, "
+    "CONSTRAINT unique_tweet_like UNIQUE (tweet_id, user_name));",
+    "CREATE TABLE IF NOT EXISTS timelines ("
+    "user_id INTEGER REFERENCES users (id) ON DELETE CASCADE, "
+    "tweet_id INTEGER REFERENCES tweets (id) ON DELETE CASCADE, "
+    "PRIMARY KEY (user_id, tweet_id));",
+)
+
+
+async def create_tables(conn: AsyncConnection) -> None:
+    """Create tables which are not existed in db.
+
+    Tables are created as they were when migrations were introduced, not
+    from current models, so existed tables of live db are kept as is.
+
+    Args:
+        conn (AsyncConnection): connection with db
+
+    """
+    for create_table_query in create_tables_queries:
+        await conn.execute(text(create_table_query))
+
+
+async def add_tweets_like_count(conn: AsyncConnection) -> None:
+    """Add column 'like_count' to table 'tweets' of db before it.
+
+    Total likes of tweets are backfilled from table 'tweets_likes'.
+
+    Args:
+        conn (AsyncConnection): connection with db
+
+    """
+    await conn.execute(
+        text(
+            "ALTER TABLE tweets "
+            "ADD COLUMN IF NOT EXISTS like_count INTEGER NOT NULL DEFAULT 0;",
+        ),
+    )
+    await conn.execute(
+        text(
+            "UPDATE tweets SET like_count = likes_count.total "
+            "FROM (SELECT tweet_id, count(*) AS total FROM tweets_likes "
+            "GROUP BY tweet_id) AS likes_count "
+            "WHERE tweets.id = likes_count.tweet_id;",
+        ),
+    )
+
+
+async def create_index_concurrently(
+    conn: AsyncConnection, index_name: str, index_definition: str,
+) -> None:
+    """Build index without locking writes to table.
+
+    Invalid index left by failed concurrent build is dropped first.
+
+    Args:
+        conn (AsyncConnection): connection with db in autocommit mode
+        index_name (str): name of index
+        index_definition (str): table and columns of index
+
+    """
+    invalid_index_query = await conn.execute(
+        text(
+            "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = "
+            "pg_index.indexrelid WHERE pg_class.relname = :index_name "
+            "AND NOT pg_index.indisvalid;",
+        ),
+        {"index_name": index_name},
+    )
+    if invalid_index_query.scalar_one_or_none():
+        project_logger.info(f"Dropping invalid index {index_name}")
+        await conn.execute(
+            text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name};"),
+        )
+    project_logger.info(f"Creating index {index_name} concurrently")
+    await conn.execute(
+        text(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+            f"ON {index_definition};",
+        ),
+    )
+
+
+async def create_feed_and_foreign_key_indexes(conn: AsyncConnection) -> None:
+    """Build indexes of feeds and foreign keys of tables of db before it.
+
+    Args:
+        conn (AsyncConnection): connection with db in autocommit mode
+
+    """
+    indexes = (
+        ("ix_tweets_like_count_id", "tweets (like_count DESC, id DESC)"),
+        ("ix_tweets_author_name_id", "tweets (author_name, id DESC)"),
+        ("ix_timelines_tweet_id", "timelines (tweet_id)"),
+        ("ix_tweets_likes_tweet_id_id", "tweets_likes (tweet_id, id)"),
+        (
+            "ix_tweets_likes_user_name_tweet_id",
+            "tweets_likes (user_name, tweet_id)",
+        ),
+        (
+            "ix_followers_followed_id_follower_id",
+            "followers (followed_id, follower_id)",
+        ),
+        ("ix_media_files_user_name", "media_files (user_name)"),
+    )
+    for index_name, index_definition in indexes:
+        await create_index_concurrently(conn, index_name, index_definition)
+
+
+async def add_users_follower_count(conn: AsyncConnection) -> None:
+    """Add column 'follower_count' to table 'users' and backfill it.
+
+    Args:
+        conn (AsyncConnection): connection with db
+
+    """
+    await conn.execute(
+        text(
+            "ALTER TABLE users ADD COLUMN IF NOT EXISTS "
+            "follower_count INTEGER NOT NULL DEFAULT 0;",
+        ),
+    )
+    await conn.execute(
+        text(
+            "UPDATE users SET follower_count = followers_count.total "
+            "FROM (SELECT followed_id, count(*) AS total FROM followers "
+            "GROUP BY followed_id) AS followers_count "
+            "WHERE users.id = followers_count.followed_id;",
+        ),
+    )
+
+
+async def create_users_follower_count_index(conn: AsyncConnection) -> None:
+    """Build index of total followers of users to find celebrities.
+
+    Args:
+        conn (AsyncConnection): connection with db in autocommit mode
+
+    """
+    await create_index_concurrently(
+        conn, "ix_users_follower_count", "users (follower_count)",
+    )
+
+
+MIGRATIONS = (
+    Migration(1, "Create tables", create_tables),
+    Migration(2, "Add column tweets.like_count", add_tweets_like_count),
+    Migration(
+        3,
+        "Create indexes of feeds and foreign keys",
+        create_feed_and_foreign_key_indexes,
+        in_transaction=False,
+    ),
+    Migration(
+        4, "Add column users.follower_count", add_users_follower_count,
+    ),
+    Migration(
+        5,
+        "Create index of users follower count",
+        create_users_follower_count_index,
+        in_transaction=False,
+    ),
+)
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1].version
+MIGRATIONS_LOCK_ID = 20240419
+MIGRATIONS_LOCK_RETRY_SECONDS = 0.5
+
+
+async def get_schema_version() -> Optional[int]:
+    """Get version of db schema.
+
+    Returns:
+        Optional[int] : version of the last applied migration or None if
+            migrations were not applied
+
+    """
+    async with async_engine.connect() as conn:
+        try:
+            version_query = await conn.execute(
+                select(func.max(SchemaVersion.version)),
+            )
+        except ProgrammingError:
+            project_logger.info("Table 'schema_version' is not existed")
+            return None
+        return version_query.scalar_one_or_none()
+
+
+async def create_schema_version_table() -> None:
+    """Create table 'schema_version' if it is not existed."""
+    async with async_engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all, tables=[SchemaVersion.__table__],
+        )
+
+
+async def apply_migration(migration: Migration) -> None:
+    """Apply migration and record its version.
+
+    Version of migration applied in transaction is recorded in the same
+    transaction.
+
+    Args:
+        migration (Migration): migration
+
+    """
+    project_logger.info(
+        f"Applying migration {migration.version}: {migration.description}",
+    )
+    insert_version_query = SchemaVersion.__table__.insert().values(
+        version=migration.version, description=migration.description,
+    )
+    if migration.in_transaction:
+        async with async_engine.begin() as conn:
+            await migration.apply(conn)
+            await conn.execute(insert_version_query)
+        return
+    async with async_engine.connect() as autocommit_conn:
+        await autocommit_conn.execution_options(isolation_level="AUTOCOMMIT")
+        await migration.apply(autocommit_conn)
+        await autocommit_conn.execute(insert_version_query)
+
+
+async def try_lock_migrations(conn: AsyncConnection) -> bool:
+    """Try to take advisory lock of migrations for session of connection.
+
+    Args:
+        conn (AsyncConnection): connection with db in autocommit mode
+
+    Returns:
+        bool : True if lock is taken
+
+    """
+    lock_query = await conn.execute(
+        text("SELECT pg_try_advisory_lock(:lock_id);"),
+        {"lock_id": MIGRATIONS_LOCK_ID},
+    )
+    return lock_query.scalar_one()
+
+
+async def apply_pending_migrations() -> int:
+    """Apply migrations which are newer than version of db schema.
+
+    Returns:
+        int : number of applied migrations
+
+    """
+    await create_schema_version_table()
+    schema_version = await get_schema_version() or 0
+    project_logger.info(f"{schema_version=}, {LATEST_SCHEMA_VERSION=}")
+    pending_migrations = [
+        i_migration
+        for i_migration in MIGRATIONS
+        if i_migration.version > schema_version
+    ]
+    for i_migration in pending_migrations:
+        await apply_migration(i_migration)
+    return len(pending_migrations)
+
+
+async def migrate() -> int:
+    """Apply migrations under advisory lock of db.
+
+    Applications and commands started at the same time apply every
+    migration once: the others wait for the lock and find schema updated.
+    Lock is polled out of transaction, because index built CONCURRENTLY
+    by the holder of lock would wait for snapshot of blocked query.
+
+    Returns:
+        int : number of applied migrations
+
+    """
+    async with async_engine.connect() as lock_conn:
+        await lock_conn.execution_options(isolation_level="AUTOCOMMIT")
+        while not await try_lock_migrations(lock_conn):
+            project_logger.info("Waiting for lock of migrations")
+            await sleep(MIGRATIONS_LOCK_RETRY_SECONDS)
+        # Lock is released even if migration fails
+        try:  # noqa: WPS501
+            return await apply_pending_migrations()
+        finally:
+            await lock_conn.execute(
+                text("SELECT pg_advisory_unlock(:lock_id);"),
+                {"lock_id": MIGRATIONS_LOCK_ID},
+            )
+
+
+async def verify_schema_version() -> None:
+    """Check that all migrations are applied to db.
+
+    Call system exit if db schema is behind the application.
+
+    """
+    schema_version = await get_schema_version()
+    project_logger.info(f"{schema_version=}, {LATEST_SCHEMA_VERSION=}")
+    if schema_version is None or schema_version < LATEST_SCHEMA_VERSION:
+        sys_exit(
+            f"Db schema version {schema_version} is behind "
+            f"{LATEST_SCHEMA_VERSION}, run 'python cli.py migrate'!",
+        )
@@ -0,0 +1,148 @@
+"""Module for metrics of db connection pool."""
+
+from functools import partial
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    Pool,
+    PoolProxiedConnection,
+    QueuePool,
+)
+
+CHURN_POOL_EVENTS = (
+    "connect",
+    "close",
+    "close_detached",
+    "detach",
+    "invalidate",
+    "soft_invalidate",
+)
+
+
+class PoolMetrics:
+    """Class PoolMetrics.
+
+    Counters of db connection pool: checkout latency and timeouts, overflow
+    usage and connection churn.
+
+    Attributes:
+        checkouts (int): total number of checkouts
+        checkout_timeouts (int): total number of checkouts failed by timeout
+        checkout_seconds_total (float): total time of checkouts
+        checkout_seconds_max (float): the longest checkout
+        overflow_max (int): max number of overflow connections in use
+        events (dict[str, int]): total number of pool events by name
+
+    """
+
+    def __init__(self) -> None:
+        """Init metrics."""
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_seconds_total = 0.0  # noqa: WPS358
+        self.checkout_seconds_max = 0.0  # noqa: WPS358
+        self.overflow_max = 0
+        self.events = dict.fromkeys(CHURN_POOL_EVENTS, 0)
+
+    def observe_checkout(self, seconds: float, overflow: int) -> None:
+        """Record checkout of connection.
+
+        Args:
+            seconds (float): time of waiting for connection
+            overflow (int): number of overflow connections in use
+
+        """
+        self.checkouts += 1
+        self.checkout_seconds_total += seconds
+        self.checkout_seconds_max = max(self.checkout_seconds_max, seconds)
+        self.overflow_max = max(self.overflow_max, overflow)
+
+    def observe_event(self, event_name: str, *event_args: object) -> None:
+        """Record event of connection churn.
+
+        Args:
+            event_name (str): name of pool event
+            event_args (object): arguments of pool event listener
+
+        """
+        self.events[event_name] += 1
+
+    def snapshot(self, pool: Pool) -> dict:
+        """Get counters with current state of pool.
+
+        Args:
+            pool (Pool): db connection pool
+
+        Returns:
+            dict : metrics of pool
+
+        """
+        pool_metrics_snapshot = {
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "checkout_seconds_total": self.checkout_seconds_total,
+            "checkout_seconds_max": self.checkout_seconds_max,
+            "overflow_max": self.overflow_max,
+            **{
+                f"{event_name}_total": total
+                for event_name, total in self.events.items()
+            },
+        }
+        if isinstance(pool, QueuePool):
+            pool_metrics_snapshot.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return pool_metrics_snapshot
+
+
+def add_pool_listeners(target: object, metrics: PoolMetrics) -> None:
+    """Record connection churn events of pool or engine in metrics.
+
+    Args:
+        target (object): pool or sync engine
+        metrics (PoolMetrics): metrics of pool
+
+    """
+    for event_name in CHURN_POOL_EVENTS:
+        event.listen(
+            target, event_name, partial(metrics.observe_event, event_name),
+        )
+
+
+class MeasuredAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Class MeasuredAsyncAdaptedQueuePool, parent AsyncAdaptedQueuePool.
+
+    Pool which records checkout latency and overflow usage in 'pool_metrics'.
+    Pool events are emitted only after connection is checked out, so time
+    of waiting for connection is measured around 'connect'.
+
+    """
+
+    def connect(self) -> PoolProxiedConnection:
+        """Check out connection from pool and record its latency.
+
+        Returns:
+            PoolProxiedConnection : connection
+
+        Raises:
+            PoolTimeoutError: if connection is not checked out in time
+
+        """
+        start_time = perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            pool_metrics.checkout_timeouts += 1
+            raise
+        pool_metrics.observe_checkout(
+            perf_counter() - start_time, max(self.overflow(), 0),
+        )
+        return connection
+
+
+pool_metrics = PoolMetrics()
@@ -0,0 +1,377 @@
+"""Module with CRUD for ORM table timelines."""
+
+from typing import Optional
+
+from sqlalchemy import (
+    ForeignKey,
+    Index,
+    Integer,
+    Select,
+    delete,
+    desc,
+    literal,
+    select,
+)
+from sqlalchemy.dialects.postgresql import Insert as PostgresqlInsert
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.project_logger import project_logger
+from app.models.followers import followers
+from app.models.tweets import Tweet
+from app.models.users import User
+from app.schemas import tuning_settings
+from connection import async_session, read_session, Base
+
+FANOUT_WRITE_ENGINE = "fanout_write"
+FANOUT_READ_ENGINE = "fanout_read"
+TIMELINE_ENGINE = tuning_settings.timeline_engine
+FAN_OUT_MAX_FOLLOWERS = tuning_settings.timeline_fan_out_max_followers
+
+
+def get_followed_names_query(user_id: int) -> Select:
+    """Create query of names of users followed by user 'user_id'.
+
+    Args:
+        user_id (int): follower user id
+
+    Returns:
+        Select : select query of users names
+
+    """
+    return (
+        select(User.name).
+        join(followers, followers.c.followed_id == User.id).
+        where(followers.c.follower_id == user_id)
+    )
+
+
+def get_followed_celebrity_names_query(
+    user_id: int, max_followers: int,
+) -> Select:
+    """Create query of names of followed users with many followers.
+
+    Tweets of users with more than 'max_followers' followers are not pushed
+    to timelines of followers, they are merged into timeline on read.
+    Celebrities are found by total followers of users followed by user
+    'user_id', so the whole table 'followers' is not counted.
+
+    Args:
+        user_id (int): follower user id
+        max_followers (int): max number of followers for fan-out on write
+
+    Returns:
+        Select : select query of users names
+
+    """
+    return get_followed_names_query(user_id).where(
+        User.follower_count > max_followers,
+    )
+
+
+def get_timeline_query(
+    user_id: int, limit: int, before_id: Optional[int] = None,
+) -> Select:
+    """Create query of ids of tweets pushed to timeline of user.
+
+    Tweets are read newest first with one range scan of primary key.
+
+    Args:
+        user_id (int): id of user who owns timeline
+        limit (int): max number of tweets
+        before_id (Optional[int]): get tweets with id less than it
+
+    Returns:
+        Select : select query of tweets ids
+
+    """
+    timeline_query = (
+        select(Timeline.tweet_id).
+        where(Timeline.user_id == user_id).
+        order_by(desc(Timeline.tweet_id)).
+        limit(limit)
+    )
+    if before_id:
+        timeline_query = timeline_query.where(Timeline.tweet_id < before_id)
+    return timeline_query
+
+
+class Timeline(Base):
+    """ORM Mapped Class Timeline, parent class Base.
+
+    Class for creating and dealing with table 'timelines'. Represent tweets
+    of followed users pushed to timeline of user when they are posted.
+
+    Attributes:
+        user_id (int): id of user who owns timeline
+        tweet_id (int): id of tweet in timeline
+
+    """
+
+    __tablename__ = "timelines"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True,
+    )
+    tweet_id: Mapped[int] = mapped_column(
+        ForeignKey("tweets.id", ondelete="CASCADE"), primary_key=True,
+    )
+
+    @classmethod
+    async def fan_out_tweet(
+        cls,
+        author_name: str,
+        tweet_id: int,
+        max_followers: int = FAN_OUT_MAX_FOLLOWERS,
+    ) -> int:
+        """Push tweet to timelines of all followers of author in one insert.
+
+        Tweet is not pushed if author has more than 'max_followers'
+        followers, it will be merged into timelines on read.
+
+        Args:
+            author_name (str): tweet author name
+            tweet_id (int): tweet id
+            max_followers (int): max number of followers for fan-out on write
+
+        Returns:
+            int : number of timelines tweet is pushed to
+
+        """
+        project_logger.info(
+            f"Push {tweet_id=} of {author_name=} to table "
+            f"'{cls.__tablename__}'",
+        )
+        author_id = (
+            select(User.id).where(User.name == author_name).scalar_subquery()
+        )
+        author_followers = (
+            select(followers.c.follower_id).
+            where(followers.c.followed_id == author_id)
+        )
+        async with async_session() as session:
+            async with session.begin():
+                total_followers_query = await session.execute(
+                    select(User.follower_count).
+                    where(User.name == author_name),
+                )
+                if total_followers_query.scalar_one() > max_followers:
+                    project_logger.info(f"{author_name=} is celebrity")
+                    return 0
+                fan_out_query = await session.execute(
+                    PostgresqlInsert(cls).
+                    from_select(
+                        ["user_id", "tweet_id"],
+                        author_followers.add_columns(
+                            literal(tweet_id, Integer),
+                        ),
+                    ).
+                    on_conflict_do_nothing(),
+                )
+        total_timelines = fan_out_query.rowcount
+        project_logger.info(f"{total_timelines=}")
+        return total_timelines
+
+    @classmethod
+    async def add_followed_tweets(
+        cls,
+        follower_id: int,
+        followed_id: int,
+        max_followers: int = FAN_OUT_MAX_FOLLOWERS,
+    ) -> None:
+        """Push existed tweets of followed user to timeline of follower.
+
+        Tweets of users with more than 'max_followers' followers are skipped
+        as they are merged into timeline on read.
+
+        Args:
+            follower_id (int): follower user id
+            followed_id (int): followed user id
+            max_followers (int): max number of followers for fan-out on write
+
+        """
+        project_logger.info(
+            f"Push tweets of {followed_id=} to timeline of {follower_id=}",
+        )
+        followed_tweets = (
+            select(literal(follower_id, Integer), Tweet.id).
+            join(User, User.name == Tweet.author_name).
+            where(
+                User.id == followed_id,
+                User.follower_count <= max_followers,
+            )
+        )
+        async with async_session() as session:
+            async with session.begin():
+                await session.execute(
+                    PostgresqlInsert(cls).
+                    from_select(["user_id", "tweet_id"], followed_tweets).
+                    on_conflict_do_nothing(),
+                )
+
+    @classmethod
+    async def remove_followed_tweets(
+        cls, follower_id: int, followed_id: int,
+    ) -> None:
+        """Remove tweets of unfollowed user from timeline of follower.
+
+        Args:
+            follower_id (int): follower user id
+            followed_id (int): unfollowed user id
+
+        """
+        project_logger.info(
+            f"Remove tweets of {followed_id=} from timeline of "
+            f"{follower_id=}",
+        )
+        followed_tweets = (
+            select(Tweet.id).
+            join(User, User.name == Tweet.author_name).
+            where(User.id == followed_id)
+        )
+        async with async_session() as session:
+            async with session.begin():
+                await session.execute(
+                    delete(cls).
+                    where(
+                        cls.user_id == follower_id,
+                        cls.tweet_id.in_(followed_tweets),
+                    ),
+                )
+
+    @classmethod
+    async def fan_out_author_tweets(cls, author_id: int) -> int:
+        """Push all tweets of author to timelines of all his followers.
+
+        Call it when author is not a celebrity anymore: his tweets were
+        merged into timelines on read and they are not pushed to them.
+
+        Args:
+            author_id (int): author user id
+
+        Returns:
+            int : number of tweets pushed to timelines
+
+        """
+        project_logger.info(
+            f"Push tweets of {author_id=} to timelines of his followers",
+        )
+        author_tweets = (
+            select(followers.c.follower_id, Tweet.id).
+            join(User, User.id == followers.c.followed_id).
+            join(Tweet, Tweet.author_name == User.name).
+            where(followers.c.followed_id == author_id)
+        )
+        async with async_session() as session:
+            async with session.begin():
+                fan_out_query = await session.execute(
+                    PostgresqlInsert(cls).
+                    from_select(["user_id", "tweet_id"], author_tweets).
+                    on_conflict_do_nothing(),
+                )
+        total_timelines_tweets = fan_out_query.rowcount
+        project_logger.info(f"{total_timelines_tweets=}")
+        return total_timelines_tweets
+
+    @classmethod
+    async def get_tweet_ids(
+        cls,
+        user_id: int,
+        limit: int,
+        before_id: Optional[int] = None,
+        max_followers: int = FAN_OUT_MAX_FOLLOWERS,
+    ) -> list[int]:
+        """Get ids of tweets in timeline of user sorted descending.
+
+        Tweets pushed to timeline are read with one range scan of primary
+        key. Recent tweets of followed users with more than 'max_followers'
+        followers are merged into them.
+
+        Args:
+            user_id (int): id of user who owns timeline
+            limit (int): max number of tweets
+            before_id (Optional[int]): get tweets with id less than it
+            max_followers (int): max number of followers for fan-out on write
+
+        Returns:
+            list[int] : tweets ids
+
+        """
+        project_logger.info(
+            f"Get {limit=} tweets ids {before_id=} from timeline of "
+            f"{user_id=}",
+        )
+        async with read_session() as session:
+            timeline_ids = await session.execute(
+                get_timeline_query(user_id, limit, before_id),
+            )
+            tweet_ids = set(timeline_ids.scalars().all())
+        tweet_ids.update(
+            await Tweet.get_recent_tweet_ids_by_authors(
+                get_followed_celebrity_names_query(user_id, max_followers),
+                limit,
+                before_id,
+            ),
+        )
+        timeline_tweet_ids = sorted(tweet_ids, reverse=True)[:limit]
+        project_logger.info(f"{timeline_tweet_ids=}")
+        return timeline_tweet_ids
+
+    @classmethod
+    async def get_followed_tweet_ids(
+        cls, user_id: int, limit: int, before_id: Optional[int] = None,
+    ) -> list[int]:
+        """Get ids of tweets of followed users sorted descending on read.
+
+        Fan-out on read alternative to 'get_tweet_ids': table 'timelines' is
+        not used, recent tweets of every followed user are merged.
+
+        Args:
+            user_id (int): follower user id
+            limit (int): max number of tweets
+            before_id (Optional[int]): get tweets with id less than it
+
+        Returns:
+            list[int] : tweets ids
+
+        """
+        project_logger.info(
+            f"Merge {limit=} tweets ids {before_id=} of users followed by "
+            f"{user_id=}",
+        )
+        return await Tweet.get_recent_tweet_ids_by_authors(
+            get_followed_names_query(user_id), limit, before_id,
+        )
+
+    @classmethod
+    async def rebuild(
+        cls, max_followers: int = FAN_OUT_MAX_FOLLOWERS,
+    ) -> int:
+        """Rebuild timelines of all users from tables tweets and followers.
+
+        Args:
+            max_followers (int): max number of followers for fan-out on write
+
+        Returns:
+            int : number of tweets pushed to timelines
+
+        """
+        project_logger.info(f"Rebuild table '{cls.__tablename__}'")
+        followed_tweets = (
+            select(followers.c.follower_id, Tweet.id).
+            join(User, User.id == followers.c.followed_id).
+            join(Tweet, Tweet.author_name == User.name).
+            where(User.follower_count <= max_followers)
+        )
+        async with async_session() as session:
+            async with session.begin():
+                await session.execute(delete(cls))
+                rebuild_query = await session.execute(
+                    PostgresqlInsert(cls).
+                    from_select(["user_id", "tweet_id"], followed_tweets),
+                )
+        total_timelines_tweets = rebuild_query.rowcount
+        project_logger.info(f"{total_timelines_tweets=}")
+        return total_timelines_tweets
+
+
+Index("ix_timelines_tweet_id", Timeline.tweet_id)
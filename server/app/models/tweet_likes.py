@@ -1,13 +1,121 @@
 """Module with CRUD for ORM table tweets_likes."""
 
-from typing import Optional
+from collections import defaultdict
+from typing import Iterable, Optional
 
-from sqlalchemy import ForeignKey, UniqueConstraint, delete, func, select
+from sqlalchemy import (
+    ARRAY,
+    ForeignKey,
+    Index,
+    Integer,
+    Select,
+    UniqueConstraint,
+    Update,
+    any_,
+    delete,
+    func,
+    literal,
+    select,
+    update,
+)
 from sqlalchemy.dialects.postgresql import Insert as PostgresqlInsert
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.project_logger import project_logger
-from connection import async_session, Base
+from app.models.users import User
+from connection import async_session, read_session, Base
+
+
+def update_tweet_like_count(tweet_id: int, delta: int) -> Update:
+    """Create query to change total likes of tweet in table 'tweets'.
+
+    Table is taken from metadata as model Tweet depends on this module.
+
+    Args:
+        tweet_id (int): id of tweet
+        delta (int): change of total likes
+
+    Returns:
+        Update : update query
+
+    """
+    tweets = Base.metadata.tables["tweets"]
+    return (
+        update(tweets).
+        where(tweets.c.id == tweet_id).
+        values(like_count=tweets.c.like_count + delta)
+    )
+
+
+def get_likers_query(
+    tweet_ids: Iterable[int], limit: Optional[int] = None,
+) -> Select:
+    """Create query of ids and names of users who liked tweets.
+
+    Likers of tweet are sorted by like id and if 'limit' is set only first
+    'limit' likers of every tweet are selected with window function. Tweets
+    ids are bound as one array parameter, so number of tweets is not
+    limited by max number of query parameters.
+
+    Args:
+        tweet_ids (Iterable[int]): tweets ids
+        limit (Optional[int]): max number of likers of tweet
+
+    Returns:
+        Select : select query of tweet id, like id, user id and name
+
+    """
+    tweet_ids_array = literal(list(tweet_ids), ARRAY(Integer))
+    liker_columns = (TweetLike.id, User.id.label("user_id"), User.name)
+    likers_query = (
+        select(TweetLike.tweet_id, *liker_columns).
+        join(User, User.name == TweetLike.user_name).
+        where(TweetLike.tweet_id == any_(tweet_ids_array)).
+        order_by(TweetLike.tweet_id, TweetLike.id)
+    )
+    if limit is None:
+        return likers_query
+    likers_subquery = likers_query.add_columns(
+        func.row_number().over(
+            partition_by=TweetLike.tweet_id, order_by=TweetLike.id,
+        ).label("position"),
+    ).order_by(None).subquery()
+    return (
+        select(likers_subquery).
+        where(likers_subquery.c.position <= limit).
+        order_by(likers_subquery.c.tweet_id, likers_subquery.c.id)
+    )
+
+
+def get_likers_page_query(
+    tweet_id: int, limit: int, after_id: Optional[int] = None,
+) -> Select:
+    """Create query of page of users who liked tweet sorted by like id.
+
+    Keyset pagination: only likes with id greater than 'after_id' are read
+    from index 'ix_tweets_likes_tweet_id_id'.
+
+    Args:
+        tweet_id (int): tweet id
+        limit (int): max number of likers in page
+        after_id (Optional[int]): id of last like from previous page
+
+    Returns:
+        Select : select query of like id, user id and name
+
+    """
+    liker_columns = (TweetLike.id, User.id.label("user_id"), User.name)
+    page_query = (
+        select(*liker_columns).
+        join(User, User.name == TweetLike.user_name).
+        where(TweetLike.tweet_id == tweet_id).
+        order_by(TweetLike.id).
+        limit(limit)
+    )
+    if after_id:
+        page_query = page_query.where(TweetLike.id > after_id)
+    return page_query
 
 
 class TweetLike(Base):
@@ -52,7 +160,8 @@ class TweetLike(Base):
     async def like_tweet(cls, user_name: str, tweet_id: int) -> Optional[int]:
         """Like tweet by tweet id.
 
-        Return like id if details of tweet like inserted successfully.
+        Return like id if details of tweet like inserted successfully. Total
+        likes of tweet is increased in the same transaction.
 
         Args:
             user_name (str): username who liked tweet
@@ -76,6 +185,8 @@ class TweetLike(Base):
                     do_nothing_on_conflict.returning(cls.id),
                 )
                 tweet_like_id = like_tweet_query.scalar_one_or_none()
+                if tweet_like_id:
+                    await session.execute(update_tweet_like_count(tweet_id, 1))
         project_logger.info(f"{tweet_like_id=}")
         return tweet_like_id
 
@@ -85,7 +196,8 @@ class TweetLike(Base):
     ) -> Optional[int]:
         """Dislike tweet by tweet id.
 
-        Return like id if details of tweet like removed successfully.
+        Return like id if details of tweet like removed successfully. Total
+        likes of tweet is decreased in the same transaction.
 
         Args:
             user_name (str): username who liked tweet
@@ -104,7 +216,11 @@ class TweetLike(Base):
                     ).
                     returning(cls.id),
                 )
-        tweet_like_id = delete_query.scalar_one_or_none()
+                tweet_like_id = delete_query.scalar_one_or_none()
+                if tweet_like_id:
+                    await session.execute(
+                        update_tweet_like_count(tweet_id, -1),
+                    )
         return tweet_like_id
 
     @classmethod
@@ -118,10 +234,86 @@ class TweetLike(Base):
         project_logger.info(
             f"Get total likes from table '{cls.__tablename__}'",
         )
-        async with async_session() as session:
+        async with read_session() as session:
             get_query = await session.execute(
                 select(func.count(cls.id)),
             )
             total_likes = get_query.scalar()
         project_logger.info(f"{total_likes=}")
         return total_likes
+
+    @classmethod
+    async def get_likers_by_tweet_ids(
+        cls, tweet_ids: Iterable[int], limit: Optional[int] = None,
+    ) -> dict[int, list[Row]]:
+        """Get ids and names of users who liked tweets in one query.
+
+        Only columns are selected, users are not loaded as ORM objects with
+        their followers. Likers of tweet are sorted by like id and if
+        'limit' is set only first 'limit' likers of every tweet are taken.
+        Tweets ids are bound as one array parameter, so number of tweets is
+        not limited by max number of query parameters.
+
+        Args:
+            tweet_ids (Iterable[int]): tweets ids
+            limit (Optional[int]): max number of likers of tweet
+
+        Returns:
+            dict[int, list[Row]] : user id and name of likers by tweet ids
+
+        """
+        unique_ids = set(tweet_ids)
+        total_tweets = len(unique_ids)
+        project_logger.info(
+            f"Get {limit=} likers of {total_tweets} tweets from table "
+            f"'{cls.__tablename__}'",
+        )
+        likers: defaultdict[int, list[Row]] = defaultdict(list)
+        if not unique_ids or limit == 0:
+            return likers
+        async with read_session() as session:
+            select_query = await session.execute(
+                get_likers_query(unique_ids, limit),
+            )
+            for i_like in select_query.all():
+                likers[i_like.tweet_id].append(i_like)
+        return likers
+
+    @classmethod
+    async def get_likers_page(
+        cls, tweet_id: int, limit: int, after_id: Optional[int] = None,
+    ) -> list[Row]:
+        """Get page of users who liked tweet sorted by like id.
+
+        Keyset pagination: only likes with id greater than 'after_id' (id of
+        the last like from previous page) are read from index
+        'ix_tweets_likes_tweet_id_id'.
+
+        Args:
+            tweet_id (int): tweet id
+            limit (int): max number of likers in page
+            after_id (Optional[int]): id of last like from previous page
+
+        Returns:
+            list[Row] : like id, user id and name of likers
+
+        """
+        project_logger.info(
+            f"Get {limit=} likers of {tweet_id=} {after_id=} from table "
+            f"'{cls.__tablename__}'",
+        )
+        async with read_session() as session:
+            select_query = await session.execute(
+                get_likers_page_query(tweet_id, limit, after_id),
+            )
+            likers = list(select_query.all())
+        project_logger.info(f"{likers=}")
+        return likers
+
+
+Index("ix_tweets_likes_tweet_id_id", TweetLike.tweet_id, TweetLike.id)
+Index(
+    "ix_tweets_likes_user_name_tweet_id",
+    TweetLike.user_name,
+    TweetLike.tweet_id,
+)
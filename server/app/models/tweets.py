@@ -2,25 +2,123 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from heapq import merge as heapq_merge
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import AsyncGenerator, Optional
 
 from sqlalchemy import (
     ARRAY,
     Column,
     ForeignKey,
+    Index,
     Integer,
+    Select,
     delete,
     desc,
     func,
     insert,
+    literal,
     select,
+    true,
+    tuple_,
+    update,
 )
 from sqlalchemy.engine import Row
-from sqlalchemy.orm import Mapped, joinedload, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.project_logger import project_logger
 from app.models.tweet_likes import TweetLike
-from connection import async_session, Base
+from app.models.users import User
+from connection import async_session, read_session, Base
+
+
+def get_tweet_feed_query() -> Select:
+    """Create query of tweets columns required by tweet feed.
+
+    Tweet is joined with its author only, so there is one plain row per
+    tweet instead of ORM objects with eager loaded likes and follow graph.
+
+    Returns:
+        Select : select query of tweets details
+
+    """
+    return (
+        select(
+            Tweet.id,
+            Tweet.tweet_data,
+            Tweet.tweet_media_ids,
+            Tweet.like_count,
+            User.id.label("author_id"),
+            User.name.label("author_name"),
+        ).
+        join(User, User.name == Tweet.author_name)
+    )
+
+
+def get_tweets_page_query(
+    limit: int, after: Optional[tuple[int, int]] = None,
+) -> Select:
+    """Create query of page of tweets details sorted descending by likes.
+
+    Keyset pagination: only tweets placed strictly after 'after' (likes
+    count and id of the last tweet from previous page) are selected through
+    index 'ix_tweets_like_count_id'.
+
+    Args:
+        limit (int): max number of tweets in page
+        after (Optional[tuple[int, int]]=None): position of last tweet
+
+    Returns:
+        Select : select query of tweets details
+
+    """
+    page_query = (
+        get_tweet_feed_query().
+        order_by(desc(Tweet.like_count), desc(Tweet.id)).
+        limit(limit)
+    )
+    if after:
+        after_like_count, after_id = after
+        page_query = page_query.where(
+            tuple_(Tweet.like_count, Tweet.id) <
+            tuple_(literal(after_like_count), literal(after_id)),
+        )
+    return page_query
+
+
+def get_recent_tweet_ids_query(
+    authors_query: Select, limit: int, before_id: Optional[int] = None,
+) -> Select:
+    """Create query of ids of the most recent tweets of every author.
+
+    At most 'limit' recent tweets of each author are read through index
+    'ix_tweets_author_name_id' with one lateral join.
+
+    Args:
+        authors_query (Select): select query of authors names
+        limit (int): max number of tweets of author
+        before_id (Optional[int]): get tweets with id less than it
+
+    Returns:
+        Select : select query of authors names and tweets ids
+
+    """
+    authors = authors_query.subquery()
+    author_tweets_query = (
+        select(Tweet.id).
+        where(Tweet.author_name == authors.c.name).
+        order_by(desc(Tweet.id)).
+        limit(limit)
+    )
+    if before_id:
+        author_tweets_query = author_tweets_query.where(Tweet.id < before_id)
+    author_tweets = author_tweets_query.lateral()
+    return (
+        select(authors.c.name, author_tweets.c.id).
+        join(author_tweets, true()).
+        order_by(authors.c.name, desc(author_tweets.c.id))
+    )
 
 
 class Tweet(Base):
@@ -33,6 +131,7 @@ class Tweet(Base):
         author_name (str): tweet author name
         tweet_data (str): tweet message
         tweet_media_ids (Optional[list[int]]): media ids belongs to tweet
+        like_count (int): total likes of tweet, kept in sync by TweetLike
         author (User): tweet author details
         likes(Union[list[TweetLike], list]): details of likes for the tweet
 
@@ -46,6 +145,9 @@ class Tweet(Base):
     )
     tweet_data: Mapped[str] = mapped_column(nullable=False)
     tweet_media_ids = Column(ARRAY(Integer))
+    like_count: Mapped[int] = mapped_column(
+        default=0, server_default="0", nullable=False,
+    )
     author = relationship(
         "User",
         primaryjoin="Tweet.author_name == User.name",
@@ -127,6 +229,28 @@ class Tweet(Base):
         project_logger.info(f"Deleted tweet {deleted_details=}")
         return deleted_details
 
+    @classmethod
+    async def is_existed_tweet(cls, tweet_id: int) -> bool:
+        """Check if tweet is existed.
+
+        Args:
+            tweet_id (int): tweet id
+
+        Returns:
+            bool : True if tweet is existed else False
+
+        """
+        project_logger.info(
+            f"Checking if {tweet_id=} is existed in table "
+            f"'{cls.__tablename__}'",
+        )
+        async with async_session() as session:
+            tweet_query = await session.execute(
+                select(cls.id).where(cls.id == tweet_id),
+            )
+            found_tweet_id = tweet_query.scalar_one_or_none()
+        return found_tweet_id is not None
+
     @classmethod
     async def get_total_tweets(cls) -> Optional[int]:
         """Get total number of tweets.
@@ -138,7 +262,7 @@ class Tweet(Base):
         project_logger.info(
             f"Get total tweets from table '{cls.__tablename__}'",
         )
-        async with async_session() as session:
+        async with read_session() as session:
             select_query = await session.execute(
                 select(func.count(cls.id)),
             )
@@ -146,66 +270,199 @@ class Tweet(Base):
         project_logger.info(f"{total_tweets=}")
         return total_tweets
 
-    # @classmethod
-    # async def get_tweets_by_author_sorted_by_likes(
-    #     cls, followed_names: list[str],
-    # ) -> list[Optional[Tweet]]:
-    #     """Get all tweets of users 'followed_names' sorted descending by
-    #     likes.
-    #
-    #     Args:
-    #         followed_names: user's names to get tweets
-    #
-    #     Returns:
-    #         list[Tweet] : tweets
-    #
-    #     """
-    #     project_logger.info(
-    #         f"Get tweets for {followed_names=} and sort them descending "
-    #         f"by likes from table '{cls.__tablename__}'",
-    #     )
-    #     async with async_session() as session:
-    #         select_query = await session.execute(
-    #             select(cls).
-    #             where(cls.author_name.in_(followed_names)).
-    #             outerjoin(TweetLike, cls.id == TweetLike.tweet_id).
-    #             order_by(desc(func.count(TweetLike.id))).
-    #             group_by(cls.id).
-    #             options(
-    #                 joinedload(cls.author),
-    #                 joinedload(cls.likes).
-    #                 options(joinedload(TweetLike.user_details)),
-    #             ),
-    #         )
-    #         user_tweets = select_query.unique().scalars().all()
-    #     project_logger.info(f"{user_tweets=}")
-    #     return list(user_tweets)
+    @classmethod
+    async def get_recent_tweet_ids_by_authors(
+        cls,
+        authors_query: Select,
+        limit: int,
+        before_id: Optional[int] = None,
+    ) -> list[int]:
+        """Get ids of the most recent tweets of authors sorted descending.
+
+        At most 'limit' recent tweets of each author are read through index
+        'ix_tweets_author_name_id' with one lateral join, then the sorted
+        streams of authors are merged with a heap until 'limit' ids are
+        taken.
+
+        Args:
+            authors_query (Select): select query of authors names
+            limit (int): max number of tweets
+            before_id (Optional[int]): get tweets with id less than it
+
+        Returns:
+            list[int] : tweets ids
+
+        """
+        project_logger.info(
+            f"Get {limit=} recent tweets ids of authors {before_id=} "
+            f"from table '{cls.__tablename__}'",
+        )
+        async with read_session() as session:
+            select_query = await session.execute(
+                get_recent_tweet_ids_query(authors_query, limit, before_id),
+            )
+            authors_tweets = select_query.all()
+        authors_streams = [
+            [i_tweet.id for i_tweet in i_author_tweets]
+            for _, i_author_tweets in groupby(
+                authors_tweets, key=itemgetter(0),
+            )
+        ]
+        recent_tweet_ids = list(
+            islice(heapq_merge(*authors_streams, reverse=True), limit),
+        )
+        project_logger.info(f"{recent_tweet_ids=}")
+        return recent_tweet_ids
 
     @classmethod
-    async def get_all_tweets_sorted_by_likes(cls) -> list[Tweet]:
-        """Get all tweets sorted descending by likes.
+    async def get_tweet_feed_rows_by_ids(
+        cls, tweet_ids: list[int],
+    ) -> list[Row]:
+        """Get details of tweets for tweet feed in order of 'tweet_ids'.
+
+        Args:
+            tweet_ids (list[int]): tweets ids
+
+        Returns:
+            list[Row] : found tweets details
+
+        """
+        project_logger.info(
+            f"Get tweet feed rows by {tweet_ids=} from table "
+            f"'{cls.__tablename__}'",
+        )
+        if not tweet_ids:
+            return []
+        async with read_session() as session:
+            select_query = await session.execute(
+                get_tweet_feed_query().where(cls.id.in_(tweet_ids)),
+            )
+            tweets_by_id = {
+                i_tweet.id: i_tweet for i_tweet in select_query.all()
+            }
+        return [
+            tweets_by_id[i_id] for i_id in tweet_ids if i_id in tweets_by_id
+        ]
+
+    @classmethod
+    async def get_all_tweet_feed_rows_sorted_by_likes(cls) -> list[Row]:
+        """Get details of all tweets for tweet feed sorted by likes.
+
+        Only columns required by tweet feed are selected as plain rows.
 
         Returns:
-            list[Tweet] : all tweets
+            list[Row] : all tweets details
 
         """
         project_logger.info(
-            f"Get all tweets sorted descending by likes"
+            f"Get all tweet feed rows sorted descending by likes"
             f" from table '{cls.__tablename__}'",
         )
-        async with async_session() as session:
+        async with read_session() as session:
             select_query = await session.execute(
-                select(cls).
-                outerjoin(TweetLike, cls.id == TweetLike.tweet_id).
-                order_by(desc(func.count(TweetLike.id))).
-                group_by(cls.id).
-                options(
-                    joinedload(cls.author),
-                    joinedload(cls.likes).options(
-                        joinedload(TweetLike.user_details),
-                    ),
-                ),
+                get_tweet_feed_query().
+                order_by(desc(cls.like_count), desc(cls.id)),
             )
-            all_tweets = select_query.unique().scalars().all()
-        project_logger.info(f"{all_tweets=}")
+            all_tweets = select_query.all()
+        total_tweets = len(all_tweets)
+        project_logger.info(f"Got {total_tweets} tweet feed rows")
         return list(all_tweets)
+
+    @classmethod
+    async def stream_all_tweet_feed_rows_sorted_by_likes(
+        cls, chunk_size: int,
+    ) -> AsyncGenerator[list[Row], None]:
+        """Stream details of all tweets sorted descending by likes in chunks.
+
+        Tweets are read with server side cursor, so only one chunk of tweets
+        is kept in memory.
+
+        Args:
+            chunk_size (int): number of tweets in chunk
+
+        Yields:
+            list[Row] : chunk of tweets details
+
+        """
+        project_logger.info(
+            f"Stream all tweet feed rows sorted descending by likes by "
+            f"{chunk_size=} from table '{cls.__tablename__}'",
+        )
+        async with read_session() as session:
+            stream_query = await session.stream(
+                get_tweet_feed_query().
+                order_by(desc(cls.like_count), desc(cls.id)).
+                execution_options(yield_per=chunk_size),
+            )
+            async for i_tweets in stream_query.partitions():
+                yield list(i_tweets)
+
+    @classmethod
+    async def get_tweets_page_sorted_by_likes(
+        cls, limit: int, after: Optional[tuple[int, int]] = None,
+    ) -> list[Row]:
+        """Get details of page of tweets sorted descending by likes and id.
+
+        Keyset pagination: tweets are ordered by (likes count, tweet id) and
+        only tweets placed strictly after 'after' (likes count and id of the
+        last tweet from previous page) are selected. The page is read from
+        index 'ix_tweets_like_count_id', so every page costs the same as the
+        first one. Only columns required by tweet feed are selected.
+
+        Args:
+            limit (int): max number of tweets in page
+            after (Optional[tuple[int, int]]=None): position of last tweet
+
+        Returns:
+            list[Row] : tweets details of the page
+
+        """
+        project_logger.info(
+            f"Get {limit=} tweets sorted descending by likes {after=}"
+            f" from table '{cls.__tablename__}'",
+        )
+        async with read_session() as session:
+            select_query = await session.execute(
+                get_tweets_page_query(limit, after),
+            )
+            page_tweets = list(select_query.all())
+        project_logger.info(f"{page_tweets=}")
+        return page_tweets
+
+    @classmethod
+    async def recalculate_like_counts(cls) -> int:
+        """Recalculate total likes of tweets from table 'tweets_likes'.
+
+        Backfill and repair 'like_count' of tweets which are out of sync,
+        e.g. after likes were inserted or removed bypassing TweetLike.
+
+        Returns:
+            int : number of repaired tweets
+
+        """
+        project_logger.info(
+            f"Recalculate like counts in table '{cls.__tablename__}'",
+        )
+        likes_count = (
+            select(func.count(TweetLike.id)).
+            where(TweetLike.tweet_id == cls.id).
+            scalar_subquery()
+        )
+        async with async_session() as session:
+            async with session.begin():
+                update_query = await session.execute(
+                    update(cls).
+                    where(cls.like_count != likes_count).
+                    values(like_count=likes_count),
+                )
+        repaired_tweets = update_query.rowcount
+        project_logger.info(f"{repaired_tweets=}")
+        return repaired_tweets
+
+
+Index(
+    "ix_tweets_like_count_id", Tweet.like_count.desc(), Tweet.id.desc(),
+)
+Index(
+    "ix_tweets_author_name_id", Tweet.author_name, Tweet.id.desc(),
+)
@@ -4,9 +4,8 @@ from __future__ import annotations
 
 from typing import Optional
 
-from sqlalchemy import delete, select
+from sqlalchemy import Index, Update, delete, func, select, update
 from sqlalchemy.dialects.postgresql import Insert as PostgresqlInsert
-from sqlalchemy.engine import Row
 from sqlalchemy.orm import (
     Mapped,
     backref,
@@ -14,9 +13,10 @@ from sqlalchemy.orm import (
     mapped_column,
     relationship,
 )
+from app.cache import unknown_api_key_cache
 from app.project_logger import project_logger
 from app.models.followers import followers
-from connection import async_session, Base
+from connection import async_session, read_session, Base
 
 
 class User(Base):
@@ -27,6 +27,7 @@ class User(Base):
     Attributes:
         id (Optional[int]): user id, unique identifier of user
         name (str): username
+        follower_count (int): total followers of user
         followed (list[Optional[User]]): followed users
 
     """
@@ -35,6 +36,9 @@ class User(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(unique=True, nullable=False)
+    follower_count: Mapped[int] = mapped_column(
+        default=0, server_default="0", nullable=False,
+    )
     followed = relationship(
         "User",
         secondary=followers,
@@ -95,6 +99,8 @@ class User(Base):
     async def add_user(cls, user_name: str) -> None:
         """Add new user.
 
+        Username is removed from cache of unknown api keys.
+
         Args:
             user_name (str): username
 
@@ -105,6 +111,7 @@ class User(Base):
         async with async_session() as session:
             async with session.begin():
                 session.add(User(name=user_name))
+        unknown_api_key_cache.delete(user_name)
 
     @classmethod
     async def get_user_by_name(cls, user_name: str) -> Optional[User]:
@@ -123,7 +130,7 @@ class User(Base):
             f"Get full details of {user_name=} from table "
             f"'{cls.__tablename__}'",
         )
-        async with async_session() as session:
+        async with read_session() as session:
             user_query = await session.execute(
                 select(User).
                 where(User.name == user_name).
@@ -153,7 +160,7 @@ class User(Base):
             f"Get full details of {user_id=} from table "
             f"'{cls.__tablename__}'",
         )
-        async with async_session() as session:
+        async with read_session() as session:
             user_query = await session.execute(
                 select(User).
                 where(User.id == user_id).
@@ -169,17 +176,17 @@ class User(Base):
     @staticmethod
     async def follow_other_user(
         follower_id: int, followed_id: int,
-    ) -> Optional[Row]:
+    ) -> Optional[int]:
         """Add followed user.
 
-        Return user and followed user ids if added successfully.
+        Return total followers of followed user if added successfully.
 
         Args:
             follower_id (int): user id
             followed_id (int): followed user id
 
         Returns:
-            Optional[Row] : user and followed user ids
+            Optional[int] : total followers of followed user
 
         """
         project_logger.info(
@@ -195,29 +202,33 @@ class User(Base):
                 do_nothing_on_conflict = (
                     insert_query.
                     on_conflict_do_nothing().
-                    returning(
-                        followers.c.follower_id, followers.c.followed_id,
-                    )
+                    returning(followers.c.followed_id)
                 )
                 follow_query = await session.execute(do_nothing_on_conflict)
-                follow_details = follow_query.one_or_none()
-        project_logger.info(f"{follow_details=}")
-        return follow_details
+                follower_count = None
+                if follow_query.one_or_none():
+                    count_query = await session.execute(
+                        update_follower_count(followed_id, 1),
+                    )
+                    follower_count = count_query.scalar_one()
+        project_logger.info(f"{follower_count=}")
+        return follower_count
 
     @staticmethod
     async def unfollow_user(
         follower_id: int, followed_id: int,
-    ) -> Optional[Row]:
+    ) -> Optional[int]:
         """Unfollow user.
 
-        Return user and followed user ids if entry removed successfully.
+        Return total followers of unfollowed user if entry removed
+        successfully.
 
         Args:
             follower_id (int): user id
             followed_id (int): followed user id
 
         Returns:
-            Optional[Row] : user and followed user ids
+            Optional[int] : total followers of unfollowed user
 
         """
         project_logger.info(
@@ -232,13 +243,47 @@ class User(Base):
                         followers.c.follower_id == follower_id,
                         followers.c.followed_id == followed_id,
                     ).
-                    returning(
-                        followers.c.follower_id, followers.c.followed_id,
-                    ),
+                    returning(followers.c.followed_id),
                 )
-                delete_details = delete_query.one_or_none()
-        project_logger.info(f"{delete_details=}")
-        return delete_details
+                follower_count = None
+                if delete_query.one_or_none():
+                    count_query = await session.execute(
+                        update_follower_count(followed_id, -1),
+                    )
+                    follower_count = count_query.scalar_one()
+        project_logger.info(f"{follower_count=}")
+        return follower_count
+
+    @classmethod
+    async def recalculate_follower_counts(cls) -> int:
+        """Recalculate total followers of users from table 'followers'.
+
+        Backfill and repair 'follower_count' of users which are out of sync,
+        e.g. after followers were inserted bypassing follow_other_user.
+
+        Returns:
+            int : number of repaired users
+
+        """
+        project_logger.info(
+            f"Recalculate follower counts in table '{cls.__tablename__}'",
+        )
+        followers_count = (
+            select(func.count()).
+            select_from(followers).
+            where(followers.c.followed_id == cls.id).
+            scalar_subquery()
+        )
+        async with async_session() as session:
+            async with session.begin():
+                update_query = await session.execute(
+                    update(cls).
+                    where(cls.follower_count != followers_count).
+                    values(follower_count=followers_count),
+                )
+        repaired_users = update_query.rowcount
+        project_logger.info(f"{repaired_users=}")
+        return repaired_users
 
     @classmethod
     async def get_total_followed_by_name(cls, user_name: str) -> Optional[int]:
@@ -264,3 +309,25 @@ class User(Base):
             return total_followed
         project_logger.info(f"{user_name=} is not existed in db")
         return None
+
+
+def update_follower_count(user_id: int, delta: int) -> Update:
+    """Create query to change total followers of user.
+
+    Args:
+        user_id (int): id of user
+        delta (int): change of total followers
+
+    Returns:
+        Update : update query returning new total followers
+
+    """
+    return (
+        update(User).
+        where(User.id == user_id).
+        values(follower_count=User.follower_count + delta).
+        returning(User.follower_count)
+    )
+
+
+Index("ix_users_follower_count", User.follower_count)
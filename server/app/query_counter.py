@@ -0,0 +1,246 @@
+"""Module for counting SQL statements and db time of requests."""
+
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.project_logger import project_logger
+from app.schemas import tuning_settings
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+QUERY_TIME_HEADER = "X-Query-Time-Ms"
+QUERY_REPEAT_THRESHOLD = tuning_settings.query_repeat_threshold
+
+
+class QueryStats:
+    """Class QueryStats.
+
+    SQL statements executed while stats are set in 'request_query_stats'.
+
+    Attributes:
+        statements (int): total number of executed statements
+        seconds (float): total time of executing statements
+        repeats (Counter): number of executions of every statement
+
+    """
+
+    def __init__(self) -> None:
+        """Init empty stats."""
+        self.statements = 0
+        self.seconds = 0.0  # noqa: WPS358
+        self.repeats: Counter = Counter()
+
+    def observe(self, statement: str, seconds: float) -> None:
+        """Record executed statement.
+
+        Args:
+            statement (str): SQL statement
+            seconds (float): time of executing statement
+
+        """
+        self.statements += 1
+        self.seconds += seconds
+        self.repeats[statement] += 1
+
+    @property
+    def milliseconds(self) -> float:
+        """Get total time of executing statements in milliseconds.
+
+        Returns:
+            float : total time rounded to tenths of millisecond
+
+        """
+        return round(self.seconds * 1000, 1)
+
+    def get_repeated_statements(self, threshold: int) -> list[tuple]:
+        """Get statements executed at least 'threshold' times, e.g. N+1.
+
+        Args:
+            threshold (int): min number of executions
+
+        Returns:
+            list[tuple] : statements with their number of executions
+
+        """
+        return [
+            (statement, total)
+            for statement, total in self.repeats.most_common()
+            if total >= threshold
+        ]
+
+
+request_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "request_query_stats", default=None,
+)
+
+
+def before_cursor_execute(conn: Connection, *args: Any) -> None:
+    """Remember start time of statement in connection info.
+
+    Args:
+        conn (Connection): connection with db
+        args (Any): cursor, statement, parameters, context and executemany
+
+    """
+    conn.info["query_start_time"] = perf_counter()
+
+
+def after_cursor_execute(
+    conn: Connection, cursor: Any, statement: str, *args: Any,
+) -> None:
+    """Record executed statement in stats of current request.
+
+    Args:
+        conn (Connection): connection with db
+        cursor (Any): DBAPI cursor
+        statement (str): SQL statement
+        args (Any): parameters, context and executemany
+
+    """
+    query_stats = request_query_stats.get()
+    if query_stats is not None:
+        query_stats.observe(
+            statement, perf_counter() - conn.info["query_start_time"],
+        )
+
+
+def add_query_listeners(engine: Engine) -> None:
+    """Record statements executed by engine in stats of current request.
+
+    Args:
+        engine (Engine): sync engine
+
+    """
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """Count statements executed inside context.
+
+    Yields:
+        QueryStats : stats of executed statements
+
+    """
+    query_stats = QueryStats()
+    token = request_query_stats.set(query_stats)
+    try:
+        yield query_stats
+    finally:
+        request_query_stats.reset(token)
+
+
+class QueryStatsSender:
+    """Class QueryStatsSender.
+
+    ASGI send channel which adds totals of executed statements to headers
+    of response.
+
+    Attributes:
+        send (Send): wrapped ASGI send channel
+        query_stats (QueryStats): stats of executed statements
+
+    """
+
+    def __init__(self, send: Send, query_stats: QueryStats) -> None:
+        """Init send channel.
+
+        Args:
+            send (Send): wrapped ASGI send channel
+            query_stats (QueryStats): stats of executed statements
+
+        """
+        self.send = send
+        self.query_stats = query_stats
+
+    async def __call__(self, message: Message) -> None:
+        """Add totals to headers of response start and send message.
+
+        Args:
+            message (Message): ASGI message
+
+        """
+        if message["type"] == "http.response.start":
+            message.setdefault("headers", [])
+            headers = MutableHeaders(scope=message)
+            headers[QUERY_COUNT_HEADER] = str(self.query_stats.statements)
+            headers[QUERY_TIME_HEADER] = str(self.query_stats.milliseconds)
+        await self.send(message)
+
+
+class QueryCounterMiddleware:
+    """Class QueryCounterMiddleware, pure ASGI middleware.
+
+    Count SQL statements and db time of http request. Totals are added to
+    response headers 'X-Query-Count' and 'X-Query-Time-Ms' and logged
+    with statements repeated at least 'QUERY_REPEAT_THRESHOLD' times as
+    possible N+1 queries. Headers of streamed response have totals before
+    its body.
+
+    Attributes:
+        app (ASGIApp): wrapped ASGI application
+
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Init middleware.
+
+        Args:
+            app (ASGIApp): wrapped ASGI application
+
+        """
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send,
+    ) -> None:
+        """Count statements of http request.
+
+        Args:
+            scope (Scope): connection scope
+            receive (Receive): ASGI receive channel
+            send (Send): ASGI send channel
+
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with count_queries() as query_stats:
+            # Stats are logged even if application raises
+            try:  # noqa: WPS501
+                await self.app(
+                    scope, receive, QueryStatsSender(send, query_stats),
+                )
+            finally:
+                log_query_stats(scope, query_stats)
+
+
+def log_query_stats(scope: Scope, query_stats: QueryStats) -> None:
+    """Log totals and repeated statements of request.
+
+    Args:
+        scope (Scope): connection scope
+        query_stats (QueryStats): stats of executed statements
+
+    """
+    method, path = scope["method"], scope["path"]
+    project_logger.info(
+        f"{method} {path}: query_count={query_stats.statements}, "
+        f"query_time_ms={query_stats.milliseconds}",
+    )
+    repeated_statements = query_stats.get_repeated_statements(
+        QUERY_REPEAT_THRESHOLD,
+    )
+    for statement, total in repeated_statements:
+        project_logger.warning(
+            f"Possible N+1 in {method} {path}: "
+            f"statement executed {total} times: {statement}",
+        )
@@ -0,0 +1,194 @@
+"""Module for rate limiting of requests by header 'api-key'."""
+
+from collections import OrderedDict
+from math import ceil
+from re import compile as re_compile
+from time import monotonic
+from typing import Optional
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.project_logger import project_logger
+from app.schemas import tuning_settings
+
+too_many_requests_message = {
+    "result": False,
+    "error_type": "Too Many Requests",
+    "error_message": "Too many requests, please retry later!",
+}
+
+
+class TokenBucketLimiter:
+    """Class TokenBucketLimiter.
+
+    Token buckets keyed by api key. Bucket is refilled lazily with 'rate'
+    tokens per second up to 'burst' tokens and request takes one token, so
+    every check is O(1). Buckets are kept in order of last use and buckets
+    idle longer than time of full refill are evicted from the oldest one,
+    because full bucket is the same as a new one.
+
+    Attributes:
+        rate (float): tokens added to bucket per second
+        burst (int): max number of tokens in bucket
+        limited (int): total number of limited requests
+
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Init limiter.
+
+        Args:
+            rate (float): tokens added to bucket per second
+            burst (int): max number of tokens in bucket
+
+        """
+        self.rate = rate
+        self.burst = burst
+        self.limited = 0
+        self._idle_ttl = burst / rate
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Get number of buckets.
+
+        Returns:
+            int : number of buckets
+
+        """
+        return len(self._buckets)
+
+    def take(self, api_key: str) -> Optional[float]:
+        """Take token from bucket of api key.
+
+        Args:
+            api_key (str): value of header 'api-key'
+
+        Returns:
+            Optional[float] : None if token is taken else seconds till the
+                next token
+
+        """
+        now = monotonic()
+        self.evict_idle_buckets(now)
+        tokens, updated_at = self._buckets.pop(api_key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+        if tokens < 1:
+            self._buckets[api_key] = (tokens, now)
+            self.limited += 1
+            return (1 - tokens) / self.rate
+        self._buckets[api_key] = (tokens - 1, now)
+        return None
+
+    def clear(self) -> None:
+        """Remove all buckets."""
+        self._buckets.clear()
+
+    def evict_idle_buckets(self, now: float) -> None:
+        """Remove buckets which were refilled to the full.
+
+        Args:
+            now (float): current monotonic time
+
+        """
+        while self._buckets:
+            api_key, (_, updated_at) = next(iter(self._buckets.items()))
+            if now - updated_at < self._idle_ttl:
+                return
+            del self._buckets[api_key]  # noqa: WPS420
+
+
+class RateLimitMiddleware:
+    """Class RateLimitMiddleware, pure ASGI middleware.
+
+    Pass http request to application if it has no rate limit or api key
+    has token in bucket of limited endpoint. Else send response 429 with
+    header 'Retry-After'.
+
+    Attributes:
+        app (ASGIApp): wrapped ASGI application
+        limited_endpoints (tuple): methods, paths and limiters of endpoints
+
+    """
+
+    def __init__(self, app: ASGIApp, limited_endpoints: tuple) -> None:
+        """Init middleware.
+
+        Args:
+            app (ASGIApp): wrapped ASGI application
+            limited_endpoints (tuple): methods, paths and limiters of endpoints
+
+        """
+        self.app = app
+        self.limited_endpoints = limited_endpoints
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send,
+    ) -> None:
+        """Check rate limit of http request and pass it to application.
+
+        Args:
+            scope (Scope): connection scope
+            receive (Receive): ASGI receive channel
+            send (Send): ASGI send channel
+
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        limiter = self.get_limiter(scope)
+        api_key = Headers(scope=scope).get("api-key")
+        if limiter is None or not api_key:
+            await self.app(scope, receive, send)
+            return
+        retry_after = limiter.take(api_key)
+        if retry_after is None:
+            await self.app(scope, receive, send)
+            return
+        project_logger.info(f"Rate limited {api_key=}: {scope['path']=}")
+        response = JSONResponse(
+            content=too_many_requests_message,
+            status_code=429,
+            headers={"Retry-After": str(ceil(retry_after))},
+        )
+        await response(scope, receive, send)
+
+    def get_limiter(self, scope: Scope) -> Optional[TokenBucketLimiter]:
+        """Get limiter of requested endpoint.
+
+        Args:
+            scope (Scope): connection scope
+
+        Returns:
+            Optional[TokenBucketLimiter] : limiter if endpoint is limited
+
+        """
+        for methods, path_pattern, limiter in self.limited_endpoints:
+            is_limited_method = scope["method"] in methods
+            if is_limited_method and path_pattern.fullmatch(scope["path"]):
+                return limiter
+        return None
+
+
+like_tweet_limiter = TokenBucketLimiter(
+    rate=tuning_settings.rate_limit_likes_rate,
+    burst=tuning_settings.rate_limit_likes_burst,
+)
+add_media_limiter = TokenBucketLimiter(
+    rate=tuning_settings.rate_limit_medias_rate,
+    burst=tuning_settings.rate_limit_medias_burst,
+)
+add_tweet_limiter = TokenBucketLimiter(
+    rate=tuning_settings.rate_limit_tweets_rate,
+    burst=tuning_settings.rate_limit_tweets_burst,
+)
+rate_limited_endpoints = (
+    (
+        frozenset(("POST", "DELETE")),
+        re_compile(r"/api/tweets/\d+/likes"),
+        like_tweet_limiter,
+    ),
+    (frozenset(("POST",)), re_compile("/api/medias"), add_media_limiter),
+    (frozenset(("POST",)), re_compile("/api/tweets"), add_tweet_limiter),
+)
@@ -0,0 +1,73 @@
+"""Module for routing reads of api keys which just wrote to primary db."""
+
+from contextvars import ContextVar
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.admission import READ_HTTP_METHODS
+from app.cache import recent_writers_cache
+
+primary_reads: ContextVar[bool] = ContextVar("primary_reads", default=False)
+
+
+class ReadYourWritesMiddleware:
+    """Class ReadYourWritesMiddleware, pure ASGI middleware.
+
+    Remember api keys of write requests for 'READ_YOUR_WRITES_TTL' seconds
+    and route reads of their requests to primary db instead of read replica,
+    so users see their own likes and tweets despite replication lag.
+
+    Attributes:
+        app (ASGIApp): wrapped ASGI application
+
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Init middleware.
+
+        Args:
+            app (ASGIApp): wrapped ASGI application
+
+        """
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send,
+    ) -> None:
+        """Set reads from primary db for request of recent writer.
+
+        Args:
+            scope (Scope): connection scope
+            receive (Receive): ASGI receive channel
+            send (Send): ASGI send channel
+
+        """
+        if scope["type"] != "http" or not self.is_recent_writer(scope):
+            await self.app(scope, receive, send)
+            return
+        token = primary_reads.set(True)
+        # Reads of the next request in this context go to replica again
+        try:  # noqa: WPS501
+            await self.app(scope, receive, send)
+        finally:
+            primary_reads.reset(token)
+
+    @staticmethod
+    def is_recent_writer(scope: Scope) -> bool:
+        """Check if request writes or api key wrote recently.
+
+        Args:
+            scope (Scope): connection scope
+
+        Returns:
+            bool : True if request should read from primary db
+
+        """
+        api_key = Headers(scope=scope).get("api-key")
+        if not api_key:
+            return False
+        elif scope["method"] not in READ_HTTP_METHODS:
+            recent_writers_cache.set(api_key, cache_value=True)
+            return True
+        return bool(recent_writers_cache.get(api_key))
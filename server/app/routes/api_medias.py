@@ -2,8 +2,9 @@
 
 from typing import Annotated, Union
 
-from fastapi import Form, Header, Response, UploadFile, APIRouter
+from fastapi import Form, Response, UploadFile, APIRouter
 
+from app.auth import CurrentPrincipal
 from app.project_logger import project_logger
 from app.services import media_file
 from app.schemas import AddMediaOut, ErrorResponse
@@ -23,7 +24,7 @@ router = APIRouter()
 )
 async def add_media_file(
     file: Annotated[UploadFile, Form()],
-    api_key: Annotated[str, Header()],
+    principal: CurrentPrincipal,
     response: Response,
 ) -> Union[AddMediaOut, ErrorResponse]:
     """Endpoint for adding media file.
@@ -32,7 +33,7 @@ async def add_media_file(
 
     Args:
         file (UploadFile): media file
-        api_key (str): username who adding media_file
+        principal (CurrentPrincipal): user who adding media_file
         response (Response): fastapi response model for endpoint
 
     Returns:
@@ -40,8 +41,8 @@ async def add_media_file(
             error message with corresponding http status code.
 
     """
-    project_logger.info(f"{api_key=}, {file.filename=}")
-    details, http_code = await media_file.add_media_file(api_key, file)
+    project_logger.info(f"{principal=}, {file.filename=}")
+    details, http_code = await media_file.add_media_file(principal.name, file)
     project_logger.info(f"{details=}, {http_code=}")
     response.status_code = http_code
     if http_code == 201:
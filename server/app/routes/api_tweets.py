@@ -1,9 +1,11 @@
 """Module with APIRouter for url startswith api/tweets ."""
 
-from typing import Annotated, Union
+from typing import Annotated, Optional, Union
 
-from fastapi import Header, Response, APIRouter
+from fastapi import Depends, Header, Query, Response, APIRouter
+from fastapi.responses import StreamingResponse
 
+from app.auth import CurrentPrincipal
 from app.project_logger import project_logger
 from app.services import tweet, tweet_feed
 from app.schemas import (
@@ -12,9 +14,39 @@ from app.schemas import (
     ErrorResponse,
     SuccessResponse,
     TweetFeedOut,
+    TweetFeedQuery,
+    TweetLikesOut,
 )
 
 router = APIRouter()
+TweetFeedLimit = Annotated[
+    Optional[int], Query(ge=1, le=tweet_feed.MAX_TWEET_FEED_LIMIT),
+]
+TweetLikesLimit = Annotated[
+    Optional[int], Query(ge=0, le=tweet_feed.MAX_TWEET_LIKES_LIMIT),
+]
+
+
+def get_tweet_feed_query(
+    limit: TweetFeedLimit = None,
+    cursor: Optional[str] = None,
+    likes_limit: TweetLikesLimit = None,
+) -> TweetFeedQuery:
+    """Get query parameters shared by tweet feed and timeline endpoints.
+
+    Args:
+        limit (TweetFeedLimit): max number of tweets in page
+        cursor (Optional[str]=None): cursor of page from previous response
+        likes_limit (TweetLikesLimit): max number of likes of tweet
+
+    Returns:
+        TweetFeedQuery : query parameters of tweet feed
+
+    """
+    return TweetFeedQuery(limit=limit, cursor=cursor, likes_limit=likes_limit)
+
+
+TweetFeedParams = Annotated[TweetFeedQuery, Depends(get_tweet_feed_query)]
 
 
 @router.post(
@@ -29,7 +61,7 @@ router = APIRouter()
 )
 async def add_tweet(
     new_tweet: AddTweetIn,
-    api_key: Annotated[str, Header()],
+    principal: CurrentPrincipal,
     response: Response,
 ) -> Union[AddTweetOut, ErrorResponse]:
     """Endpoint for adding new tweet.
@@ -38,7 +70,7 @@ async def add_tweet(
 
     Args:
         new_tweet (AddTweetIn): tweet details
-        api_key (str): author of tweet
+        principal (CurrentPrincipal): author of tweet
         response (Response): fastapi response model for endpoint
 
     Returns:
@@ -46,8 +78,8 @@ async def add_tweet(
             error message with corresponding http status code.
 
     """
-    project_logger.info(f"{api_key=} | {new_tweet=}")
-    details, http_code = await tweet.add_tweet(api_key, new_tweet)
+    project_logger.info(f"{principal=} | {new_tweet=}")
+    details, http_code = await tweet.add_tweet(principal.name, new_tweet)
     project_logger.info(f"{details=}, {http_code=}")
     response.status_code = http_code
     return AddTweetOut(**details)
@@ -65,7 +97,7 @@ async def add_tweet(
     },
 )
 async def delete_tweet(
-    id: int, api_key: Annotated[str, Header()], response: Response,
+    id: int, principal: CurrentPrincipal, response: Response,
 ) -> Union[SuccessResponse, ErrorResponse]:
     """Endpoint for deleting tweet.
 
@@ -73,7 +105,7 @@ async def delete_tweet(
 
     Args:
         id (int): tweet id
-        api_key (str): username who wants to delete tweet
+        principal (CurrentPrincipal): user who wants to delete tweet
         response (Response): fastapi response model for endpoint
 
     Returns:
@@ -81,8 +113,8 @@ async def delete_tweet(
             error message with corresponding http status code.
 
     """
-    project_logger.info(f"{api_key=} | {id=}")
-    error_msg, http_code = await tweet.delete_tweet(api_key, id)
+    project_logger.info(f"{principal=} | {id=}")
+    error_msg, http_code = await tweet.delete_tweet(principal.name, id)
     project_logger.info(f"{error_msg=}, {http_code=}")
     response.status_code = http_code
     if error_msg:
@@ -101,7 +133,7 @@ async def delete_tweet(
     },
 )
 async def like_tweet_by_id(
-    id: int, api_key: Annotated[str, Header()], response: Response,
+    id: int, principal: CurrentPrincipal, response: Response,
 ) -> Union[SuccessResponse, ErrorResponse]:
     """Endpoint to like tweet by its id.
 
@@ -109,7 +141,7 @@ async def like_tweet_by_id(
 
     Args:
         id (int): tweet id
-        api_key (str): username who liking tweet
+        principal (CurrentPrincipal): user who liking tweet
         response (Response): fastapi response model for endpoint
 
     Returns:
@@ -117,8 +149,8 @@ async def like_tweet_by_id(
             message with corresponding http status code.
 
     """
-    project_logger.info(f"{api_key=} | {id=}")
-    error_msg, http_code = await tweet.like_tweet_by_id(api_key, id)
+    project_logger.info(f"{principal=} | {id=}")
+    error_msg, http_code = await tweet.like_tweet_by_id(principal.name, id)
     project_logger.info(f"{error_msg=}, {http_code=}")
     response.status_code = http_code
     if error_msg:
@@ -137,7 +169,7 @@ async def like_tweet_by_id(
     },
 )
 async def dislike_tweet_by_id(
-    id: int, api_key: Annotated[str, Header()], response: Response,
+    id: int, principal: CurrentPrincipal, response: Response,
 ) -> Union[SuccessResponse, ErrorResponse]:
     """Endpoint to dislike tweet by its id.
 
@@ -145,7 +177,7 @@ async def dislike_tweet_by_id(
 
     Args:
         id (int): tweet id
-        api_key (str): username who disliking tweet
+        principal (CurrentPrincipal): user who disliking tweet
         response (Response): fastapi response model for endpoint
 
     Returns:
@@ -153,8 +185,8 @@ async def dislike_tweet_by_id(
             error message with corresponding http status code.
 
     """
-    project_logger.info(f"{api_key=} | {id=}")
-    error_msg, http_code = await tweet.dislike_tweet_by_id(api_key, id)
+    project_logger.info(f"{principal=} | {id=}")
+    error_msg, http_code = await tweet.dislike_tweet_by_id(principal.name, id)
     project_logger.info(f"{error_msg=}, {http_code=}")
     response.status_code = http_code
     if error_msg:
@@ -167,31 +199,163 @@ async def dislike_tweet_by_id(
     description="Tweet feed for user",
     responses={
         200: {"description": "OK", "model": TweetFeedOut},
+        304: {"description": "Not Modified"},
+        400: {"description": "Bad Request", "model": ErrorResponse},
         401: {"description": "Unauthorized", "model": ErrorResponse},
         422: {"description": "Validation Error", "model": ErrorResponse},
     },
+    response_model=Union[TweetFeedOut, ErrorResponse],
+    response_model_exclude_none=True,
 )
 async def get_tweet_feed(
-    api_key: Annotated[str, Header()], response: Response,
+    principal: CurrentPrincipal,
+    response: Response,
+    feed_query: TweetFeedParams,
+    stream: bool = False,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Union[TweetFeedOut, ErrorResponse, Response]:
+    """Endpoint to get tweet feed.
+
+    Call handler, then set http status code and return response. Return
+    full tweet feed if neither 'limit' nor 'cursor' is set else return
+    page of tweet feed. Full tweet feed is streamed by tweets if 'stream'
+    is set. If 'likes_limit' is set, tweets have total likes and only
+    first 'likes_limit' likes.
+
+    Full tweet feed is sent with header 'ETag' of hash of tweet feed built
+    or taken from cache. If header 'If-None-Match' has it, response 304 is
+    returned without body. Streamed tweet feed is not built before it is
+    sent, so it has no 'ETag'.
+
+    Args:
+        principal (CurrentPrincipal): user who request full tweet feed
+        response (Response): fastapi response model for endpoint
+        feed_query (TweetFeedParams): limit, cursor and likes limit
+        stream (bool): stream full tweet feed
+        if_none_match (Optional[str]=None): entity tags cached by client
+
+    Returns:
+        Union[TweetFeedOut, ErrorResponse, Response]: success get tweet
+            feeed, not modified response or error message with
+            corresponding http status code.
+
+    """
+    project_logger.info(f"{principal=}, {feed_query=}")
+    project_logger.info(f"{stream=}, {if_none_match=}")
+    likes_limit = feed_query.likes_limit
+    if feed_query.limit is None and feed_query.cursor is None:
+        if stream:
+            return StreamingResponse(
+                tweet_feed.stream_full_tweet_feed(likes_limit),
+                media_type="application/json",
+            )
+        tweet_feed_data, http_code, etag = (
+            await tweet_feed.get_full_tweet_feed(likes_limit)
+        )
+        if tweet_feed.is_matched_etag(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+    else:
+        tweet_feed_data, http_code = await tweet_feed.get_tweet_feed_page(
+            feed_query.limit or tweet_feed.DEFAULT_TWEET_FEED_LIMIT,
+            feed_query.cursor,
+            likes_limit,
+        )
+    project_logger.info(f"{tweet_feed_data=}, {http_code=}")
+    response.status_code = http_code
+    if http_code == 200:
+        return TweetFeedOut(**tweet_feed_data)
+    return ErrorResponse(**tweet_feed_data)
+
+
+@router.get(
+    path="/api/tweets/timeline",
+    description="Timeline of tweets of followed users",
+    responses={
+        200: {"description": "OK", "model": TweetFeedOut},
+        400: {"description": "Bad Request", "model": ErrorResponse},
+        401: {"description": "Unauthorized", "model": ErrorResponse},
+        422: {"description": "Validation Error", "model": ErrorResponse},
+    },
+    response_model_exclude_none=True,
+)
+async def get_user_tweet_feed(
+    principal: CurrentPrincipal,
+    response: Response,
+    feed_query: TweetFeedParams,
 ) -> Union[TweetFeedOut, ErrorResponse]:
-    """Endpoint to get full tweet feed.
+    """Endpoint to get timeline of user.
 
-    Call handler, then set http status code and return response.
+    Call handler, then set http status code and return response with page
+    of tweets of followed users, newest first. If 'likes_limit' is set,
+    tweets have total likes and only first 'likes_limit' likes.
 
     Args:
-        api_key (str): username who request full tweet feed
+        principal (CurrentPrincipal): user who request timeline
+        response (Response): fastapi response model for endpoint
+        feed_query (TweetFeedParams): limit, cursor and likes limit
+
+    Returns:
+        Union[TweetFeedOut, ErrorResponse]: success get timeline or error
+            message with corresponding http status code.
+
+    """
+    project_logger.info(f"{principal=}, {feed_query=}")
+    tweet_feed_data, http_code = await tweet_feed.get_user_tweet_feed(
+        principal.id,
+        feed_query.limit or tweet_feed.DEFAULT_TWEET_FEED_LIMIT,
+        feed_query.cursor,
+        feed_query.likes_limit,
+    )
+    project_logger.info(f"{tweet_feed_data=}, {http_code=}")
+    response.status_code = http_code
+    if http_code == 200:
+        return TweetFeedOut(**tweet_feed_data)
+    return ErrorResponse(**tweet_feed_data)
+
+
+@router.get(
+    path="/api/tweets/{id}/likes",
+    description="Likes of tweet by id",
+    responses={
+        200: {"description": "OK", "model": TweetLikesOut},
+        400: {"description": "Bad Request", "model": ErrorResponse},
+        401: {"description": "Unauthorized", "model": ErrorResponse},
+        422: {"description": "Validation Error", "model": ErrorResponse},
+    },
+    response_model_exclude_none=True,
+)
+async def get_tweet_likes(
+    id: int,
+    principal: CurrentPrincipal,
+    response: Response,
+    limit: TweetFeedLimit = None,
+    cursor: Optional[str] = None,
+) -> Union[TweetLikesOut, ErrorResponse]:
+    """Endpoint to get likes of tweet by its id.
+
+    Call handler, then set http status code and return response with page
+    of users who liked tweet in order of likes.
+
+    Args:
+        id (int): tweet id
+        principal (CurrentPrincipal): user who request likes of tweet
         response (Response): fastapi response model for endpoint
+        limit (TweetFeedLimit): max number of likes in page
+        cursor (Optional[str]=None): cursor of page from previous response
 
     Returns:
-        Union[TweetFeedOut, ErrorResponse]: success get tweet feeed or
+        Union[TweetLikesOut, ErrorResponse]: success get likes of tweet or
             error message with corresponding http status code.
 
     """
-    project_logger.info(f"{api_key=}")
-    # tweet_feed_data, http_code = (
-    #     await tweet_feed.get_user_tweet_feed(api_key)
-    # )
-    tweet_feed_data, http_code = await tweet_feed.get_full_tweet_feed()
-    project_logger.info(f"{tweet_feed=}, {http_code=}")
+    project_logger.info(f"{principal=} | {id=}")
+    project_logger.info(f"{limit=}, {cursor=}")
+    likes_data, http_code = await tweet.get_tweet_likes(
+        id, limit or tweet_feed.DEFAULT_TWEET_FEED_LIMIT, cursor,
+    )
+    project_logger.info(f"{likes_data=}, {http_code=}")
     response.status_code = http_code
-    return TweetFeedOut(**tweet_feed_data)
+    if http_code == 200:
+        return TweetLikesOut(**likes_data)
+    return ErrorResponse(**likes_data)
@@ -1,9 +1,10 @@
 """Module with APIRouter for url startswith api/users ."""
 
-from typing import Annotated, Union
+from typing import Union
 
-from fastapi import Header, Response, APIRouter
+from fastapi import Response, APIRouter
 
+from app.auth import CurrentPrincipal
 from app.project_logger import project_logger
 from app.services import profile, user
 from app.schemas import ErrorResponse, UserProfileDetailsOut, SuccessResponse
@@ -22,14 +23,14 @@ router = APIRouter()
     },
 )
 async def get_own_profile_details(
-    api_key: Annotated[str, Header()], response: Response,
+    principal: CurrentPrincipal, response: Response,
 ) -> Union[UserProfileDetailsOut, ErrorResponse]:
     """Endpoint to get own profile.
 
     Call handler, then set http status code and return response.
 
     Args:
-        api_key (str): username who request own profile
+        principal (CurrentPrincipal): user who request own profile
         response (Response): fastapi response model for endpoint
 
     Returns:
@@ -37,8 +38,8 @@ async def get_own_profile_details(
         profile or error message with corresponding http status code.
 
     """
-    project_logger.info(f"{api_key=}")
-    details, http_code = await profile.get_own_profile(api_key)
+    project_logger.info(f"{principal=}")
+    details, http_code = await profile.get_own_profile(principal.id)
     project_logger.info(f"{details=}, {http_code=}")
     response.status_code = http_code
     if http_code == 200:
@@ -57,7 +58,7 @@ async def get_own_profile_details(
     },
 )
 async def get_user_profile_details(
-    id: int, api_key: Annotated[str, Header()], response: Response,
+    id: int, principal: CurrentPrincipal, response: Response,
 ) -> Union[UserProfileDetailsOut, ErrorResponse]:
     """Endpoint to get user profile.
 
@@ -65,7 +66,7 @@ async def get_user_profile_details(
 
     Args:
         id (int): user id whose profile is required
-        api_key (str): username who requests user profile
+        principal (CurrentPrincipal): user who requests user profile
         response (Response): fastapi response model for endpoint
 
     Returns:
@@ -73,7 +74,7 @@ async def get_user_profile_details(
         profile or error message with corresponding http status code.
 
     """
-    project_logger.info(f"{api_key=}")
+    project_logger.info(f"{principal=}")
     details, http_code = await profile.get_user_profile(id)
     project_logger.info(f"{details=}, {http_code=}")
     response.status_code = http_code
@@ -93,15 +94,15 @@ async def get_user_profile_details(
     },
 )
 async def follow_other_user(
-    id: int, api_key: Annotated[str, Header()], response: Response,
+    id: int, principal: CurrentPrincipal, response: Response,
 ) -> Union[SuccessResponse, ErrorResponse]:
-    """Endpoint for adding followed user 'id' to user 'api_key'.
+    """Endpoint for adding followed user 'id' to user 'principal'.
 
     Call handler, then set http status code and return response.
 
     Args:
         id (int): followed user id
-        api_key (str): username whom to add followed user
+        principal (CurrentPrincipal): user whom to add followed user
         response (Response): fastapi response model for endpoint
 
     Returns:
@@ -109,8 +110,8 @@ async def follow_other_user(
             or error message with corresponding http status code.
 
     """
-    project_logger.info(f"{api_key=} | {id=}")
-    error_msg, http_code = await user.follow_other_user(api_key, id)
+    project_logger.info(f"{principal=} | {id=}")
+    error_msg, http_code = await user.follow_other_user(principal.id, id)
     project_logger.info(f"{error_msg=}, {http_code=}")
     response.status_code = http_code
     if error_msg:
@@ -129,15 +130,15 @@ async def follow_other_user(
     },
 )
 async def unfollow_user(
-    id: int, api_key: Annotated[str, Header()], response: Response,
+    id: int, principal: CurrentPrincipal, response: Response,
 ) -> Union[SuccessResponse, ErrorResponse]:
-    """Endpoint to unfollow user 'id' for user 'api_key'.
+    """Endpoint to unfollow user 'id' for user 'principal'.
 
     Call handler, then set http status code and return response.
 
     Args:
         id (int): followed user id
-        api_key (str): username who wants to unfollow
+        principal (CurrentPrincipal): user who wants to unfollow
         response (Response): fastapi response model for endpoint
 
     Returns:
@@ -145,8 +146,8 @@ async def unfollow_user(
             error message with corresponding http status code.
 
     """
-    project_logger.info(f"{api_key=} | {id=}")
-    error_msg, http_code = await user.unfollow_user(api_key, id)
+    project_logger.info(f"{principal=} | {id=}")
+    error_msg, http_code = await user.unfollow_user(principal.id, id)
     project_logger.info(f"{error_msg=}, {http_code=}")
     response.status_code = http_code
     if error_msg:
@@ -0,0 +1,56 @@
+"""Module with APIRouter for url metrics ."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.admission import admission_limiters
+from app.cache import (
+    api_key_cache,
+    recent_writers_cache,
+    tweet_feed_cache,
+    unknown_api_key_cache,
+)
+from app.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    render_metrics,
+    request_metrics,
+)
+from app.rate_limit import (
+    add_media_limiter,
+    add_tweet_limiter,
+    like_tweet_limiter,
+)
+from connection import get_pool_metrics
+
+router = APIRouter()
+rate_limiters = {
+    "likes": like_tweet_limiter,
+    "medias": add_media_limiter,
+    "tweets": add_tweet_limiter,
+}
+caches = {
+    "tweet_feed": tweet_feed_cache,
+    "api_key": api_key_cache,
+    "unknown_api_key": unknown_api_key_cache,
+    "recent_writers": recent_writers_cache,
+}
+
+
+@router.get(path="/metrics", include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    """Endpoint for getting metrics of worker in Prometheus text format.
+
+    Returns:
+        PlainTextResponse: metrics of requests, db pool, caches and limiters
+
+    """
+    return PlainTextResponse(
+        render_metrics(
+            request_metrics,
+            admission_limiters,
+            rate_limiters,
+            caches,
+            get_pool_metrics(),
+        ),
+        media_type=PROMETHEUS_CONTENT_TYPE,
+    )
@@ -6,8 +6,140 @@ from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
 
-class Settings(BaseSettings):
-    """Class Settings, parent class BaseSettings.
+class TuningSettings(BaseSettings):
+    """Class TuningSettings, parent class BaseSettings.
+
+    Class check optional parameters passed to os environ to tune caches,
+    db pools, timelines and limits of the application. Modules read them
+    from one instance 'tuning_settings'.
+
+    Attributes:
+        tweet_feed_cache_size (int): max number of tweet feeds in cache
+        tweet_feed_cache_ttl (float): time to live in seconds of tweet feed
+        in cache
+        timeline_fan_out_max_followers (int): max number of followers of
+        author to push his tweets to their timelines on write
+        timeline_engine (Literal["fanout_write", "fanout_read"]): build
+        timelines on write to table 'timelines' or on read
+        api_key_cache_size (int): max number of known and of unknown api
+        keys in cache
+        api_key_cache_ttl (float): time to live in seconds of known api key
+        in cache
+        unknown_api_key_cache_ttl (float): time to live in seconds of
+        unknown api key in cache
+        admission_feed_reads_limit (int): max number of read requests in
+        flight
+        admission_writes_limit (int): max number of write requests in flight
+        admission_media_uploads_limit (int): max number of media upload
+        requests in flight
+        admission_queue_size (int): max number of requests of route class
+        waiting for a free slot
+        admission_queue_timeout (float): max time in seconds of waiting for
+        a free slot
+        admission_retry_after (int): seconds in header 'Retry-After' of
+        rejected request
+        rate_limit_likes_rate (float): tokens per second added to bucket of
+        api key for likes and dislikes of tweets
+        rate_limit_likes_burst (int): max tokens in bucket of api key for
+        likes and dislikes of tweets
+        rate_limit_medias_rate (float): tokens per second added to bucket of
+        api key for adding media files
+        rate_limit_medias_burst (int): max tokens in bucket of api key for
+        adding media files
+        rate_limit_tweets_rate (float): tokens per second added to bucket of
+        api key for adding tweets
+        rate_limit_tweets_burst (int): max tokens in bucket of api key for
+        adding tweets
+        db_pool_size (int): number of connections kept in db pool
+        db_max_overflow (int): max number of connections over 'db_pool_size'
+        db_pool_pre_ping (bool): test connection before checkout
+        db_pool_recycle (int): max age of connection in seconds
+        db_pool_timeout (float): max time in seconds of waiting for
+        connection from pool
+        database_read_url (Optional[str]): url for connect to read replica of
+        application db
+        read_your_writes_ttl (float): time in seconds to read from primary
+        db for api key which wrote
+        query_repeat_threshold (int): min number of executions of the same
+        statement in request to log it as possible N+1 query
+
+    """
+
+    tweet_feed_cache_size: int = Field(
+        default=128, ge=1, env="TWEET_FEED_CACHE_SIZE",
+    )
+    tweet_feed_cache_ttl: float = Field(
+        default=30, ge=0, env="TWEET_FEED_CACHE_TTL",
+    )
+    timeline_fan_out_max_followers: int = Field(
+        default=10000, ge=0, env="TIMELINE_FAN_OUT_MAX_FOLLOWERS",
+    )
+    timeline_engine: Literal["fanout_write", "fanout_read"] = Field(
+        default="fanout_write", env="TIMELINE_ENGINE",
+    )
+    api_key_cache_size: int = Field(
+        default=10000, ge=1, env="API_KEY_CACHE_SIZE",
+    )
+    api_key_cache_ttl: float = Field(
+        default=300, ge=0, env="API_KEY_CACHE_TTL",
+    )
+    unknown_api_key_cache_ttl: float = Field(
+        default=5, ge=0, env="UNKNOWN_API_KEY_CACHE_TTL",
+    )
+    admission_feed_reads_limit: int = Field(
+        default=32, ge=1, env="ADMISSION_FEED_READS_LIMIT",
+    )
+    admission_writes_limit: int = Field(
+        default=16, ge=1, env="ADMISSION_WRITES_LIMIT",
+    )
+    admission_media_uploads_limit: int = Field(
+        default=4, ge=1, env="ADMISSION_MEDIA_UPLOADS_LIMIT",
+    )
+    admission_queue_size: int = Field(
+        default=100, ge=0, env="ADMISSION_QUEUE_SIZE",
+    )
+    admission_queue_timeout: float = Field(
+        default=5, ge=0, env="ADMISSION_QUEUE_TIMEOUT",
+    )
+    admission_retry_after: int = Field(
+        default=1, ge=0, env="ADMISSION_RETRY_AFTER",
+    )
+    rate_limit_likes_rate: float = Field(
+        default=1, gt=0, env="RATE_LIMIT_LIKES_RATE",
+    )
+    rate_limit_likes_burst: int = Field(
+        default=10, ge=1, env="RATE_LIMIT_LIKES_BURST",
+    )
+    rate_limit_medias_rate: float = Field(
+        default=1, gt=0, env="RATE_LIMIT_MEDIAS_RATE",
+    )
+    rate_limit_medias_burst: int = Field(
+        default=10, ge=1, env="RATE_LIMIT_MEDIAS_BURST",
+    )
+    rate_limit_tweets_rate: float = Field(
+        default=1, gt=0, env="RATE_LIMIT_TWEETS_RATE",
+    )
+    rate_limit_tweets_burst: int = Field(
+        default=10, ge=1, env="RATE_LIMIT_TWEETS_BURST",
+    )
+    db_pool_size: int = Field(default=5, ge=1, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, ge=0, env="DB_MAX_OVERFLOW")
+    db_pool_pre_ping: bool = Field(default=True, env="DB_POOL_PRE_PING")
+    db_pool_recycle: int = Field(default=1800, env="DB_POOL_RECYCLE")
+    db_pool_timeout: float = Field(default=30, ge=0, env="DB_POOL_TIMEOUT")
+    database_read_url: Optional[str] = Field(
+        default=None, env="DATABASE_READ_URL",
+    )
+    read_your_writes_ttl: float = Field(
+        default=5, ge=0, env="READ_YOUR_WRITES_TTL",
+    )
+    query_repeat_threshold: int = Field(
+        default=10, ge=1, env="QUERY_REPEAT_THRESHOLD",
+    )
+
+
+class Settings(TuningSettings):
+    """Class Settings, parent class TuningSettings.
 
     Class check additional parameters passed to os environ to run the
     application.
@@ -42,6 +174,9 @@ class Settings(BaseSettings):
     logs_path: str = Field(env="LOGS_PATH")
 
 
+tuning_settings = TuningSettings()
+
+
 class SuccessResponse(BaseModel):
     """Class SuccessResponse, parent class BaseModel.
 
@@ -132,6 +267,31 @@ class UserShortDetails(BaseModel):
     name: str
 
 
+class Principal(UserShortDetails):
+    """Class Principal, parent class UserShortDetails.
+
+    Class for details of user authenticated by header 'api-key'.
+
+    """
+
+
+class TweetFeedQuery(BaseModel):
+    """Class TweetFeedQuery, parent class BaseModel.
+
+    Class for query parameters of tweet feed and timeline endpoints.
+
+    Attributes:
+        limit (Optional[int]): max number of tweets in page
+        cursor (Optional[str]): cursor of page from previous response
+        likes_limit (Optional[int]): max number of likes of tweet
+
+    """
+
+    limit: Optional[int] = None
+    cursor: Optional[str] = None
+    likes_limit: Optional[int] = None
+
+
 class TweetFullDetails(BaseModel):
     """Class TweetFullDetails, parent class BaseModel.
 
@@ -144,6 +304,7 @@ class TweetFullDetails(BaseModel):
         attachments: List[Optional[str]]: file media names belongs to tweet
         author (UserShortDetails): tweet author details
         likes: List[Optional[TweetLikeShortDetails]]: likes details
+        like_count (Optional[int]=None): total likes if 'likes' are truncated
 
     """
 
@@ -152,6 +313,7 @@ class TweetFullDetails(BaseModel):
     attachments: List[Optional[str]]
     author: UserShortDetails
     likes: List[Optional[TweetLikeShortDetails]]
+    like_count: Optional[int] = None
 
 
 class TweetFeedOut(SuccessResponse):
@@ -161,10 +323,28 @@ class TweetFeedOut(SuccessResponse):
 
     Attributes:
         tweets (List[Optional[TweetFullDetails]]): tweets details
+        next_cursor (Optional[str]=None): cursor for the next page of tweets
 
     """
 
     tweets: List[Optional[TweetFullDetails]]
+    next_cursor: Optional[str] = None
+
+
+class TweetLikesOut(SuccessResponse):
+    """Class TweetLikesOut, parent class SuccessResponse.
+
+    Class for validation success response body for 'get_tweet_likes'
+    endpoint.
+
+    Attributes:
+        likes (List[TweetLikeShortDetails]): likes details
+        next_cursor (Optional[str]=None): cursor for the next page of likes
+
+    """
+
+    likes: List[TweetLikeShortDetails]
+    next_cursor: Optional[str] = None
 
 
 class UserDetails(UserShortDetails):
@@ -52,20 +52,20 @@ async def get_user_profile(user_id: int) -> tuple[dict, int]:
     return response_message, 200
 
 
-async def get_own_profile(api_key: str) -> tuple[dict, int]:
+async def get_own_profile(user_id: int) -> tuple[dict, int]:
     """Handle logic of get own profile endpoint.
 
-    Check if user 'api_key' is existed then create user profile and return
+    Check if user 'user_id' is existed then create user profile and return
     success response details. Else return response with error.
 
     Args:
-        api_key (str): username
+        user_id (int): authenticated user id
 
     Returns:
         tuple[dict, int]: response message and status code
 
     """
-    user = await User.get_user_by_name(api_key)
+    user = await User.get_user_by_id(user_id)
     if not user:
         return create_unregister_response()
     user_profile = create_user_profile(user)
@@ -2,11 +2,17 @@
 
 from typing import Optional
 
+from app.models.timelines import FANOUT_WRITE_ENGINE, TIMELINE_ENGINE, Timeline
 from app.models.tweets import Tweet
 from app.models.tweet_likes import TweetLike
 from app.schemas import AddTweetIn
 from common import create_bad_request_response, create_forbidden_response
 from media_file import delete_media_files
+from tweet_feed import (
+    decode_feed_cursor,
+    encode_feed_cursor,
+    invalidate_tweet_feed_cache,
+)
 
 
 async def add_tweet(
@@ -14,7 +20,9 @@ async def add_tweet(
 ) -> tuple[dict, int]:
     """Handle logic of add tweet endpoint.
 
-    Add new tweet in db and return success response details.
+    Add new tweet in db, push it to timelines of author followers if
+    timelines are built on write, invalidate tweet feed cache and return
+    success response details.
 
     Args:
         api_key (str): user name
@@ -28,6 +36,9 @@ async def add_tweet(
     tweet_id = await Tweet.add_tweet(
         **new_tweet_details, author_name=api_key,
     )
+    if TIMELINE_ENGINE == FANOUT_WRITE_ENGINE:
+        await Timeline.fan_out_tweet(api_key, tweet_id)
+    invalidate_tweet_feed_cache()
     return {"tweet_id": tweet_id}, 201
 
 
@@ -37,8 +48,9 @@ async def delete_tweet(
     """Handle logic of delete tweet endpoint.
 
     Check if user tries to delete his own tweet. If so delete tweet and
-    corresponding tweet files from db and from system. Then return success
-    response details. Else return response with error.
+    corresponding tweet files from db and from system and invalidate tweet
+    feed cache. Then return success response details. Else return response
+    with error.
 
     Args:
         api_key (str): username
@@ -53,6 +65,7 @@ async def delete_tweet(
         return create_forbidden_response(
             "You can delete only yours tweet which is posted!",
         )
+    invalidate_tweet_feed_cache()
     media_files_ids = deleted_details[1]
     if media_files_ids:
         await delete_media_files(
@@ -68,8 +81,8 @@ async def dislike_tweet_by_id(
     """Handle logic of dislike tweet endpoint.
 
     Check if user liked tweet and tweet is existed. If so remove tweet like
-    details from db and return success response details. Else return
-    response with error.
+    details from db, invalidate tweet feed cache and return success response
+    details. Else return response with error.
 
     Args:
         api_key (str): username
@@ -84,6 +97,7 @@ async def dislike_tweet_by_id(
         return create_bad_request_response(
             "You did not like the tweet!",
         )
+    invalidate_tweet_feed_cache()
 
     return None, 201
 
@@ -93,8 +107,9 @@ async def like_tweet_by_id(
 ) -> tuple[Optional[dict], int]:
     """Handle logic of like tweet endpoint.
 
-    Check if user does not like tweet and tweet is existed. If so return
-    success response details. Else return response with error.
+    Check if user does not like tweet and tweet is existed. If so add tweet
+    like details in db, invalidate tweet feed cache and return success
+    response details. Else return response with error.
 
     Args:
         api_key (str): username
@@ -109,5 +124,48 @@ async def like_tweet_by_id(
         return create_bad_request_response(
             "You have already liked the tweet!",
         )
+    invalidate_tweet_feed_cache()
 
     return None, 201
+
+
+async def get_tweet_likes(
+    tweet_id: int, limit: int, cursor: Optional[str] = None,
+) -> tuple[dict, int]:
+    """Handle logic of get tweet likes endpoint.
+
+    Create page of users who liked tweet sorted by like which starts after
+    like encoded in 'cursor'. Then return success response details with
+    cursor for the next page if there could be more likes. Else return
+    response with error if cursor is invalid or tweet is not existed.
+
+    Args:
+        tweet_id (int): tweet id
+        limit (int): max number of likes in page
+        cursor (Optional[str]=None): cursor from previous page
+
+    Returns:
+        tuple[dict, int]: response message and status code
+
+    """
+    after_id = None
+    if cursor:
+        after = decode_feed_cursor(cursor, position_size=1)
+        if not after:
+            return create_bad_request_response("Invalid tweet likes cursor!")
+        after_id = after[0]
+    likers = await TweetLike.get_likers_page(tweet_id, limit, after_id)
+    if not likers and not await Tweet.is_existed_tweet(tweet_id):
+        return create_bad_request_response("Tweet is not existed!")
+    next_cursor = None
+    if len(likers) == limit:
+        next_cursor = encode_feed_cursor(likers[-1].id)
+    response_message = {
+        "result": True,
+        "likes": [
+            {"user_id": i_liker.user_id, "name": i_liker.name}
+            for i_liker in likers
+        ],
+        "next_cursor": next_cursor,
+    }
+    return response_message, 200
@@ -1,16 +1,115 @@
 """Module for handling logic for tweet feed."""
 
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from functools import partial
+from hashlib import blake2b
+from json import dumps as json_dumps
+from time import monotonic
+from typing import Any, AsyncGenerator, Iterable, Optional
+
+from sqlalchemy.engine import Row
+
+from app.cache import (
+    recent_writers_cache,
+    tweet_feed_cache,
+    tweet_feed_version,
+)
 from app.models.media_files import MediaFile
+from app.models.timelines import FANOUT_READ_ENGINE, TIMELINE_ENGINE, Timeline
+from app.models.tweet_likes import TweetLike
 from app.models.tweets import Tweet
-from app.models.users import User
-from common import create_unregister_response
+from app.project_logger import project_logger
+from app.read_your_writes import primary_reads
+from common import create_bad_request_response
+from connection import is_replica_read
+
+DEFAULT_TWEET_FEED_LIMIT = 20
+MAX_TWEET_FEED_LIMIT = 100
+MAX_TWEET_LIKES_LIMIT = 100
+STREAM_TWEET_FEED_CHUNK_SIZE = 500
+# Sort keys of cursor are INTEGER columns of db
+MAX_FEED_CURSOR_KEY = 2 ** 31 - 1
+# Same JSON encoding as fastapi JSONResponse, streamed feed is byte identical
+dump_json = partial(json_dumps, ensure_ascii=False, separators=(",", ":"))
+
+
+def encode_feed_cursor(*position: int) -> str:
+    """Encode position of tweet in tweet feed to opaque cursor.
+
+    Args:
+        position (int): sort keys of tweet, e.g. total likes and tweet id
+
+    Returns:
+        str : opaque cursor
+
+    """
+    encoded_position = ":".join(map(str, position)).encode()
+    return urlsafe_b64encode(encoded_position).decode().rstrip("=")
+
+
+def decode_feed_cursor(
+    cursor: str, position_size: int = 2,
+) -> Optional[tuple[int, ...]]:
+    """Decode opaque cursor to position of tweet in tweet feed.
+
+    Args:
+        cursor (str): opaque cursor
+        position_size (int): number of sort keys in position
+
+    Returns:
+        Optional[tuple[int, ...]] : sort keys of tweet if cursor is valid
+            else None
+
+    """
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        position = urlsafe_b64decode(cursor + padding).decode().split(":")
+    except (BinasciiError, ValueError):
+        return None
+    if len(position) != position_size:
+        return None
+    if not all(i_key.isascii() and i_key.isdigit() for i_key in position):
+        return None
+    decoded_position = tuple(map(int, position))
+    if max(decoded_position) > MAX_FEED_CURSOR_KEY:
+        return None
+    return decoded_position
 
 
-async def create_tweet_feed(tweets: list[Tweet]) -> list:
-    """Create tweet feed.
+def create_attachments(
+    tweet_media_ids: Optional[Iterable[int]], media_files_names: dict,
+) -> list:
+    """Create attachments of tweet in order of tweet media ids.
 
     Args:
-        tweets (list[Tweet]): list of tweets
+        tweet_media_ids (Optional[Iterable[int]]): media ids of tweet
+        media_files_names (dict): media files names by media file ids
+
+    Returns:
+        list : media files names
+
+    """
+    return [
+        media_files_names[i_media_id]
+        for i_media_id in tweet_media_ids or ()
+        if i_media_id in media_files_names
+    ]
+
+
+def assemble_tweet_feed(
+    tweets: list[Row],
+    media_files_names: dict,
+    likers: dict[int, list[Row]],
+    likes_limit: Optional[int] = None,
+) -> list:
+    """Assemble tweet feed from rows of tweets, media files and likers.
+
+    Args:
+        tweets (list[Row]): tweets details selected by get_tweet_feed_query
+        media_files_names (dict): media files names by media file ids
+        likers (dict[int, list[Row]]): likers of tweets by tweet ids
+        likes_limit (Optional[int]): max number of likers of tweet
 
     Returns:
         list : tweet feed
@@ -18,78 +117,331 @@ async def create_tweet_feed(tweets: list[Tweet]) -> list:
     """
     tweet_feed = []
     for i_tweet in tweets:
-        attachments = []
-        if i_tweet.tweet_media_ids:
-            attachments = await MediaFile.get_media_files_names(
-                i_tweet.tweet_media_ids,
-            )
-        likes = []
-        for i_like in i_tweet.likes:
-            like_details = {
-                "user_id": i_like.user_details.id,
-                "name": i_like.user_details.name,
-            }
-            likes.append(like_details)
         tweet_details = {
             "id": i_tweet.id,
             "content": i_tweet.tweet_data,
-            "attachments": attachments,
-            "author": {
-                "id": i_tweet.author.id,
-                "name": i_tweet.author.name,
-            },
-            "likes": likes,
+            "attachments": create_attachments(
+                i_tweet.tweet_media_ids, media_files_names,
+            ),
+            "author": {"id": i_tweet.author_id, "name": i_tweet.author_name},
+            "likes": [
+                {"user_id": i_liker.user_id, "name": i_liker.name}
+                for i_liker in likers.get(i_tweet.id, ())
+            ],
         }
+        if likes_limit is not None:
+            tweet_details["like_count"] = i_tweet.like_count
         tweet_feed.append(tweet_details)
     return tweet_feed
 
 
-async def get_full_tweet_feed() -> tuple[dict, int]:
+async def create_tweet_feed_from_rows(
+    tweets: list[Row], likes_limit: Optional[int] = None,
+) -> list:
+    """Create tweet feed from rows of tweets details.
+
+    Likers and media files names of all tweets are fetched with one query
+    each as plain rows. If 'likes_limit' is set, only first 'likes_limit'
+    likers of tweet are added and total likes of tweet are added as
+    'like_count'.
+
+    Args:
+        tweets (list[Row]): tweets details selected by get_tweet_feed_query
+        likes_limit (Optional[int]): max number of likers of tweet
+
+    Returns:
+        list : tweet feed
+
+    """
+    media_files_names = await MediaFile.get_media_files_names_by_ids(
+        i_media_id
+        for i_tweet in tweets
+        for i_media_id in i_tweet.tweet_media_ids or ()
+    )
+    likers = await TweetLike.get_likers_by_tweet_ids(
+        (i_tweet.id for i_tweet in tweets), likes_limit,
+    )
+    return assemble_tweet_feed(
+        tweets, media_files_names, likers, likes_limit,
+    )
+
+
+def invalidate_tweet_feed_cache() -> None:
+    """Remove all built tweet feeds from cache and bump tweet feed version.
+
+    Call it after tweets or their likes are changed.
+
+    """
+    project_logger.info("Invalidating tweet feed cache")
+    tweet_feed_cache.clear()
+    tweet_feed_version.bump()
+
+
+def create_tweet_feed_etag(response_message: dict) -> str:
+    """Create entity tag of tweet feed from hash of its JSON.
+
+    Entity tag does not depend on process which built tweet feed, it is
+    changed only when rebuilt tweet feed is changed.
+
+    Args:
+        response_message (dict): response message with tweet feed
+
+    Returns:
+        str : entity tag for header 'ETag'
+
+    """
+    feed_json = dump_json(response_message).encode()
+    feed_hash = blake2b(feed_json, digest_size=16).hexdigest()
+    return f'"{feed_hash}"'
+
+
+def is_matched_etag(if_none_match: Optional[str], etag: str) -> bool:
+    """Check if entity tag is in value of header 'If-None-Match'.
+
+    Weak comparison is used: prefix 'W/' of entity tags is ignored.
+
+    Args:
+        if_none_match (Optional[str]): value of header 'If-None-Match'
+        etag (str): current entity tag
+
+    Returns:
+        bool : True if client has current version else False
+
+    """
+    if not if_none_match:
+        return False
+    client_etags = {
+        i_etag.strip().removeprefix("W/")
+        for i_etag in if_none_match.split(",")
+    }
+    return etag in client_etags or "*" in client_etags
+
+
+def is_cacheable_tweet_feed() -> bool:
+    """Check if tweet feed read by request can be taken from or added to cache.
+
+    Recent writers read from primary db and bypass cache to see their own
+    writes. Tweet feed read from read replica is cached only after
+    'READ_YOUR_WRITES_TTL' seconds since the last invalidation of cache, so
+    changes missed by lagging replica are not cached for all users.
+
+    Returns:
+        bool : True if tweet feed can be cached
+
+    """
+    if primary_reads.get():
+        return False
+    elif not is_replica_read():
+        return True
+    changed_ago = monotonic() - tweet_feed_version.changed_at
+    return changed_ago >= recent_writers_cache.ttl
+
+
+def get_cached_tweet_feed(cache_key: tuple) -> Optional[Any]:
+    """Get built tweet feed from cache.
+
+    Cache is bypassed by requests of recent writers.
+
+    Args:
+        cache_key (tuple): key of tweet feed in cache
+
+    Returns:
+        Optional[Any] : response message, with entity tag for full tweet
+            feed, if tweet feed is cached
+
+    """
+    if primary_reads.get():
+        return None
+    cached_tweet_feed = tweet_feed_cache.get(cache_key)
+    if cached_tweet_feed is None:
+        project_logger.info(
+            f"Tweet feed cache miss {cache_key=}: {tweet_feed_cache.stats()}",
+        )
+    return cached_tweet_feed
+
+
+def cache_tweet_feed(
+    cache_key: tuple, cached_tweet_feed: Any, feed_version: int,
+) -> None:
+    """Add built tweet feed to cache if it was not invalidated meanwhile.
+
+    Tweet feed which was built while tweets were changed could miss the
+    change, so it is not cached if tweet feed version was bumped. Tweet
+    feed is not cached either if it is not cacheable for request.
+
+    Args:
+        cache_key (tuple): key of tweet feed in cache
+        cached_tweet_feed (Any): response message, with entity tag if any
+        feed_version (int): tweet feed version before tweets were read
+
+    """
+    if feed_version != tweet_feed_version.current:
+        project_logger.info(f"Tweet feed {cache_key=} is outdated, skip it")
+        return
+    elif not is_cacheable_tweet_feed():
+        project_logger.info(f"Tweet feed {cache_key=} is not cacheable")
+        return
+    tweet_feed_cache.set(cache_key, cached_tweet_feed)
+
+
+async def get_full_tweet_feed(
+    likes_limit: Optional[int] = None,
+) -> tuple[dict, int, str]:
     """Handle logic of get tweet feed endpoint.
 
-    Create list of tweets with details sorted descending by likes and
-    return success response details
+    Return full tweet feed from cache if it is cached. Else create list of
+    tweets with details sorted descending by likes, cache it with its
+    entity tag if tweets were not changed meanwhile and return success
+    response details.
+
+    Args:
+        likes_limit (Optional[int]=None): max number of likers of tweet
 
     Returns:
-        tuple[dict, int]: response message and status code
+        tuple[dict, int, str]: response message, status code and entity tag
 
     """
-    tweets = await Tweet.get_all_tweets_sorted_by_likes()
+    cache_key = ("full", likes_limit)
+    cached_tweet_feed = get_cached_tweet_feed(cache_key)
+    if cached_tweet_feed is not None:
+        response_message, etag = cached_tweet_feed
+        return response_message, 200, etag
+    feed_version = tweet_feed_version.current
+    tweets = await Tweet.get_all_tweet_feed_rows_sorted_by_likes()
     tweet_feed = []
     if tweets:
-        tweet_feed = await create_tweet_feed(tweets)
+        tweet_feed = await create_tweet_feed_from_rows(tweets, likes_limit)
     response_message = {"result": True, "tweets": tweet_feed}
+    etag = create_tweet_feed_etag(response_message)
+    cache_tweet_feed(cache_key, (response_message, etag), feed_version)
+    return response_message, 200, etag
+
+
+async def stream_full_tweet_feed(
+    likes_limit: Optional[int] = None,
+    chunk_size: int = STREAM_TWEET_FEED_CHUNK_SIZE,
+) -> AsyncGenerator[str, None]:
+    """Handle logic of get tweet feed endpoint in streaming mode.
+
+    Read tweets sorted descending by likes in chunks and yield JSON of
+    response message by fragments, one per tweet. Response message is the
+    same as of 'get_full_tweet_feed' but it is never built in memory and
+    is not cached.
+
+    Args:
+        likes_limit (Optional[int]=None): max number of likers of tweet
+        chunk_size (int): number of tweets read from db at once
+
+    Yields:
+        str : fragment of response message in JSON
+
+    """
+    yield '{"result":true,"tweets":['
+    separator = ""
+    tweets_chunks = Tweet.stream_all_tweet_feed_rows_sorted_by_likes(
+        chunk_size,
+    )
+    async for i_tweets in tweets_chunks:
+        tweet_feed = await create_tweet_feed_from_rows(i_tweets, likes_limit)
+        for i_tweet_details in tweet_feed:
+            yield separator + dump_json(i_tweet_details)
+            separator = ","
+    yield "]}"
+
+
+async def get_tweet_feed_page(
+    limit: int,
+    cursor: Optional[str] = None,
+    likes_limit: Optional[int] = None,
+) -> tuple[dict, int]:
+    """Handle logic of get tweet feed endpoint with pagination.
+
+    Create page of tweets with details sorted descending by likes which
+    starts after tweet encoded in 'cursor' or take it from cache. Then
+    return success response details with cursor for the next page if there
+    could be more tweets. Else return response with error if cursor is
+    invalid.
+
+    Args:
+        limit (int): max number of tweets in page
+        cursor (Optional[str]=None): cursor from previous page
+        likes_limit (Optional[int]=None): max number of likers of tweet
+
+    Returns:
+        tuple[dict, int]: response message and status code
+
+    """
+    after = None
+    if cursor:
+        after = decode_feed_cursor(cursor)
+        if not after:
+            return create_bad_request_response("Invalid tweet feed cursor!")
+    cache_key = ("page", limit, after, likes_limit)
+    response_message = get_cached_tweet_feed(cache_key)
+    if response_message is not None:
+        return response_message, 200
+    feed_version = tweet_feed_version.current
+    tweets = await Tweet.get_tweets_page_sorted_by_likes(limit, after)
+    tweet_feed = []
+    next_cursor = None
+    if tweets:
+        tweet_feed = await create_tweet_feed_from_rows(tweets, likes_limit)
+    if len(tweets) == limit:
+        last_tweet = tweets[-1]
+        next_cursor = encode_feed_cursor(last_tweet.like_count, last_tweet.id)
+    response_message = {
+        "result": True, "tweets": tweet_feed, "next_cursor": next_cursor,
+    }
+    cache_tweet_feed(cache_key, response_message, feed_version)
     return response_message, 200
 
 
-# async def get_user_tweet_feed(api_key: str) -> tuple[dict, int]:
-#     """Handle logic of get tweet feed endpoint.
-#
-#     If user 'api_key' is existed then create for user list of tweets details
-#     of followed users and sort them descending by likes. Then return success
-#     response details. Else return response with error.
-#
-#     Args:
-#       api_key (str): username
-#
-#     Returns:
-#       tuple[dict, int]: response message and status code
-#
-#     """
-#     user = await User.get_user_by_name(api_key)
-#     if not user:
-#         return create_unregister_response()
-#     followed_users_name = []
-#     tweet_feed = []
-#     for i_followed in user.followed:
-#         followed_users_name.append(i_followed.name)
-#     if followed_users_name:
-#         tweets = await Tweet.get_tweets_by_author_sorted_by_likes(
-#             followed_users_name,
-#         )
-#         if tweets:
-#             tweet_feed = await create_tweet_feed(
-#                 tweets,
-#             )
-#     response_message = {"result": True, "tweets": tweet_feed}
-#     return response_message, 200
+async def get_user_tweet_feed(
+    user_id: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    likes_limit: Optional[int] = None,
+) -> tuple[dict, int]:
+    """Handle logic of get user timeline endpoint.
+
+    Create page of tweets with details of users followed by user 'user_id'
+    sorted descending by tweet id (newest first) which starts after tweet
+    encoded in 'cursor'. Tweets ids are read with timeline engine
+    'TIMELINE_ENGINE': pushed on write to table 'timelines' or merged on
+    read from recent tweets of followed users. Then return success response
+    details with cursor for the next page if there could be more tweets.
+    Else return response with error.
+
+    Args:
+        user_id (int): user id
+        limit (int): max number of tweets in page
+        cursor (Optional[str]=None): cursor from previous page
+        likes_limit (Optional[int]=None): max number of likers of tweet
+
+    Returns:
+        tuple[dict, int]: response message and status code
+
+    """
+    before_id = None
+    if cursor:
+        before = decode_feed_cursor(cursor, position_size=1)
+        if not before:
+            return create_bad_request_response("Invalid tweet feed cursor!")
+        before_id = before[0]
+    if TIMELINE_ENGINE == FANOUT_READ_ENGINE:
+        tweet_ids = await Timeline.get_followed_tweet_ids(
+            user_id, limit, before_id,
+        )
+    else:
+        tweet_ids = await Timeline.get_tweet_ids(user_id, limit, before_id)
+    tweets = await Tweet.get_tweet_feed_rows_by_ids(tweet_ids)
+    tweet_feed = []
+    next_cursor = None
+    if tweets:
+        tweet_feed = await create_tweet_feed_from_rows(tweets, likes_limit)
+    if len(tweet_ids) == limit:
+        next_cursor = encode_feed_cursor(tweet_ids[-1])
+    response_message = {
+        "result": True, "tweets": tweet_feed, "next_cursor": next_cursor,
+    }
+    return response_message, 200
@@ -2,63 +2,78 @@
 
 from typing import Optional
 
-from common import create_unregister_response, create_bad_request_response
+from common import create_bad_request_response
+from app.models.timelines import (
+    FAN_OUT_MAX_FOLLOWERS,
+    FANOUT_WRITE_ENGINE,
+    TIMELINE_ENGINE,
+    Timeline,
+)
 from app.models.users import User
 
 
 async def follow_other_user(
-    api_key: str, followed_id: int,
+    own_id: int, followed_id: int,
 ) -> tuple[Optional[dict], int]:
     """Handle logic of follow other user endpoint.
 
-    Check if users 'api_key' and 'followed_id' is existed and user has not
-    already followed him. If so, make entry in db and return success
-    response details. Else return corresponding response with error.
+    Check if user 'followed_id' is existed and user 'own_id' has not
+    already followed him. If so, make entry in db, push tweets of followed
+    user to user timeline if timelines are built on write and return
+    success response details. Else return corresponding response with
+    error.
 
     Args:
-        api_key (str): username
+        own_id (int): user id
         followed_id (int): followed user id
 
     Returns:
         tuple[dict, int]: response message and status code
 
     """
-    own_id = await User.get_user_id_by_name(api_key)
-    if not own_id:
-        return create_unregister_response()
-    elif not await User.get_user_by_id(followed_id):
+    if not await User.get_user_by_id(followed_id):
         return create_bad_request_response("Followed user is not exist!")
-    elif not await User.follow_other_user(own_id, followed_id):
+    elif await User.follow_other_user(own_id, followed_id) is None:
         return create_bad_request_response(
             "You have already followed this user!",
         )
+    if TIMELINE_ENGINE == FANOUT_WRITE_ENGINE:
+        await Timeline.add_followed_tweets(own_id, followed_id)
 
     return None, 201
 
 
 async def unfollow_user(
-    api_key: str, followed_id: int,
+    own_id: int,
+    followed_id: int,
+    max_followers: int = FAN_OUT_MAX_FOLLOWERS,
 ) -> tuple[Optional[dict], int]:
     """Handle logic of unfollow user endpoint.
 
-    Check if users 'api_key' and 'followed_id' is existed and user has
-    already followed him. If so, make entry in db and return success
-    response details. Else return corresponding response with error.
+    Check if user 'followed_id' is existed and user 'own_id' has
+    already followed him. If so, remove entry from db, remove tweets of
+    followed user from user timeline if timelines are built on write and
+    return success response details. Else return corresponding response
+    with error. If followed user is not a celebrity anymore, his tweets are
+    pushed to timelines of his followers as they are not merged on read.
 
     Args:
-        api_key (str): username
+        own_id (int): user id
         followed_id (int): followed user id
+        max_followers (int): max number of followers for fan-out on write
 
     Returns:
         tuple[dict, int]: response message and status code
 
     """
-    own_id = await User.get_user_id_by_name(api_key)
-    if not own_id:
-        return create_unregister_response()
-    elif not await User.get_user_by_id(followed_id):
+    if not await User.get_user_by_id(followed_id):
         return create_bad_request_response("Followed user is not exist!")
-    elif not await User.unfollow_user(own_id, followed_id):
+    follower_count = await User.unfollow_user(own_id, followed_id)
+    if follower_count is None:
         return create_bad_request_response("You are not following this user!")
+    if TIMELINE_ENGINE == FANOUT_WRITE_ENGINE:
+        await Timeline.remove_followed_tweets(own_id, followed_id)
+        if follower_count == max_followers:
+            await Timeline.fan_out_author_tweets(followed_id)
 
     return None, 201
@@ -0,0 +1,172 @@
+"""Benchmark of per-request overhead of auth middlewares.
+
+Compares the former BaseHTTPMiddleware auth hook with pure ASGI
+'AuthMiddleware' on a trivial route with disabled logging. Api key is taken
+from cache, so db from 'DATABASE_URL' is not queried, but the variable
+should be set.
+Run from directory 'server', e.g.:
+python -m benchmarks.auth_middleware --requests 20000
+"""
+
+from argparse import ArgumentParser, Namespace
+from asyncio import Event, run as async_run
+from time import perf_counter
+from typing import Awaitable, Callable, Optional
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from starlette.types import Message
+
+from app.auth import (
+    AuthMiddleware,
+    get_principal_by_api_key,
+    unauthorized_message,
+)
+from app.cache import api_key_cache
+from app.project_logger import project_logger
+from app.schemas import Principal
+
+bench_principal = Principal(id=1, name="bench_user")
+request_scope = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/ping",
+    "raw_path": b"/ping",
+    "query_string": b"",
+    "root_path": "",
+    "headers": [
+        (b"host", b"localhost"),
+        (b"api-key", bench_principal.name.encode()),
+    ],
+    "client": ("127.0.0.1", 50000),
+    "server": ("localhost", 80),
+}
+
+
+def create_app(middleware: Optional[str]) -> FastAPI:
+    """Create application with one route and chosen auth middleware.
+
+    Args:
+        middleware (Optional[str]): 'http' for BaseHTTPMiddleware hook,
+            'asgi' for 'AuthMiddleware' or None for no middleware
+
+    Returns:
+        FastAPI : application
+
+    """
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> dict:
+        return {"result": True}
+
+    if middleware == "asgi":
+        app.add_middleware(AuthMiddleware, open_urls=())
+    elif middleware == "http":
+
+        @app.middleware("http")
+        async def intercept_request(
+            request: Request, call_next: Callable,
+        ) -> Response:
+            api_key = request.headers.get("api-key")
+            principal = None
+            if api_key:
+                principal = await get_principal_by_api_key(api_key)
+            if principal is not None:
+                request.state.principal = principal
+                return await call_next(request)
+            return JSONResponse(content=unauthorized_message, status_code=401)
+
+    return app
+
+
+def create_receive() -> Callable[[], Awaitable[Message]]:
+    """Create ASGI receive channel of one request.
+
+    Returns:
+        Callable[[], Awaitable[Message]] : receive channel which gives empty
+            request body and then waits for disconnect like server does
+
+    """
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive() -> Message:
+        if messages:
+            return messages.pop()
+        await Event().wait()
+        return {"type": "http.disconnect"}
+
+    return receive
+
+
+async def send(message: Message) -> None:
+    """Drop response message.
+
+    Args:
+        message (Message): ASGI message
+
+    """
+
+
+async def measure(app: FastAPI, total_requests: int, repeat: int) -> float:
+    """Measure the best time of one request to application.
+
+    Args:
+        app (FastAPI): application
+        total_requests (int): number of requests in one run
+        repeat (int): number of runs
+
+    Returns:
+        float : the best time of one request in microseconds
+
+    """
+    timings = []
+    for _ in range(repeat):
+        start_time = perf_counter()
+        for _ in range(total_requests):
+            await app(dict(request_scope), create_receive(), send)
+        timings.append(perf_counter() - start_time)
+    return min(timings) / total_requests * 1e6
+
+
+async def run_benchmark(arguments: Namespace) -> None:
+    """Compare per-request overhead of auth middlewares.
+
+    Args:
+        arguments (Namespace): command line arguments
+
+    """
+    project_logger.disabled = True  # measure middlewares, not logging
+    api_key_cache.set(bench_principal.name, bench_principal)
+    no_auth_time = await measure(
+        create_app(None), arguments.requests, arguments.repeat,
+    )
+    print("middleware | request, us | overhead, us")  # noqa: WPS421
+    for i_middleware in ("http", "asgi"):
+        request_time = await measure(
+            create_app(i_middleware), arguments.requests, arguments.repeat,
+        )
+        print(  # noqa: WPS421
+            f"{i_middleware} | {request_time:.1f} | "
+            f"{request_time - no_auth_time:.1f}",
+        )
+
+
+def get_argument_parser() -> ArgumentParser:
+    """Create parser of command line arguments.
+
+    Returns:
+        ArgumentParser : parser of command line arguments
+
+    """
+    parser = ArgumentParser(description="Benchmark auth middlewares")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser
+
+
+if __name__ == "__main__":
+    async_run(run_benchmark(get_argument_parser().parse_args()))
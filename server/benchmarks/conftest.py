@@ -0,0 +1,109 @@
+"""Fixtures with synthetic inputs of service layer micro benchmarks."""
+
+from typing import NamedTuple, Optional
+
+from pytest import fixture as sync_fixture, FixtureRequest
+
+from app.models.users import User
+from app.project_logger import project_logger
+from app.services.tweet_feed import assemble_tweet_feed
+
+INPUT_SIZES = (100, 10000, 100000)
+TOTAL_USERS = 100
+LIKES_PER_TWEET = 3
+
+
+class TweetRow(NamedTuple):
+    """Row of tweet details as selected by get_tweet_feed_query."""
+
+    id: int
+    tweet_data: str
+    tweet_media_ids: Optional[list[int]]
+    author_id: int
+    author_name: str
+    like_count: int
+
+
+class LikerRow(NamedTuple):
+    """Row of liker of tweet as selected by get_likers_query."""
+
+    tweet_id: int
+    user_id: int
+    name: str
+
+
+@sync_fixture(scope="session", autouse=True)
+def disable_logging() -> None:
+    """Disable project logger to measure services, not logging."""
+    project_logger.disabled = True
+
+
+@sync_fixture(scope="module", params=INPUT_SIZES)
+def tweet_rows(request: FixtureRequest) -> list[TweetRow]:
+    """Create rows of tweets with one media file each."""
+    return [
+        TweetRow(
+            id=i_tweet_id,
+            tweet_data=f"benchmark tweet {i_tweet_id}",
+            tweet_media_ids=[i_tweet_id],
+            author_id=i_tweet_id % TOTAL_USERS,
+            author_name=f"bench_user_{i_tweet_id % TOTAL_USERS}",
+            like_count=LIKES_PER_TWEET,
+        )
+        for i_tweet_id in range(1, request.param + 1)
+    ]
+
+
+@sync_fixture(scope="module")
+def media_files_names(tweet_rows: list[TweetRow]) -> dict[int, str]:
+    """Create media files names by media file ids of tweets."""
+    return {
+        i_tweet.id: f"{i_tweet.id}_image.jpg" for i_tweet in tweet_rows
+    }
+
+
+@sync_fixture(scope="module")
+def likers(tweet_rows: list[TweetRow]) -> dict[int, list[LikerRow]]:
+    """Create rows of likers by tweet ids."""
+    return {
+        i_tweet.id: [
+            LikerRow(
+                tweet_id=i_tweet.id,
+                user_id=(i_tweet.id + i_like) % TOTAL_USERS,
+                name=f"bench_user_{(i_tweet.id + i_like) % TOTAL_USERS}",
+            )
+            for i_like in range(LIKES_PER_TWEET)
+        ]
+        for i_tweet in tweet_rows
+    }
+
+
+@sync_fixture(scope="module")
+def tweet_feed(
+    tweet_rows: list[TweetRow],
+    media_files_names: dict[int, str],
+    likers: dict[int, list[LikerRow]],
+) -> list:
+    """Assemble tweet feed from rows."""
+    return assemble_tweet_feed(tweet_rows, media_files_names, likers)
+
+
+@sync_fixture(scope="module", params=INPUT_SIZES)
+def user_with_followers(request: FixtureRequest) -> User:
+    """Create transient user with followers and followed users."""
+    user = User(id=0, name="bench_user")
+    user.followers = [
+        User(id=i_user_id, name=f"follower_{i_user_id}")
+        for i_user_id in range(1, request.param + 1)
+    ]
+    user.followed = user.followers[:request.param // 10]
+    return user
+
+
+@sync_fixture(scope="module", params=INPUT_SIZES)
+def file_names(request: FixtureRequest) -> list[str]:
+    """Create safe and unsafe names of media files."""
+    names = ("image.jpg", "holiday_2024.png", "image!@#.jpg", "a.b.jpeg")
+    return [
+        names[i_file % len(names)] for i_file in range(request.param)
+    ]
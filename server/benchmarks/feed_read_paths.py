@@ -0,0 +1,228 @@
+"""Benchmark of ORM and lean read paths of full tweet feed.
+
+Tables of db from 'DATABASE_URL' are truncated and filled with synthetic
+users, followers, tweets and likes, so run it against a throwaway db only.
+Run from directory 'server', e.g.:
+python -m benchmarks.feed_read_paths --truncate-tables --tweets 10000 100000
+"""
+
+from argparse import ArgumentParser, Namespace
+from asyncio import run as async_run
+from time import perf_counter
+from typing import Awaitable, Callable
+
+from sqlalchemy import desc, select, text
+from sqlalchemy.orm import joinedload
+
+from app.models.media_files import MediaFile
+from app.models.tweet_likes import TweetLike
+from app.models.tweets import Tweet
+from app.models.users import User
+from app.services import tweet_feed
+from connection import async_engine, close_db_connection, read_session
+
+clear_tables_query = """
+TRUNCATE TABLE followers, media_files, timelines, tweets, tweets_likes, users
+RESTART IDENTITY;
+"""
+fill_tables_queries = (
+    "INSERT INTO users (name) "
+    "SELECT 'bench_user_' || i FROM generate_series(1, :users) AS i;",
+    "INSERT INTO followers (follower_id, followed_id) "
+    "SELECT users.id, (users.id + k) % :users + 1 "
+    "FROM users, generate_series(1, :follows) AS k;",
+    "INSERT INTO tweets (author_name, tweet_data) "
+    "SELECT 'bench_user_' || (i % :users + 1), 'benchmark tweet ' || i "
+    "FROM generate_series(1, :tweets) AS i;",
+    "INSERT INTO tweets_likes (tweet_id, user_name) "
+    "SELECT tweets.id, 'bench_user_' || ((tweets.id + k) % :users + 1) "
+    "FROM tweets, generate_series(1, :likes) AS k;",
+    "ANALYZE;",
+)
+
+
+async def fill_tables(arguments: Namespace, total_tweets: int) -> None:
+    """Replace data of tables by synthetic data.
+
+    Args:
+        arguments (Namespace): command line arguments
+        total_tweets (int): number of tweets
+
+    """
+    parameters = {
+        "users": arguments.users,
+        "follows": arguments.follows,
+        "tweets": total_tweets,
+        "likes": arguments.likes,
+    }
+    async with async_engine.begin() as conn:
+        await conn.execute(text(clear_tables_query))
+        for i_query in fill_tables_queries:
+            await conn.execute(text(i_query), parameters)
+    await Tweet.recalculate_like_counts()
+    await User.recalculate_follower_counts()
+
+
+async def get_all_orm_tweets_sorted_by_likes() -> list[Tweet]:
+    """Get all tweets sorted descending by likes as ORM objects.
+
+    Authors and likes with users who liked tweets are eager loaded.
+
+    Returns:
+        list[Tweet] : all tweets
+
+    """
+    async with read_session() as session:
+        select_query = await session.execute(
+            select(Tweet).
+            order_by(desc(Tweet.like_count), desc(Tweet.id)).
+            options(
+                joinedload(Tweet.author),
+                joinedload(Tweet.likes).options(
+                    joinedload(TweetLike.user_details),
+                ),
+            ),
+        )
+        return list(select_query.unique().scalars().all())
+
+
+def create_orm_tweet_details(tweet: Tweet, media_files_names: dict) -> dict:
+    """Create details of tweet for tweet feed from ORM object.
+
+    Args:
+        tweet (Tweet): tweet
+        media_files_names (dict): media files names by media file ids
+
+    Returns:
+        dict : tweet details
+
+    """
+    return {
+        "id": tweet.id,
+        "content": tweet.tweet_data,
+        "attachments": tweet_feed.create_attachments(
+            tweet.tweet_media_ids, media_files_names,
+        ),
+        "author": {
+            "id": tweet.author.id,
+            "name": tweet.author.name,
+        },
+        "likes": [
+            {
+                "user_id": i_like.user_details.id,
+                "name": i_like.user_details.name,
+            }
+            for i_like in tweet.likes
+        ],
+    }
+
+
+async def create_orm_tweet_feed(tweets: list[Tweet]) -> list:
+    """Create tweet feed from ORM objects.
+
+    Args:
+        tweets (list[Tweet]): list of tweets
+
+    Returns:
+        list : tweet feed
+
+    """
+    media_files_names = await MediaFile.get_media_files_names_by_ids(
+        i_media_id
+        for i_tweet in tweets
+        for i_media_id in i_tweet.tweet_media_ids or ()
+    )
+    return [
+        create_orm_tweet_details(i_tweet, media_files_names)
+        for i_tweet in tweets
+    ]
+
+
+async def read_orm_tweet_feed() -> list:
+    """Build full tweet feed from ORM objects.
+
+    Returns:
+        list : tweet feed
+
+    """
+    tweets = await get_all_orm_tweets_sorted_by_likes()
+    return await create_orm_tweet_feed(tweets)
+
+
+async def read_lean_tweet_feed() -> list:
+    """Build full tweet feed from rows of columns.
+
+    Returns:
+        list : tweet feed
+
+    """
+    tweets = await Tweet.get_all_tweet_feed_rows_sorted_by_likes()
+    return await tweet_feed.create_tweet_feed_from_rows(tweets)
+
+
+async def measure(
+    read_tweet_feed: Callable[[], Awaitable[list]], repeat: int,
+) -> float:
+    """Measure the best time of building tweet feed.
+
+    Args:
+        read_tweet_feed (Callable[[], Awaitable[list]]): read path
+        repeat (int): number of runs
+
+    Returns:
+        float : the best time in seconds
+
+    """
+    timings = []
+    for _ in range(repeat):
+        start_time = perf_counter()
+        await read_tweet_feed()
+        timings.append(perf_counter() - start_time)
+    return min(timings)
+
+
+async def run_benchmark(arguments: Namespace) -> None:
+    """Fill tables for every number of tweets and compare read paths.
+
+    Args:
+        arguments (Namespace): command line arguments
+
+    """
+    print("tweets | orm, s | lean, s | speedup")  # noqa: WPS421
+    for i_total_tweets in arguments.tweets:
+        await fill_tables(arguments, i_total_tweets)
+        orm_time = await measure(read_orm_tweet_feed, arguments.repeat)
+        lean_time = await measure(read_lean_tweet_feed, arguments.repeat)
+        print(  # noqa: WPS421
+            f"{i_total_tweets} | {orm_time:.3f} | {lean_time:.3f} | "
+            f"{orm_time / lean_time:.1f}x",
+        )
+    await close_db_connection()
+
+
+def get_argument_parser() -> ArgumentParser:
+    """Create parser of command line arguments.
+
+    Returns:
+        ArgumentParser : parser of command line arguments
+
+    """
+    parser = ArgumentParser(description="Benchmark tweet feed read paths")
+    parser.add_argument(
+        "--truncate-tables",
+        action="store_true",
+        required=True,
+        help="confirm that tables of DATABASE_URL db can be truncated",
+    )
+    parser.add_argument(
+        "--tweets", type=int, nargs="+", default=[10000, 100000],
+    )
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--follows", type=int, default=20)
+    parser.add_argument("--likes", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser
+
+
+if __name__ == "__main__":
+    async_run(run_benchmark(get_argument_parser().parse_args()))
@@ -0,0 +1,309 @@
+"""Bulk loader of synthetic dataset for benchmarks at scale.
+
+Tables of db from 'DATABASE_URL' are truncated and filled with synthetic
+users, followers, tweets, likes and media files through Postgres COPY, so
+run it against a throwaway db only. Numbers of followers of users and
+likes of tweets follow power law and the same seed gives the same dataset.
+Run from directory 'server', e.g.:
+python -m benchmarks.load_dataset --truncate-tables --tweets 1000000
+"""
+
+from argparse import ArgumentParser, Namespace
+from asyncio import run as async_run
+from random import Random
+from time import perf_counter
+from typing import Iterable, Iterator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.models.timelines import Timeline
+from app.models.users import User
+from benchmarks.feed_read_paths import clear_tables_query
+from connection import async_engine, close_db_connection
+
+reset_sequences_queries = tuple(
+    f"SELECT setval(pg_get_serial_sequence('{table_name}', 'id'), "
+    f"coalesce(max(id), 0) + 1, false) FROM {table_name};"
+    for table_name in ("users", "tweets", "tweets_likes", "media_files")
+)
+
+
+def get_user_name(user_id: int) -> str:
+    """Get name of synthetic user.
+
+    Args:
+        user_id (int): user id
+
+    Returns:
+        str : user name
+
+    """
+    return f"bench_user_{user_id}"
+
+
+def get_power_law_count(
+    rng: Random, mean: float, alpha: float, max_count: int,
+) -> int:
+    """Draw count from Pareto distribution with given mean.
+
+    Args:
+        rng (Random): random generator
+        mean (float): mean of count before capping by 'max_count'
+        alpha (float): shape of distribution, the lower the heavier tail,
+            should be greater than 1
+        max_count (int): max count
+
+    Returns:
+        int : count
+
+    """
+    count = round((rng.paretovariate(alpha) - 1) * mean * (alpha - 1))
+    return min(count, max_count)
+
+
+def generate_users(arguments: Namespace) -> Iterator[tuple]:
+    """Generate rows of table 'users'.
+
+    Args:
+        arguments (Namespace): command line arguments
+
+    Yields:
+        tuple : id and name of user
+
+    """
+    for user_id in range(1, arguments.users + 1):
+        yield user_id, get_user_name(user_id)
+
+
+def generate_followers(arguments: Namespace) -> Iterator[tuple]:
+    """Generate rows of table 'followers' with power law of followers.
+
+    Args:
+        arguments (Namespace): command line arguments
+
+    Yields:
+        tuple : follower id and followed id
+
+    """
+    rng = Random(f"{arguments.seed}-followers")
+    user_ids = range(1, arguments.users + 1)
+    for followed_id in user_ids:
+        total_followers = get_power_law_count(
+            rng,
+            arguments.followers,
+            arguments.followers_alpha,
+            arguments.users - 1,
+        )
+        follower_ids = rng.sample(user_ids, total_followers + 1)
+        if followed_id in follower_ids:
+            follower_ids.remove(followed_id)
+        else:
+            follower_ids.pop()
+        for follower_id in follower_ids:
+            yield follower_id, followed_id
+
+
+def generate_like_counts(arguments: Namespace) -> list[int]:
+    """Generate total likes of tweets with power law.
+
+    Args:
+        arguments (Namespace): command line arguments
+
+    Returns:
+        list[int] : total likes of tweets in order of their ids
+
+    """
+    rng = Random(f"{arguments.seed}-likes")
+    return [
+        get_power_law_count(
+            rng, arguments.likes, arguments.likes_alpha, arguments.users,
+        )
+        for _ in range(arguments.tweets)
+    ]
+
+
+def generate_tweets(
+    arguments: Namespace, like_counts: list[int], media_files: list[tuple],
+) -> Iterator[tuple]:
+    """Generate rows of table 'tweets' and collect their media files.
+
+    Args:
+        arguments (Namespace): command line arguments
+        like_counts (list[int]): total likes of tweets
+        media_files (list[tuple]): list to collect rows of table
+            'media_files'
+
+    Yields:
+        tuple : id, author name, data, media ids and total likes of tweet
+
+    """
+    rng = Random(f"{arguments.seed}-tweets")
+    for tweet_id, like_count in enumerate(like_counts, start=1):
+        author_name = get_user_name(rng.randint(1, arguments.users))
+        tweet_media_ids = None
+        if rng.random() < arguments.media_ratio:
+            media_id = len(media_files) + 1
+            media_files.append(
+                (media_id, f"bench_{media_id}.jpg", author_name),
+            )
+            tweet_media_ids = [media_id]
+        yield (
+            tweet_id,
+            author_name,
+            f"synthetic tweet {tweet_id}",
+            tweet_media_ids,
+            like_count,
+        )
+
+
+def generate_likes(
+    arguments: Namespace, like_counts: list[int],
+) -> Iterator[tuple]:
+    """Generate rows of table 'tweets_likes' from total likes of tweets.
+
+    Args:
+        arguments (Namespace): command line arguments
+        like_counts (list[int]): total likes of tweets
+
+    Yields:
+        tuple : id, tweet id and user name of like
+
+    """
+    rng = Random(f"{arguments.seed}-likers")
+    user_ids = range(1, arguments.users + 1)
+    like_id = 0
+    for tweet_id, like_count in enumerate(like_counts, start=1):
+        for user_id in rng.sample(user_ids, like_count):
+            like_id += 1
+            yield like_id, tweet_id, get_user_name(user_id)
+
+
+async def copy_records(
+    conn: AsyncConnection,
+    table_name: str,
+    columns: tuple[str, ...],
+    records: Iterable[tuple],
+) -> None:
+    """Load rows to table by COPY of asyncpg connection and print timing.
+
+    Args:
+        conn (AsyncConnection): connection with db
+        table_name (str): name of table
+        columns (tuple[str, ...]): columns of rows
+        records (Iterable[tuple]): rows
+
+    """
+    start_time = perf_counter()
+    raw_connection = await conn.get_raw_connection()
+    asyncpg_connection = raw_connection.driver_connection
+    copy_status = await asyncpg_connection.copy_records_to_table(
+        table_name, records=records, columns=columns,
+    )
+    print(  # noqa: WPS421
+        f"{table_name} | {copy_status.split()[-1]} | "
+        f"{perf_counter() - start_time:.1f}",
+    )
+
+
+async def load_dataset(arguments: Namespace) -> None:
+    """Replace data of tables by synthetic dataset.
+
+    Args:
+        arguments (Namespace): command line arguments
+
+    """
+    like_counts = generate_like_counts(arguments)
+    media_files: list[tuple] = []
+    print("table | rows | time, s")  # noqa: WPS421
+    async with async_engine.begin() as conn:
+        await conn.execute(text(clear_tables_query))
+        await copy_records(
+            conn, "users", ("id", "name"), generate_users(arguments),
+        )
+        await copy_records(
+            conn,
+            "followers",
+            ("follower_id", "followed_id"),
+            generate_followers(arguments),
+        )
+        await copy_records(
+            conn,
+            "tweets",
+            (
+                "id",
+                "author_name",
+                "tweet_data",
+                "tweet_media_ids",
+                "like_count",
+            ),
+            generate_tweets(arguments, like_counts, media_files),
+        )
+        await copy_records(
+            conn,
+            "tweets_likes",
+            ("id", "tweet_id", "user_name"),
+            generate_likes(arguments, like_counts),
+        )
+        await copy_records(
+            conn, "media_files", ("id", "file_name", "user_name"), media_files,
+        )
+        for i_query in reset_sequences_queries:
+            await conn.execute(text(i_query))
+    await User.recalculate_follower_counts()
+    if not arguments.skip_timelines:
+        start_time = perf_counter()
+        timelines_tweets = await Timeline.rebuild()
+        print(  # noqa: WPS421
+            f"timelines | {timelines_tweets} | "
+            f"{perf_counter() - start_time:.1f}",
+        )
+    async with async_engine.connect() as conn:
+        autocommit_conn = await conn.execution_options(
+            isolation_level="AUTOCOMMIT",
+        )
+        await autocommit_conn.execute(text("ANALYZE;"))
+    await close_db_connection()
+
+
+def get_argument_parser() -> ArgumentParser:
+    """Create parser of command line arguments.
+
+    Returns:
+        ArgumentParser : parser of command line arguments
+
+    """
+    parser = ArgumentParser(description="Load synthetic benchmark dataset")
+    parser.add_argument(
+        "--truncate-tables",
+        action="store_true",
+        required=True,
+        help="confirm that tables of DATABASE_URL db can be truncated",
+    )
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--tweets", type=int, default=1000000)
+    parser.add_argument(
+        "--followers", type=float, default=20, help="mean followers of user",
+    )
+    parser.add_argument("--followers-alpha", type=float, default=2.0)
+    parser.add_argument(
+        "--likes", type=float, default=5, help="mean likes of tweet",
+    )
+    parser.add_argument("--likes-alpha", type=float, default=2.0)
+    parser.add_argument(
+        "--media-ratio",
+        type=float,
+        default=0.1,
+        help="share of tweets with media file",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--skip-timelines",
+        action="store_true",
+        help="do not rebuild table 'timelines' from loaded data",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    async_run(load_dataset(get_argument_parser().parse_args()))
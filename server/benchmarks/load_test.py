@@ -0,0 +1,459 @@
+"""End-to-end HTTP load test of running application.
+
+Virtual users with their own api keys send a weighted mix of feed reads,
+timeline reads, likes, follows, tweet posts and media uploads to a local
+application instance. Throughput and p50/p95/p99 latency per endpoint are
+printed as JSON and compared with a stored baseline report.
+Users 'bench_user_<n>' and tweets are expected in db, e.g. loaded by
+'benchmarks.load_dataset'. Run from directory 'server', e.g.:
+python -m benchmarks.load_test --base-url http://localhost --duration 60
+"""
+
+from argparse import ArgumentParser, Namespace
+from asyncio import gather, run as async_run
+from collections import Counter, defaultdict
+from json import dumps as json_dumps, load as json_load
+from math import ceil
+from os import path as os_path
+from random import Random
+from sys import exit as sys_exit
+from time import perf_counter
+from typing import Awaitable, Callable, Optional
+
+from httpx import AsyncClient, HTTPError, Limits, Response
+
+DEFAULT_BASELINE_PATH = os_path.join(
+    os_path.dirname(os_path.realpath(__file__)), "load_test_baseline.json",
+)
+COMPARED_METRICS = ("throughput", "p50_ms", "p95_ms", "p99_ms")
+MEDIA_FILE = ("load_test.jpg", b"\xff\xd8\xff" + bytes(1024), "image/jpeg")
+Operation = Callable[[AsyncClient, Random, Namespace], Awaitable[Response]]
+
+
+async def read_feed(
+    client: AsyncClient, rng: Random, arguments: Namespace,
+) -> Response:
+    """Get the first page of tweet feed.
+
+    Args:
+        client (AsyncClient): http client with api key of virtual user
+        rng (Random): random generator of virtual user
+        arguments (Namespace): command line arguments
+
+    Returns:
+        Response : response
+
+    """
+    return await client.get("/api/tweets", params={"limit": 20})
+
+
+async def read_timeline(
+    client: AsyncClient, rng: Random, arguments: Namespace,
+) -> Response:
+    """Get the first page of timeline of followed users.
+
+    Args:
+        client (AsyncClient): http client with api key of virtual user
+        rng (Random): random generator of virtual user
+        arguments (Namespace): command line arguments
+
+    Returns:
+        Response : response
+
+    """
+    return await client.get("/api/tweets/timeline", params={"limit": 20})
+
+
+async def like_tweet(
+    client: AsyncClient, rng: Random, arguments: Namespace,
+) -> Response:
+    """Like random tweet.
+
+    Args:
+        client (AsyncClient): http client with api key of virtual user
+        rng (Random): random generator of virtual user
+        arguments (Namespace): command line arguments
+
+    Returns:
+        Response : response
+
+    """
+    tweet_id = rng.randint(1, arguments.tweets)
+    return await client.post(f"/api/tweets/{tweet_id}/likes")
+
+
+async def follow_user(
+    client: AsyncClient, rng: Random, arguments: Namespace,
+) -> Response:
+    """Follow random user.
+
+    Args:
+        client (AsyncClient): http client with api key of virtual user
+        rng (Random): random generator of virtual user
+        arguments (Namespace): command line arguments
+
+    Returns:
+        Response : response
+
+    """
+    user_id = rng.randint(1, arguments.users)
+    return await client.post(f"/api/users/{user_id}/follow")
+
+
+async def post_tweet(
+    client: AsyncClient, rng: Random, arguments: Namespace,
+) -> Response:
+    """Post tweet without media files.
+
+    Args:
+        client (AsyncClient): http client with api key of virtual user
+        rng (Random): random generator of virtual user
+        arguments (Namespace): command line arguments
+
+    Returns:
+        Response : response
+
+    """
+    return await client.post(
+        "/api/tweets",
+        json={"tweet_data": f"load test tweet {rng.random()}"},
+    )
+
+
+async def upload_media(
+    client: AsyncClient, rng: Random, arguments: Namespace,
+) -> Response:
+    """Upload small jpg file.
+
+    Args:
+        client (AsyncClient): http client with api key of virtual user
+        rng (Random): random generator of virtual user
+        arguments (Namespace): command line arguments
+
+    Returns:
+        Response : response
+
+    """
+    return await client.post("/api/medias", files={"file": MEDIA_FILE})
+
+
+operations: dict[str, Operation] = {
+    "feed_read": read_feed,
+    "timeline_read": read_timeline,
+    "like": like_tweet,
+    "follow": follow_user,
+    "tweet_post": post_tweet,
+    "media_upload": upload_media,
+}
+
+
+class LoadTestResults:
+    """Class LoadTestResults.
+
+    Latencies and statuses of requests measured after warmup.
+
+    Attributes:
+        latencies (defaultdict[str, list[float]]): latencies of requests
+            in seconds by operation
+        statuses (defaultdict[str, Counter]): http status codes or 'error'
+            of requests by operation
+
+    """
+
+    def __init__(self) -> None:
+        """Init empty results."""
+        self.latencies: defaultdict[str, list[float]] = defaultdict(list)
+        self.statuses: defaultdict[str, Counter] = defaultdict(Counter)
+
+    def observe(self, name: str, seconds: float, status: str) -> None:
+        """Record request.
+
+        Args:
+            name (str): name of operation
+            seconds (float): latency of request
+            status (str): http status code or 'error'
+
+        """
+        self.latencies[name].append(seconds)
+        self.statuses[name][status] += 1
+
+
+def get_percentile(sorted_values: list[float], percent: float) -> float:
+    """Get percentile by nearest rank.
+
+    Args:
+        sorted_values (list[float]): sorted values
+        percent (float): percent of values which are less or equal
+
+    Returns:
+        float : percentile
+
+    """
+    rank = max(ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def get_endpoint_report(
+    latencies: list[float], statuses: Counter, duration: float,
+) -> dict:
+    """Get throughput, latency percentiles and statuses of endpoint.
+
+    Args:
+        latencies (list[float]): latencies of requests in seconds
+        statuses (Counter): http status codes or 'error' of requests
+        duration (float): measured time in seconds
+
+    Returns:
+        dict : report of endpoint
+
+    """
+    sorted_latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": sum(
+            total for status, total in statuses.items()
+            if status == "error" or int(status) >= 400
+        ),
+        "throughput": round(len(latencies) / duration, 2),
+        **{
+            f"p{percent}_ms": round(
+                get_percentile(sorted_latencies, percent) * 1000, 2,
+            )
+            for percent in (50, 95, 99)
+        },
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+def get_report(
+    results: LoadTestResults, arguments: Namespace, duration: float,
+) -> dict:
+    """Get report of load test.
+
+    Args:
+        results (LoadTestResults): measured requests
+        arguments (Namespace): command line arguments
+        duration (float): measured time in seconds
+
+    Returns:
+        dict : report with parameters of run and reports of endpoints
+
+    """
+    endpoints = {
+        name: get_endpoint_report(
+            results.latencies[name], results.statuses[name], duration,
+        )
+        for name in operations
+        if results.latencies[name]
+    }
+    all_statuses: Counter = sum(results.statuses.values(), Counter())
+    endpoints["total"] = get_endpoint_report(
+        [
+            i_latency for i_latencies in results.latencies.values()
+            for i_latency in i_latencies
+        ],
+        all_statuses,
+        duration,
+    )
+    return {
+        "base_url": arguments.base_url,
+        "virtual_users": arguments.virtual_users,
+        "duration": round(duration, 2),
+        "mix": arguments.mix,
+        "endpoints": endpoints,
+    }
+
+
+def compare_with_baseline(
+    report: dict, baseline: dict, max_regression: float,
+) -> tuple[dict, list[str]]:
+    """Compare metrics of endpoints with baseline report.
+
+    Args:
+        report (dict): report of current run
+        baseline (dict): stored baseline report
+        max_regression (float): allowed regression of metric in percent
+
+    Returns:
+        tuple[dict, list[str]] : change of metrics in percent by endpoint
+            and metrics which regressed more than allowed
+
+    """
+    changes = {}
+    regressions = []
+    for name, endpoint_report in report["endpoints"].items():
+        baseline_report = baseline["endpoints"].get(name)
+        if not baseline_report:
+            continue
+        changes[name] = {}
+        for metric in COMPARED_METRICS:
+            if not baseline_report[metric]:
+                continue
+            change = round(
+                (endpoint_report[metric] / baseline_report[metric] - 1) * 100,
+                1,
+            )
+            changes[name][metric] = change
+            regression = -change if metric == "throughput" else change
+            if regression > max_regression:
+                regressions.append(f"{name}.{metric}: {change:+}%")
+    return changes, regressions
+
+
+async def run_virtual_user(
+    user_id: int,
+    arguments: Namespace,
+    results: LoadTestResults,
+    timings: tuple[float, float],
+) -> None:
+    """Send requests of operations mix until the end of test.
+
+    Args:
+        user_id (int): id of user whose name is api key of virtual user
+        arguments (Namespace): command line arguments
+        results (LoadTestResults): measured requests
+        timings (tuple[float, float]): start of measuring and end of test
+
+    """
+    measure_from, stop_at = timings
+    rng = Random(f"{arguments.seed}-{user_id}")
+    names = list(arguments.mix)
+    weights = list(arguments.mix.values())
+    async with AsyncClient(
+        base_url=arguments.base_url,
+        headers={"api-key": f"bench_user_{user_id}"},
+        timeout=arguments.timeout,
+        limits=Limits(max_connections=1),
+    ) as client:
+        while True:
+            name = rng.choices(names, weights)[0]
+            start_time = perf_counter()
+            if start_time >= stop_at:
+                return
+            try:
+                response = await operations[name](client, rng, arguments)
+            except HTTPError:
+                status = "error"
+            else:
+                status = str(response.status_code)
+            if start_time >= measure_from:
+                results.observe(name, perf_counter() - start_time, status)
+
+
+async def run_load_test(arguments: Namespace) -> dict:
+    """Run virtual users and get report of measured requests.
+
+    Args:
+        arguments (Namespace): command line arguments
+
+    Returns:
+        dict : report of load test
+
+    """
+    results = LoadTestResults()
+    measure_from = perf_counter() + arguments.warmup
+    stop_at = measure_from + arguments.duration
+    await gather(
+        *(
+            run_virtual_user(
+                user_id, arguments, results, (measure_from, stop_at),
+            )
+            for user_id in range(1, arguments.virtual_users + 1)
+        ),
+    )
+    return get_report(results, arguments, arguments.duration)
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """Parse weights of operations, e.g. 'feed_read=50,like=10'.
+
+    Args:
+        mix (str): comma separated names of operations with weights
+
+    Returns:
+        dict[str, float] : weights by names of operations
+
+    Raises:
+        ValueError: if operation is unknown
+
+    """
+    weights = {}
+    for i_item in mix.split(","):
+        name, weight = i_item.split("=")
+        if name not in operations:
+            raise ValueError(f"Unknown operation {name}")
+        weights[name] = float(weight)
+    return weights
+
+
+def run_and_compare(arguments: Namespace) -> Optional[list[str]]:
+    """Run load test, print report and compare it with baseline.
+
+    Args:
+        arguments (Namespace): command line arguments
+
+    Returns:
+        Optional[list[str]] : regressions if baseline is existed
+
+    """
+    report = async_run(run_load_test(arguments))
+    regressions = None
+    if arguments.save_baseline:
+        with open(arguments.baseline, "w") as baseline_file:
+            baseline_file.write(json_dumps(report, indent=2))
+    elif os_path.exists(arguments.baseline):
+        with open(arguments.baseline) as baseline_file:
+            baseline = json_load(baseline_file)
+        report["change_from_baseline"], regressions = compare_with_baseline(
+            report, baseline, arguments.max_regression,
+        )
+        report["regressions"] = regressions
+    print(json_dumps(report, indent=2))  # noqa: WPS421
+    return regressions
+
+
+def get_argument_parser() -> ArgumentParser:
+    """Create parser of command line arguments.
+
+    Returns:
+        ArgumentParser : parser of command line arguments
+
+    """
+    parser = ArgumentParser(description="HTTP load test of application")
+    parser.add_argument("--base-url", default="http://localhost")
+    parser.add_argument("--virtual-users", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument("--timeout", type=float, default=10)
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default="feed_read=50,timeline_read=20,like=12,follow=6,"
+                "tweet_post=8,media_upload=4",
+        help="weights of operations",
+    )
+    parser.add_argument(
+        "--users", type=int, default=100000, help="total users in db",
+    )
+    parser.add_argument(
+        "--tweets", type=int, default=1000000, help="total tweets in db",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="store report as baseline instead of comparing with it",
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=10,
+        help="allowed regression of metrics in percent",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    if run_and_compare(get_argument_parser().parse_args()):
+        sys_exit(1)
@@ -0,0 +1,74 @@
+"""Micro benchmarks of pure Python hot paths of service layer.
+
+Tweet feed, user profile, safe file names and pydantic response models
+are measured at 100, 10k and 100k items. Db is not queried, but
+'app.models' create engine, so settings are taken from
+'benchmarks/pytest.ini'. Run from directory 'server', e.g.:
+pytest benchmarks --benchmark-autosave
+pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:10%
+"""
+
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from app.models.users import User
+from app.schemas import TweetFeedOut, UserProfileDetailsOut
+from app.services.media_file import make_safe_file_name
+from app.services.profile import create_user_profile
+from app.services.tweet_feed import assemble_tweet_feed
+from benchmarks.conftest import LIKES_PER_TWEET, LikerRow, TweetRow
+
+
+def test_assemble_tweet_feed(
+    benchmark: BenchmarkFixture,
+    tweet_rows: list[TweetRow],
+    media_files_names: dict[int, str],
+    likers: dict[int, list[LikerRow]],
+) -> None:
+    tweet_feed = benchmark(
+        assemble_tweet_feed, tweet_rows, media_files_names, likers,
+    )
+    assert len(tweet_feed) == len(tweet_rows)
+    assert tweet_feed[0]["attachments"] == [
+        media_files_names[tweet_rows[0].id],
+    ]
+    assert len(tweet_feed[0]["likes"]) == LIKES_PER_TWEET
+
+
+def test_create_user_profile(
+    benchmark: BenchmarkFixture, user_with_followers: User,
+) -> None:
+    user_profile = benchmark(create_user_profile, user_with_followers)
+    assert len(user_profile["followers"]) == len(
+        user_with_followers.followers,
+    )
+
+
+def test_make_safe_file_name(
+    benchmark: BenchmarkFixture, file_names: list[str],
+) -> None:
+    safe_file_names = benchmark(
+        lambda: [make_safe_file_name(i_name) for i_name in file_names],
+    )
+    assert len(safe_file_names) == len(file_names)
+
+
+def test_create_tweet_feed_out(
+    benchmark: BenchmarkFixture, tweet_feed: list,
+) -> None:
+    response = benchmark(TweetFeedOut, tweets=tweet_feed)
+    assert len(response.tweets) == len(tweet_feed)
+
+
+def test_dump_tweet_feed_out(
+    benchmark: BenchmarkFixture, tweet_feed: list,
+) -> None:
+    response = TweetFeedOut(tweets=tweet_feed)
+    assert benchmark(response.model_dump_json)
+
+
+def test_create_user_profile_details_out(
+    benchmark: BenchmarkFixture, user_with_followers: User,
+) -> None:
+    user_profile = create_user_profile(user_with_followers)
+    response = benchmark(UserProfileDetailsOut, user=user_profile)
+    assert response.user.id == user_with_followers.id
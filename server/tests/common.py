@@ -3,43 +3,90 @@
 from os import environ as os_environ, path as os_path
 from typing import BinaryIO
 
+from httpx import Response
+
+from app.query_counter import QUERY_COUNT_HEADER
+
 DEFAULT_TABLE_NAMES = [
     "followers",
     "media_files",
+    "schema_version",
+    "timelines",
     "tweets",
     "tweets_likes",
     "users",
 ]
 OK_STATUS_CODE = 200
 CREATED_STATUS_CODE = 201
+NOT_MODIFIED_STATUS_CODE = 304
 BAD_REQUEST_STATUS_CODE = 400
 UNAUTHORIZED_SATUS_CODE = 401
 FORBIDDEN_STATUS_CODE = 403
 NOT_FOUND_SATUS_CODE = 404
 METHOD_NOT_ALLOWED_SATUS_CODE = 405
+# More than max number of query parameters of asyncpg (32767)
+TOO_MANY_IDS = 40000
 APPLICATION_ENDPOINTS = {
-    "add_tweet": {"endpoint": "/api/tweets", "http_method": "POST"},
-    "add_media": {"endpoint": "/api/medias", "http_method": "POST"},
-    "delete_tweet": {"endpoint": "/api/tweets/{id}", "http_method": "DELETE"},
+    "add_tweet": {
+        "endpoint": "/api/tweets",
+        "http_method": "POST",
+        "max_queries": 4,
+    },
+    "add_media": {
+        "endpoint": "/api/medias",
+        "http_method": "POST",
+        "max_queries": 2,
+    },
+    "delete_tweet": {
+        "endpoint": "/api/tweets/{id}",
+        "http_method": "DELETE",
+        "max_queries": 3,
+    },
     "like_tweet": {
         "endpoint": "/api/tweets/{id}/likes",
         "http_method": "POST",
+        "max_queries": 3,
     },
     "dislike_tweet": {
         "endpoint": "/api/tweets/{id}/likes",
         "http_method": "DELETE",
+        "max_queries": 3,
     },
     "follow_user": {
         "endpoint": "/api/users/{id}/follow",
         "http_method": "POST",
+        "max_queries": 5,
     },
     "unfollow_user": {
         "endpoint": "/api/users/{id}/follow",
         "http_method": "DELETE",
+        "max_queries": 5,
+    },
+    "get_tweet_feed": {
+        "endpoint": "/api/tweets",
+        "http_method": "GET",
+        "max_queries": 4,
+    },
+    "get_user_timeline": {
+        "endpoint": "/api/tweets/timeline",
+        "http_method": "GET",
+        "max_queries": 6,
+    },
+    "get_tweet_likes": {
+        "endpoint": "/api/tweets/{id}/likes",
+        "http_method": "GET",
+        "max_queries": 1,
+    },
+    "get_own_profile": {
+        "endpoint": "/api/users/me",
+        "http_method": "GET",
+        "max_queries": 2,
+    },
+    "get_user_profile": {
+        "endpoint": "/api/users/{id}",
+        "http_method": "GET",
+        "max_queries": 2,
     },
-    "get_tweet_feed": {"endpoint": "/api/tweets", "http_method": "GET"},
-    "get_own_profile": {"endpoint": "/api/users/me", "http_method": "GET"},
-    "get_user_profile": {"endpoint": "/api/users/{id}", "http_method": "GET"},
 }
 ERROR_MESSAGE = {"result": False, "error_type": "", "error_message": ""}
 
@@ -164,6 +211,16 @@ CORRECT_GET_TWEET_FEED_RESPONSE_2 = {
     "tweet_feed": {"result": True, "tweets": []},
     "status_code": OK_STATUS_CODE,
 }
+TIMELINES_TWEET_IDS = {
+    test_user_1["name"]: [TWEET_2["id"]],
+    test_user_2["name"]: [],
+    test_user_3["name"]: [TWEET_1["id"]],
+}
+DEFAULT_TOTAL_TIMELINES_TWEETS = 2
+CORRECT_GET_USER_TIMELINE_RESPONSE = {
+    "tweet_feed": {"result": True, "tweets": [SORTED_TWEET_FEED[1]]},
+    "status_code": OK_STATUS_CODE,
+}
 
 
 def open_test_image(file_name: str) -> BinaryIO:
@@ -179,3 +236,19 @@ def open_test_image(file_name: str) -> BinaryIO:
         os_path.join(DEFAULT_TEST_IMAGES_PATH, file_name),
     )
     return open(abs_image_path, "rb")
+
+
+def assert_max_queries(response: Response, endpoint_name: str) -> None:
+    """Check that request did not exceed pinned number of SQL statements.
+
+    Args:
+        response (Response): response with header 'X-Query-Count'
+        endpoint_name (str): name of endpoint in APPLICATION_ENDPOINTS
+
+    """
+    query_count = int(response.headers[QUERY_COUNT_HEADER])
+    max_queries = APPLICATION_ENDPOINTS[endpoint_name]["max_queries"]
+    assert query_count <= max_queries, (
+        f"{endpoint_name} executed {query_count} SQL statements, "
+        f"pinned max is {max_queries}"
+    )
@@ -16,13 +16,20 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import AsyncGenerator
 
+from app.cache import (
+    api_key_cache,
+    tweet_feed_cache,
+    unknown_api_key_cache,
+)
 from app.models.connection import async_engine, async_session, Base
-from app.models.initialization import create_tables
+from app.models.migrations import migrate
 from app.models.followers import followers
 from app.models.media_files import MediaFile
+from app.models.timelines import Timeline
 from app.models.tweets import Tweet
 from app.models.tweet_likes import TweetLike
 from app.models.users import User
+from app.rate_limit import rate_limited_endpoints
 
 from server.app.fastapi_app import application
 from .common import (
@@ -46,7 +53,7 @@ from .common import (
 )
 
 sql_query_clear_db_tables = """
-TRUNCATE TABLE followers, media_files, tweets, tweets_likes, users 
+TRUNCATE TABLE followers, media_files, timelines, tweets, tweets_likes, users
 RESTART IDENTITY;
 """
 
@@ -94,15 +101,20 @@ async def test_session() -> AsyncSession:
 
 @async_fixture(scope="session", autouse=True)
 async def create_all_tables() -> None:
-    """Remove and then create all tables for db."""
-    await create_tables()
+    """Create all tables for db by applying migrations."""
+    await migrate()
 
 
 @async_fixture(scope="function")
 async def clear_test_db_tables(test_session: AsyncSession,) -> None:
-    """Clear test db tables data"""
+    """Clear test db tables data and caches built from them."""
     async with async_engine.begin() as conn:
         await conn.execute(text(sql_query_clear_db_tables))
+    tweet_feed_cache.clear()
+    api_key_cache.clear()
+    unknown_api_key_cache.clear()
+    for _, _, i_limiter in rate_limited_endpoints:
+        i_limiter.clear()
 
 
 @async_fixture(scope="function")
@@ -173,6 +185,9 @@ async def init_test_data_for_db(
         ],
     )
     await test_session.commit()
+    await Tweet.recalculate_like_counts()
+    await User.recalculate_follower_counts()
+    await Timeline.rebuild()
 
 
 @sync_fixture(scope="function")
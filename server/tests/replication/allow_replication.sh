@@ -0,0 +1,3 @@
+#!/bin/bash
+# Allow streaming replication connections to test db for read replica.
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
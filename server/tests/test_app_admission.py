@@ -0,0 +1,94 @@
+"""Module for testing admission control from app.admission.py ."""
+
+from asyncio import Event, create_task, sleep as async_sleep
+
+from httpx import ASGITransport, AsyncClient
+from pytest import mark as pytest_mark
+from starlette.types import Receive, Scope, Send
+
+from app.admission import (
+    FEED_READS_ROUTE_CLASS,
+    MEDIA_UPLOADS_ROUTE_CLASS,
+    WRITES_ROUTE_CLASS,
+    AdmissionLimiter,
+    AdmissionMiddleware,
+    get_route_class,
+)
+from .common import ERROR_MESSAGE
+
+SERVICE_UNAVAILABLE_STATUS_CODE = 503
+route_classes = (
+    ({"path": "/api/tweets", "method": "GET"}, FEED_READS_ROUTE_CLASS),
+    ({"path": "/api/tweets", "method": "POST"}, WRITES_ROUTE_CLASS),
+    ({"path": "/api/users/1/follow", "method": "DELETE"}, WRITES_ROUTE_CLASS),
+    ({"path": "/api/medias", "method": "POST"}, MEDIA_UPLOADS_ROUTE_CLASS),
+)
+
+
+class TestAdmissionLimiter:
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_acquire_and_release() -> None:
+        limiter = AdmissionLimiter(limit=1, queue_size=1, queue_timeout=1)
+        assert await limiter.acquire()
+        waiting_request = create_task(limiter.acquire())
+        await async_sleep(0)
+        assert limiter.waiting == 1
+        assert not await limiter.acquire()  # queue is full
+        limiter.release()
+        assert await waiting_request
+        assert limiter.stats() == {
+            "limit": 1, "in_flight": 1, "waiting": 0, "rejected": 1,
+        }
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_queue_timeout() -> None:
+        limiter = AdmissionLimiter(limit=1, queue_size=1, queue_timeout=0)
+        assert await limiter.acquire()
+        assert not await limiter.acquire()
+        assert limiter.waiting == 0
+        assert limiter.rejected == 1
+
+
+class TestAdmissionMiddleware:
+
+    @staticmethod
+    def test_get_route_class() -> None:
+        for i_scope, i_route_class in route_classes:
+            assert get_route_class(i_scope) == i_route_class
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_overflow_is_rejected() -> None:
+        release_request = Event()
+
+        async def slow_app(scope: Scope, receive: Receive, send: Send) -> None:
+            if scope["method"] == "GET":
+                await release_request.wait()
+            await send({"type": "http.response.start", "status": 200})
+            await send({"type": "http.response.body", "body": b""})
+
+        limiters = {
+            i_route_class: AdmissionLimiter(
+                limit=1, queue_size=0, queue_timeout=1,
+            )
+            for _, i_route_class in route_classes
+        }
+        app = AdmissionMiddleware(slow_app, limiters=limiters, retry_after=2)
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test",
+        ) as client:
+            admitted_request = create_task(client.get("/api/tweets"))
+            await async_sleep(0.1)
+            response = await client.get("/api/tweets")
+            assert response.status_code == SERVICE_UNAVAILABLE_STATUS_CODE
+            assert response.headers["Retry-After"] == "2"
+            assert response.json().keys() == ERROR_MESSAGE.keys()
+            response = await client.post("/api/tweets")
+            assert response.status_code != SERVICE_UNAVAILABLE_STATUS_CODE
+            release_request.set()
+            response = await admitted_request
+        assert response.status_code != SERVICE_UNAVAILABLE_STATUS_CODE
+        assert limiters[FEED_READS_ROUTE_CLASS].in_flight == 0
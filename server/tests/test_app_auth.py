@@ -0,0 +1,54 @@
+"""Module for testing authentication by api key from app.auth.py ."""
+
+from fastapi import Request
+from pytest import mark as pytest_mark, raises as pytest_raises
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from app.auth import get_principal, get_principal_by_api_key
+from app.cache import api_key_cache, unknown_api_key_cache
+from app.models.users import User
+from app.schemas import Principal
+from .common import UNAUTHORIZED_SATUS_CODE, test_user_1
+
+new_user_name = "new_user"
+
+
+class TestGetPrincipalByApiKey:
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_known_api_key_is_cached(
+        init_test_data_for_db: None,
+    ) -> None:
+        principal = await get_principal_by_api_key(test_user_1["name"])
+        assert principal.id == test_user_1["id"]
+        assert principal.name == test_user_1["name"]
+        hits = api_key_cache.hits
+        assert await get_principal_by_api_key(test_user_1["name"]) == principal
+        assert api_key_cache.hits == hits + 1
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_unknown_api_key_is_cached(
+        init_test_data_for_db: None,
+    ) -> None:
+        assert await get_principal_by_api_key(new_user_name) is None
+        hits = unknown_api_key_cache.hits
+        assert await get_principal_by_api_key(new_user_name) is None
+        assert unknown_api_key_cache.hits == hits + 1
+        await User.add_user(new_user_name)
+        assert await get_principal_by_api_key(new_user_name) is not None
+
+
+class TestGetPrincipal:
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_principal() -> None:
+        request = Request({"type": "http", "headers": []})
+        with pytest_raises(StarletteHTTPException) as exc_info:
+            await get_principal(request, test_user_1["name"])
+        assert exc_info.value.status_code == UNAUTHORIZED_SATUS_CODE
+        principal = Principal(id=test_user_1["id"], name=test_user_1["name"])
+        request.state.principal = principal
+        assert await get_principal(request, test_user_1["name"]) == principal
@@ -0,0 +1,56 @@
+"""Module for testing class TTLCache from app.cache.py ."""
+
+from app.cache import TTLCache, VersionCounter
+
+cache_entries = (("key_1", 1), ("key_2", 2), ("key_3", 3))
+
+
+class TestTTLCache:
+
+    @staticmethod
+    def test_get_and_set() -> None:
+        cache = TTLCache(max_size=len(cache_entries), ttl=60)
+        assert cache.get("key_1") is None
+        for i_key, i_value in cache_entries:
+            cache.set(i_key, i_value)
+        for i_key, i_value in cache_entries:
+            assert cache.get(i_key) == i_value
+        assert cache.hits == len(cache_entries)
+        assert cache.misses == 1
+        assert cache.hit_ratio == len(cache_entries) / (len(cache_entries) + 1)
+
+    @staticmethod
+    def test_expired_entry() -> None:
+        cache = TTLCache(max_size=len(cache_entries), ttl=0)
+        cache.set("key_1", 1)
+        assert cache.get("key_1") is None
+        assert not len(cache)
+
+    @staticmethod
+    def test_least_recently_used_entry_is_evicted() -> None:
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set("key_1", 1)
+        cache.set("key_2", 2)
+        cache.get("key_1")
+        cache.set("key_3", 3)
+        assert cache.get("key_2") is None
+        assert cache.get("key_1") == 1
+        assert cache.get("key_3") == 3
+
+    @staticmethod
+    def test_delete_and_clear() -> None:
+        cache = TTLCache(max_size=len(cache_entries), ttl=60)
+        for i_key, i_value in cache_entries:
+            cache.set(i_key, i_value)
+        cache.delete("key_1")
+        assert cache.get("key_1") is None
+        cache.clear()
+        assert not len(cache)
+        assert cache.stats()["size"] == 0
+
+    @staticmethod
+    def test_version_counter_is_monotonic() -> None:
+        version = VersionCounter()
+        previous_version = version.current
+        assert version.bump() == previous_version + 1
+        assert VersionCounter().current > version.current
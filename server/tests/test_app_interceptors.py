@@ -10,6 +10,7 @@ from .common import (
     DEFAULT_TABLE_NAMES,
     ERROR_MESSAGE,
     APPLICATION_ENDPOINTS,
+    OK_STATUS_CODE,
     UNAUTHORIZED_SATUS_CODE,
 )
 
@@ -50,6 +51,7 @@ test_routes_for_http_exception_handler = (
     },
 )
 unauthorized_headers: tuple = ({"api-key": "not_existed"}, {})
+open_api_url = "http://localhost/openapi.json"
 
 
 class TestAppInterceptors:
@@ -74,6 +76,16 @@ class TestAppInterceptors:
                 assert isinstance(response_data["error_type"], str)
                 assert isinstance(response_data["error_message"], str)
 
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_intercept_request_open_url(
+        client: AsyncClient, init_test_data_for_db: None,
+    ) -> None:
+        response = await client.get(open_api_url)
+        assert response.status_code == OK_STATUS_CODE
+        response = await client.get("/openapi.json")  # url is not in list
+        assert response.status_code == UNAUTHORIZED_SATUS_CODE
+
     @staticmethod
     @pytest_mark.asyncio
     async def test_http_exception_handler(
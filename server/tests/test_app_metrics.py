@@ -0,0 +1,135 @@
+"""Module for testing metrics in Prometheus text format from metrics.py ."""
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from pytest import mark as pytest_mark
+from starlette.types import Receive, Scope, Send
+
+from app.metrics import (
+    LATENCY_BUCKETS,
+    LatencyHistogram,
+    MetricsMiddleware,
+    PROMETHEUS_CONTENT_TYPE,
+    RequestMetrics,
+    UNMATCHED_ROUTE,
+    collect_pool_metrics,
+    format_labels,
+    render_metrics,
+)
+from .common import OK_STATUS_CODE
+
+
+async def not_found_app(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 404})
+    await send({"type": "http.response.body", "body": b""})
+
+
+class TestMetrics:
+
+    @staticmethod
+    def test_latency_histogram() -> None:
+        histogram = LatencyHistogram()
+        for i_seconds in (0.001, 0.005, 0.3, 60):
+            histogram.observe(i_seconds)
+        cumulative_counts = histogram.get_cumulative_counts()
+        assert len(cumulative_counts) == len(LATENCY_BUCKETS) + 1
+        assert cumulative_counts[0] == 2
+        assert cumulative_counts[LATENCY_BUCKETS.index(0.5)] == 3
+        assert cumulative_counts[-2] == 3
+        assert cumulative_counts[-1] == histogram.count == 4
+        assert round(histogram.sum, 3) == 60.306
+
+    @staticmethod
+    def test_format_labels() -> None:
+        assert format_labels({}) == ""
+        assert format_labels({"route": '/a"b\\c\n'}) == (
+            '{route="/a\\"b\\\\c\\n"}'
+        )
+
+    @staticmethod
+    def test_collect_pool_metrics() -> None:
+        pool_metrics = collect_pool_metrics(
+            {
+                "size": 5,
+                "checkouts": 3,
+                "checkout_timeouts": 0,
+                "checkout_seconds_total": 0.5,
+                "connect_total": 2,
+            },
+        )
+        assert "db_pool_size 5" in pool_metrics
+        assert "db_pool_overflow" not in "\n".join(pool_metrics)
+        assert "db_pool_checkout_seconds_total 0.5" in pool_metrics
+        assert 'db_pool_events_total{event="connect"} 2' in pool_metrics
+        assert len([
+            i_line for i_line in pool_metrics
+            if i_line.startswith("db_pool_events_total{")
+        ]) == 1
+
+    @staticmethod
+    def test_render_metrics() -> None:
+        request_metrics = RequestMetrics()
+        request_metrics.observe("GET", "/api/tweets", "200", 0.02)
+        request_metrics.observe("GET", "/api/tweets", "200", 0.2)
+        metrics_text = render_metrics(request_metrics, {}, {}, {})
+        assert metrics_text.endswith("\n")
+        labels = 'method="GET",route="/api/tweets",status="200"'
+        assert f"http_requests_total{{{labels}}} 2" in metrics_text
+        assert (
+            f'http_request_duration_seconds_bucket{{{labels},le="0.025"}} 1'
+        ) in metrics_text
+        assert (
+            f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2'
+        ) in metrics_text
+        assert "http_requests_in_flight 0" in metrics_text
+        assert "db_pool" not in metrics_text
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_middleware_routes() -> None:
+        request_metrics = RequestMetrics()
+        routed_app = FastAPI()
+
+        @routed_app.get("/api/tweets/{tweet_id}")
+        async def get_tweet(tweet_id: int) -> dict:
+            assert request_metrics.in_flight == 1
+            return {"tweet_id": tweet_id}
+
+        for i_app, i_url in (
+            (routed_app, "/api/tweets/1"),
+            (routed_app, "/api/tweets/2"),
+            (not_found_app, "/api/unknown"),
+        ):
+            app = MetricsMiddleware(i_app, request_metrics=request_metrics)
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test",
+            ) as client:
+                await client.get(i_url)
+        assert request_metrics.in_flight == 0
+        assert set(request_metrics.latencies) == {
+            ("GET", "/api/tweets/{tweet_id}", str(OK_STATUS_CODE)),
+            ("GET", UNMATCHED_ROUTE, "404"),
+        }
+        assert request_metrics.latencies[
+            ("GET", "/api/tweets/{tweet_id}", str(OK_STATUS_CODE))
+        ].count == 2
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_metrics_endpoint(app: FastAPI) -> None:
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://127.0.0.1:5000",
+        ) as client:
+            await client.get("/metrics")
+            response = await client.get("/metrics")
+        assert response.status_code == OK_STATUS_CODE
+        assert response.headers["content-type"] == PROMETHEUS_CONTENT_TYPE
+        for i_metric in (
+            'http_requests_total{method="GET",route="/metrics",status="200"}',
+            'admission_requests_in_flight{route_class="feed_reads"}',
+            'rate_limited_requests_total{limiter="likes"}',
+            'cache_hit_ratio{cache="tweet_feed"}',
+            "db_pool_checkouts_total",
+        ):
+            assert i_metric in response.text
@@ -0,0 +1,66 @@
+"""Module for testing SQL statements counter from query_counter.py ."""
+
+from httpx import ASGITransport, AsyncClient
+from pytest import mark as pytest_mark
+from sqlalchemy import text
+from starlette.types import Receive, Scope, Send
+
+from app.models.connection import async_engine
+from app.query_counter import (
+    QUERY_COUNT_HEADER,
+    QUERY_TIME_HEADER,
+    QueryCounterMiddleware,
+    QueryStats,
+    count_queries,
+    request_query_stats,
+)
+from .common import OK_STATUS_CODE
+
+TOTAL_QUERIES = 3
+
+
+async def querying_app(scope: Scope, receive: Receive, send: Send) -> None:
+    async with async_engine.connect() as conn:
+        for _ in range(TOTAL_QUERIES):
+            await conn.execute(text("SELECT 1;"))
+    await send({"type": "http.response.start", "status": OK_STATUS_CODE})
+    await send({"type": "http.response.body", "body": b""})
+
+
+class TestQueryCounter:
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_count_queries() -> None:
+        with count_queries() as query_stats:
+            async with async_engine.connect() as conn:
+                await conn.execute(text("SELECT 1;"))
+                await conn.execute(text("SELECT 2;"))
+                await conn.execute(text("SELECT 1;"))
+        assert query_stats.statements == 3
+        assert query_stats.seconds > 0
+        assert query_stats.repeats["SELECT 1;"] == 2
+        assert request_query_stats.get() is None
+
+    @staticmethod
+    def test_get_repeated_statements() -> None:
+        query_stats = QueryStats()
+        for i_tweet_id in range(10):
+            query_stats.observe("SELECT media_files", 0.001)
+            query_stats.observe(f"SELECT tweet {i_tweet_id}", 0.001)
+        assert query_stats.get_repeated_statements(10) == [
+            ("SELECT media_files", 10),
+        ]
+        assert query_stats.get_repeated_statements(11) == []
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_middleware_headers() -> None:
+        app = QueryCounterMiddleware(querying_app)
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test",
+        ) as client:
+            response = await client.get("/api/tweets")
+        assert response.headers[QUERY_COUNT_HEADER] == str(TOTAL_QUERIES)
+        assert float(response.headers[QUERY_TIME_HEADER]) > 0
+        assert request_query_stats.get() is None
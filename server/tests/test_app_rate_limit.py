@@ -0,0 +1,89 @@
+"""Module for testing rate limits from app.rate_limit.py ."""
+
+from httpx import ASGITransport, AsyncClient
+from pydantic import ValidationError
+from pytest import (
+    mark as pytest_mark,
+    MonkeyPatch,
+    raises as pytest_raises,
+)
+from starlette.types import Receive, Scope, Send
+
+from app.rate_limit import (
+    RateLimitMiddleware,
+    TokenBucketLimiter,
+    rate_limited_endpoints,
+)
+from app.schemas import TuningSettings
+from .common import ERROR_MESSAGE, OK_STATUS_CODE
+
+TOO_MANY_REQUESTS_STATUS_CODE = 429
+like_tweet_url = "/api/tweets/1/likes"
+
+
+async def empty_app(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": OK_STATUS_CODE})
+    await send({"type": "http.response.body", "body": b""})
+
+
+class TestTokenBucketLimiter:
+
+    @staticmethod
+    def test_take() -> None:
+        limiter = TokenBucketLimiter(rate=1, burst=2)
+        assert limiter.take("user_1") is None
+        assert limiter.take("user_1") is None
+        assert 0 < limiter.take("user_1") <= 1
+        assert limiter.take("user_2") is None
+        assert limiter.limited == 1
+        assert len(limiter) == 2
+
+    @staticmethod
+    def test_idle_buckets_are_evicted() -> None:
+        limiter = TokenBucketLimiter(rate=1e6, burst=1)
+        for i_api_key in ("user_1", "user_2", "user_3"):
+            limiter.take(i_api_key)
+        limiter.evict_idle_buckets(now=float("inf"))
+        assert not len(limiter)
+
+
+    @staticmethod
+    def test_rate_must_be_positive(monkeypatch: MonkeyPatch) -> None:
+        monkeypatch.setenv("RATE_LIMIT_LIKES_RATE", "0")
+        with pytest_raises(ValidationError):
+            TuningSettings()
+
+
+class TestRateLimitMiddleware:
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_limited_endpoint() -> None:
+        limited_endpoints = (
+            (
+                frozenset(("POST",)),
+                rate_limited_endpoints[0][1],
+                TokenBucketLimiter(rate=1e-3, burst=1),
+            ),
+        )
+        app = RateLimitMiddleware(
+            empty_app, limited_endpoints=limited_endpoints,
+        )
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test",
+        ) as client:
+            for i_api_key in ("user_1", "user_2"):
+                response = await client.post(
+                    like_tweet_url, headers={"api-key": i_api_key},
+                )
+                assert response.status_code == OK_STATUS_CODE
+            response = await client.post(
+                like_tweet_url, headers={"api-key": "user_1"},
+            )
+            assert response.status_code == TOO_MANY_REQUESTS_STATUS_CODE
+            assert int(response.headers["Retry-After"]) > 0
+            assert response.json().keys() == ERROR_MESSAGE.keys()
+            response = await client.get(
+                like_tweet_url, headers={"api-key": "user_1"},
+            )
+            assert response.status_code == OK_STATUS_CODE
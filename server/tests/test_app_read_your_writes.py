@@ -0,0 +1,50 @@
+"""Module for testing read your writes routing from read_your_writes.py ."""
+
+from httpx import ASGITransport, AsyncClient
+from pytest import mark as pytest_mark
+from starlette.types import Receive, Scope, Send
+
+from app.cache import recent_writers_cache
+from app.models.connection import async_engine, read_session
+from app.read_your_writes import ReadYourWritesMiddleware, primary_reads
+from .common import OK_STATUS_CODE
+
+writer_header = {"api-key": "writer"}
+reader_header = {"api-key": "reader"}
+
+
+async def primary_reads_app(
+    scope: Scope, receive: Receive, send: Send,
+) -> None:
+    body = str(primary_reads.get()).encode()
+    await send({"type": "http.response.start", "status": OK_STATUS_CODE})
+    await send({"type": "http.response.body", "body": body})
+
+
+class TestReadYourWritesMiddleware:
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_recent_writer_reads_from_primary() -> None:
+        recent_writers_cache.clear()
+        app = ReadYourWritesMiddleware(primary_reads_app)
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test",
+        ) as client:
+            response = await client.get("/api/tweets", headers=writer_header)
+            assert response.text == "False"
+            response = await client.post("/api/tweets", headers=writer_header)
+            assert response.text == "True"
+            response = await client.get("/api/tweets", headers=writer_header)
+            assert response.text == "True"
+            response = await client.get("/api/tweets", headers=reader_header)
+            assert response.text == "False"
+        assert not primary_reads.get()
+        recent_writers_cache.clear()
+
+    @staticmethod
+    def test_read_session_without_replica() -> None:
+        assert read_session().bind is async_engine
+        token = primary_reads.set(True)
+        assert read_session().bind is async_engine
+        primary_reads.reset(token)
@@ -9,7 +9,7 @@ from sqlalchemy.sql import text
 
 from .common import DEFAULT_TABLE_NAMES
 from app.models.connection import get_async_engine
-from app.models.initialization import init_db
+from app.models.initialization import seed_db
 from app.models.media_files import MediaFile
 from app.models.tweets import Tweet
 from app.models.tweet_likes import TweetLike
@@ -40,10 +40,10 @@ async def test_create_tables(
 
 
 @pytest_mark.asyncio
-async def test_init_db(
+async def test_seed_db(
     clear_test_db_tables: None, test_session: AsyncSession,
 ) -> None:
-    await init_db()
+    await seed_db()
     total_users = await test_session.execute(select(func.count(User.id)))
     assert total_users.scalar() == 5
     total_media_files = await test_session.execute(
@@ -0,0 +1,146 @@
+"""Module for testing that hot queries of app.models use indexes."""
+
+from pytest import mark as pytest_mark
+from sqlalchemy import Select, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.connection import async_engine
+from app.models.followers import followers
+from app.models.media_files import MediaFile
+from app.models.timelines import (
+    FAN_OUT_MAX_FOLLOWERS,
+    Timeline,
+    get_followed_celebrity_names_query,
+    get_followed_names_query,
+    get_timeline_query,
+)
+from app.models.tweet_likes import (
+    TweetLike,
+    get_likers_page_query,
+    get_likers_query,
+)
+from app.models.tweets import (
+    Tweet,
+    get_recent_tweet_ids_query,
+    get_tweet_feed_query,
+    get_tweets_page_query,
+)
+from app.models.users import User
+
+TOTAL_USERS = 10000
+TOTAL_FOLLOWS = 10
+TOTAL_TWEETS = 10000
+TOTAL_LIKES = 3
+TOTAL_MEDIA_FILES = 5000
+USER_ID = 7
+USER_NAME = f"index_user_{USER_ID}"
+fill_tables_queries = (
+    "INSERT INTO users (name) "
+    "SELECT 'index_user_' || i FROM generate_series(1, :users) AS i;",
+    "INSERT INTO followers (follower_id, followed_id) "
+    "SELECT users.id, (users.id + k) % :users + 1 "
+    "FROM users, generate_series(1, :follows) AS k;",
+    "INSERT INTO tweets (author_name, tweet_data, like_count) "
+    "SELECT 'index_user_' || (i % :users + 1), 'tweet ' || i, :likes "
+    "FROM generate_series(1, :tweets) AS i;",
+    "INSERT INTO tweets_likes (tweet_id, user_name) "
+    "SELECT tweets.id, 'index_user_' || ((tweets.id + k) % :users + 1) "
+    "FROM tweets, generate_series(1, :likes) AS k;",
+    "INSERT INTO media_files (file_name, user_name) "
+    "SELECT 'file_' || i || '.jpg', 'index_user_' || (i % :users + 1) "
+    "FROM generate_series(1, :media_files) AS i;",
+    "INSERT INTO timelines (user_id, tweet_id) "
+    "SELECT followers.follower_id, tweets.id FROM followers "
+    "JOIN users ON users.id = followers.followed_id "
+    "JOIN tweets ON tweets.author_name = users.name;",
+    "ANALYZE;",
+)
+hot_queries: dict[str, Select] = {
+    "tweets_page_sorted_by_likes": get_tweets_page_query(20),
+    "next_tweets_page_sorted_by_likes": get_tweets_page_query(
+        20, after=(TOTAL_LIKES, TOTAL_TWEETS // 2),
+    ),
+    "tweet_feed_rows_by_ids": get_tweet_feed_query().where(
+        Tweet.id.in_([1, 2, 3]),
+    ),
+    "likers_of_tweets": get_likers_query([1, 2, 3]),
+    "first_likers_of_tweets": get_likers_query([1, 2, 3], limit=2),
+    "likers_page_of_tweet": get_likers_page_query(
+        USER_ID, limit=20, after_id=USER_ID,
+    ),
+    "followed_celebrity_names": get_followed_celebrity_names_query(
+        USER_ID, FAN_OUT_MAX_FOLLOWERS,
+    ),
+    "recent_tweets_of_followed_users": get_recent_tweet_ids_query(
+        get_followed_names_query(USER_ID), limit=20,
+    ),
+    "timeline_of_user": get_timeline_query(USER_ID, limit=20),
+    "like_of_user": select(TweetLike.id).where(
+        TweetLike.user_name == USER_NAME, TweetLike.tweet_id == USER_ID,
+    ),
+    "likes_of_user": select(TweetLike.id).where(
+        TweetLike.user_name == USER_NAME,
+    ),
+    "followers_of_user": select(followers.c.follower_id).where(
+        followers.c.followed_id == USER_ID,
+    ),
+    "followed_of_user": select(followers.c.followed_id).where(
+        followers.c.follower_id == USER_ID,
+    ),
+    "media_files_of_user": select(MediaFile.id).where(
+        MediaFile.user_name == USER_NAME,
+    ),
+    "timelines_of_tweet": select(Timeline.user_id).where(
+        Timeline.tweet_id == USER_ID,
+    ),
+    "user_by_name": select(User.id).where(User.name == USER_NAME),
+}
+
+
+def get_plan_node_types(plan: dict) -> list[str]:
+    """Get types of all nodes of query plan.
+
+    Args:
+        plan (dict): node of query plan from EXPLAIN (FORMAT JSON)
+
+    Returns:
+        list[str] : node types
+
+    """
+    node_types = [plan["Node Type"]]
+    for i_subplan in plan.get("Plans", []):
+        node_types.extend(get_plan_node_types(i_subplan))
+    return node_types
+
+
+class TestIndexes:
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_hot_queries_use_indexes(
+        clear_test_db_tables: None, test_session: AsyncSession,
+    ) -> None:
+        parameters = {
+            "users": TOTAL_USERS,
+            "follows": TOTAL_FOLLOWS,
+            "tweets": TOTAL_TWEETS,
+            "likes": TOTAL_LIKES,
+            "media_files": TOTAL_MEDIA_FILES,
+        }
+        async with async_engine.begin() as conn:
+            for i_query in fill_tables_queries:
+                await conn.execute(text(i_query), parameters)
+        for i_name, i_query in hot_queries.items():
+            compiled_query = i_query.compile(
+                dialect=postgresql.dialect(),
+                compile_kwargs={"literal_binds": True},
+            )
+            explain_query = await test_session.execute(
+                text(f"EXPLAIN (FORMAT JSON) {compiled_query}"),
+            )
+            node_types = get_plan_node_types(
+                explain_query.scalar_one()[0]["Plan"],
+            )
+            assert "Seq Scan" not in node_types, i_name
+            assert any("Index" in i_type for i_type in node_types), i_name
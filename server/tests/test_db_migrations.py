@@ -0,0 +1,120 @@
+"""Module for testing versioned migrations of db schema."""
+
+from asyncio import gather
+
+from pytest import (
+    mark as pytest_mark,
+    MonkeyPatch,
+    raises as pytest_raises,
+)
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.connection import async_engine
+from app.models.migrations import (
+    get_schema_version,
+    LATEST_SCHEMA_VERSION,
+    migrate,
+    MIGRATIONS,
+    SchemaVersion,
+    verify_schema_version,
+)
+
+# Schema of db before migrations were introduced
+baseline_schema_queries = (
+    "DROP TABLE IF EXISTS schema_version, timelines, tweets_likes, "
+    "media_files, tweets, followers, users CASCADE;",
+    "CREATE TABLE users (id SERIAL PRIMARY KEY, "
+    "name VARCHAR NOT NULL UNIQUE);",
+    "CREATE TABLE followers ("
+    "follower_id INTEGER REFERENCES users (id) ON DELETE CASCADE, "
+    "followed_id INTEGER REFERENCES users (id) ON DELETE CASCADE, "
+    "PRIMARY KEY (follower_id, followed_id));",
+    "CREATE TABLE media_files (id SERIAL PRIMARY KEY, "
+    "file_name VARCHAR NOT NULL, "
+    "user_name VARCHAR NOT NULL REFERENCES users (name) ON DELETE CASCADE);",
+    "CREATE TABLE tweets (id SERIAL PRIMARY KEY, "
+    "author_name VARCHAR NOT NULL REFERENCES users (name) ON DELETE CASCADE, "
+    "tweet_data VARCHAR NOT NULL, tweet_media_ids INTEGER[]);",
+    "CREATE TABLE tweets_likes (id SERIAL PRIMARY KEY, "
+    "tweet_id INTEGER NOT NULL REFERENCES tweets (id) ON DELETE CASCADE, "
+    "user_name VARCHAR NOT NULL REFERENCES users (name) ON DELETE CASCADE, "
+    "CONSTRAINT unique_tweet_like UNIQUE (tweet_id, user_name));",
+    "INSERT INTO users (name) VALUES ('user_1'), ('user_2'), ('user_3');",
+    "INSERT INTO followers VALUES (1, 2), (3, 2), (1, 3);",
+    "INSERT INTO tweets (author_name, tweet_data) "
+    "VALUES ('user_2', 'tweet_1'), ('user_2', 'tweet_2');",
+    "INSERT INTO tweets_likes (tweet_id, user_name) "
+    "VALUES (1, 'user_1'), (1, 'user_3'), (2, 'user_1');",
+)
+sql_query_clear_db_tables = """
+TRUNCATE TABLE followers, media_files, timelines, tweets, tweets_likes, users
+RESTART IDENTITY;
+"""
+
+
+def test_migrations_versions() -> None:
+    versions = [i_migration.version for i_migration in MIGRATIONS]
+    assert versions == list(range(1, len(MIGRATIONS) + 1))
+    assert LATEST_SCHEMA_VERSION == len(MIGRATIONS)
+
+
+@pytest_mark.asyncio
+async def test_migrate(test_session: AsyncSession) -> None:
+    assert await get_schema_version() == LATEST_SCHEMA_VERSION
+    assert await migrate() == 0
+    versions_query = await test_session.execute(
+        select(SchemaVersion.version).order_by(SchemaVersion.version),
+    )
+    assert versions_query.scalars().all() == [
+        i_migration.version for i_migration in MIGRATIONS
+    ]
+    await verify_schema_version()
+
+
+@pytest_mark.asyncio
+async def test_verify_schema_version_behind(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        "app.models.migrations.LATEST_SCHEMA_VERSION",
+        LATEST_SCHEMA_VERSION + 1,
+    )
+    with pytest_raises(SystemExit):
+        await verify_schema_version()
+
+
+@pytest_mark.asyncio
+async def test_migrate_from_baseline_schema() -> None:
+    async with async_engine.begin() as conn:
+        for baseline_query in baseline_schema_queries:
+            await conn.execute(text(baseline_query))
+    assert await get_schema_version() is None
+    # concurrent runs wait for lock of migrations and apply them once
+    assert sorted(await gather(migrate(), migrate())) == [
+        0, LATEST_SCHEMA_VERSION,
+    ]
+    assert await get_schema_version() == LATEST_SCHEMA_VERSION
+    async with async_engine.begin() as conn:
+        like_counts_query = await conn.execute(
+            text("SELECT id, like_count FROM tweets ORDER BY id;"),
+        )
+        assert like_counts_query.all() == [(1, 2), (2, 1)]
+        follower_counts_query = await conn.execute(
+            text("SELECT id, follower_count FROM users ORDER BY id;"),
+        )
+        assert follower_counts_query.all() == [(1, 0), (2, 2), (3, 1)]
+        indexes_query = await conn.execute(
+            text(
+                "SELECT indexname FROM pg_indexes "
+                "WHERE schemaname = 'public';",
+            ),
+        )
+        models_indexes = {
+            i_index.name
+            for i_table in SchemaVersion.metadata.tables.values()
+            for i_index in i_table.indexes
+        }
+        assert models_indexes
+        assert models_indexes <= set(indexes_query.scalars().all())
+        await conn.execute(text(sql_query_clear_db_tables))
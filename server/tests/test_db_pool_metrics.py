@@ -0,0 +1,54 @@
+"""Module for testing metrics of db connection pool from pool_metrics.py ."""
+
+from sqlite3 import connect as sqlite_connect
+
+from pytest import MonkeyPatch
+from sqlalchemy.pool import QueuePool
+
+from app.models.connection import get_pool_options
+from app.models.pool_metrics import PoolMetrics, add_pool_listeners
+from app.schemas import TuningSettings
+
+
+class TestPoolMetrics:
+
+    @staticmethod
+    def test_observe_checkout() -> None:
+        metrics = PoolMetrics()
+        metrics.observe_checkout(seconds=0.5, overflow=0)
+        metrics.observe_checkout(seconds=1.5, overflow=2)
+        assert metrics.checkouts == 2
+        assert metrics.checkout_seconds_total == 2
+        assert metrics.checkout_seconds_max == 1.5
+        assert metrics.overflow_max == 2
+
+    @staticmethod
+    def test_pool_listeners() -> None:
+        metrics = PoolMetrics()
+        pool = QueuePool(
+            lambda: sqlite_connect(":memory:"), pool_size=1, max_overflow=1,
+        )
+        add_pool_listeners(pool, metrics)
+        first_connection = pool.connect()
+        second_connection = pool.connect()  # overflow connection
+        snapshot = metrics.snapshot(pool)
+        assert snapshot["connect_total"] == 2
+        assert snapshot["checked_out"] == 2
+        assert snapshot["overflow"] == 1
+        second_connection.invalidate()
+        second_connection.close()
+        first_connection.close()
+        snapshot = metrics.snapshot(pool)
+        assert snapshot["invalidate_total"] == 1
+        assert snapshot["checked_out"] == 0
+        pool.dispose()
+        assert metrics.snapshot(pool)["close_total"] >= 2
+
+    @staticmethod
+    def test_pool_pre_ping_option(monkeypatch: MonkeyPatch) -> None:
+        for i_value, i_pre_ping in (
+            ("yes", True), ("on", True), ("1", True), ("off", False),
+        ):
+            monkeypatch.setenv("DB_POOL_PRE_PING", i_value)
+            pool_options = get_pool_options(TuningSettings())
+            assert pool_options["pool_pre_ping"] is i_pre_ping
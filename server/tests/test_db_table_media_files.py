@@ -8,6 +8,7 @@ from .common import (
     MEDIA_FILE_1,
     MEDIA_FILE_2,
     MEDIA_FILE_3,
+    TOO_MANY_IDS,
     test_user_1,
 )
 
@@ -54,6 +55,29 @@ class TestMediaFilesMethods:
         )
         assert media_files_names == media_files["corresponding_files_names"]
 
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_media_files_names_by_ids(
+        init_test_data_for_db: None,
+    ) -> None:
+        media_files_names = await MediaFile.get_media_files_names_by_ids(
+            [*media_files["ids"], DEFAULT_TOTAL_MEDIA_FILES + 1],
+        )
+        assert media_files_names == dict(
+            zip(media_files["ids"], media_files["corresponding_files_names"]),
+        )
+        assert await MediaFile.get_media_files_names_by_ids([]) == {}
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_media_files_names_by_too_many_ids(
+        init_test_data_for_db: None,
+    ) -> None:
+        media_files_names = await MediaFile.get_media_files_names_by_ids(
+            range(1, TOO_MANY_IDS + 1),
+        )
+        assert len(media_files_names) == DEFAULT_TOTAL_MEDIA_FILES
+
     @staticmethod
     @pytest_mark.asyncio
     async def test_bulk_delete(init_test_data_for_db: None) -> None:
@@ -0,0 +1,146 @@
+"""Module for testing class Timeline from app.models.timelines.py ."""
+
+from pytest import mark as pytest_mark
+
+from app.models.timelines import Timeline
+from app.models.tweets import Tweet
+from app.models.users import User
+from .common import (
+    DEFAULT_TOTAL_TIMELINES_TWEETS,
+    TIMELINES_TWEET_IDS,
+    TWEET_2,
+    TWEET_3,
+    test_user_1,
+    test_user_2,
+    test_user_3,
+)
+
+TIMELINE_LIMIT = 10
+
+
+class TestTimelineMethods:
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_tweet_ids(init_test_data_for_db: None) -> None:
+        for i_user in (test_user_1, test_user_2, test_user_3):
+            tweet_ids = await Timeline.get_tweet_ids(
+                i_user["id"], TIMELINE_LIMIT,
+            )
+            assert tweet_ids == TIMELINES_TWEET_IDS[i_user["name"]]
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_tweet_ids_with_before_id(
+        init_test_data_for_db: None,
+    ) -> None:
+        tweet_ids = await Timeline.get_tweet_ids(
+            test_user_1["id"], TIMELINE_LIMIT, before_id=TWEET_2["id"],
+        )
+        assert tweet_ids == []
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_followed_tweet_ids(init_test_data_for_db: None) -> None:
+        for i_user in (test_user_1, test_user_2, test_user_3):
+            tweet_ids = await Timeline.get_followed_tweet_ids(
+                i_user["id"], TIMELINE_LIMIT,
+            )
+            assert tweet_ids == TIMELINES_TWEET_IDS[i_user["name"]]
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_followed_tweet_ids_merges_authors(
+        init_test_data_for_db: None,
+    ) -> None:
+        await User.follow_other_user(test_user_1["id"], test_user_3["id"])
+        tweet_id = await Tweet.add_tweet(
+            author_name=test_user_2["name"], tweet_data="new tweet",
+        )
+        tweet_ids = await Timeline.get_followed_tweet_ids(
+            test_user_1["id"], TIMELINE_LIMIT,
+        )
+        assert tweet_ids == [tweet_id, TWEET_3["id"], TWEET_2["id"]]
+        tweet_ids = await Timeline.get_followed_tweet_ids(
+            test_user_1["id"], limit=2, before_id=tweet_id,
+        )
+        assert tweet_ids == [TWEET_3["id"], TWEET_2["id"]]
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_fan_out_tweet(init_test_data_for_db: None) -> None:
+        tweet_id = await Tweet.add_tweet(
+            author_name=test_user_2["name"], tweet_data="new tweet",
+        )
+        total_timelines = await Timeline.fan_out_tweet(
+            test_user_2["name"], tweet_id,
+        )
+        assert total_timelines == len(test_user_2["followers"])
+        tweet_ids = await Timeline.get_tweet_ids(
+            test_user_1["id"], TIMELINE_LIMIT,
+        )
+        assert tweet_ids == [tweet_id, TWEET_2["id"]]
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_celebrity_tweets_are_merged_on_read(
+        init_test_data_for_db: None,
+    ) -> None:
+        tweet_id = await Tweet.add_tweet(
+            author_name=test_user_2["name"], tweet_data="new tweet",
+        )
+        total_timelines = await Timeline.fan_out_tweet(
+            test_user_2["name"], tweet_id, max_followers=0,
+        )
+        assert total_timelines == 0
+        tweet_ids = await Timeline.get_tweet_ids(
+            test_user_1["id"], TIMELINE_LIMIT,
+        )
+        assert tweet_ids == [TWEET_2["id"]]
+        tweet_ids = await Timeline.get_tweet_ids(
+            test_user_1["id"], TIMELINE_LIMIT, max_followers=0,
+        )
+        assert tweet_ids == [tweet_id, TWEET_2["id"]]
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_fan_out_author_tweets(init_test_data_for_db: None) -> None:
+        tweet_id = await Tweet.add_tweet(
+            author_name=test_user_2["name"], tweet_data="new tweet",
+        )
+        total_timelines_tweets = await Timeline.fan_out_author_tweets(
+            test_user_2["id"],
+        )
+        assert total_timelines_tweets == 1
+        tweet_ids = await Timeline.get_tweet_ids(
+            test_user_1["id"], TIMELINE_LIMIT,
+        )
+        assert tweet_ids == [tweet_id, TWEET_2["id"]]
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_add_and_remove_followed_tweets(
+        init_test_data_for_db: None,
+    ) -> None:
+        await Timeline.add_followed_tweets(
+            test_user_1["id"], test_user_3["id"],
+        )
+        tweet_ids = await Timeline.get_tweet_ids(
+            test_user_1["id"], TIMELINE_LIMIT,
+        )
+        assert tweet_ids == [TWEET_3["id"], TWEET_2["id"]]
+        await Timeline.remove_followed_tweets(
+            test_user_1["id"], test_user_3["id"],
+        )
+        tweet_ids = await Timeline.get_tweet_ids(
+            test_user_1["id"], TIMELINE_LIMIT,
+        )
+        assert tweet_ids == [TWEET_2["id"]]
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_rebuild(init_test_data_for_db: None) -> None:
+        total_timelines_tweets = await Timeline.rebuild()
+        assert total_timelines_tweets == DEFAULT_TOTAL_TIMELINES_TWEETS
+        total_timelines_tweets = await Timeline.rebuild(max_followers=0)
+        assert total_timelines_tweets == 0
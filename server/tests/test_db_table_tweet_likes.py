@@ -3,8 +3,11 @@
 from pytest import mark as pytest_mark
 
 from app.models.tweet_likes import TweetLike
+from app.models.tweets import Tweet
 from .common import (
     DEFAULT_TOTAL_LIKES,
+    SORTED_TWEET_FEED,
+    TOO_MANY_IDS,
     test_user_1,
     test_user_2,
     test_user_3,
@@ -48,3 +51,79 @@ class TestTweetLikeMethods:
     async def test_get_total_likes(init_test_data_for_db: None) -> None:
         total_likes = await TweetLike.get_total_likes()
         assert total_likes == DEFAULT_TOTAL_LIKES
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_like_and_dislike_tweet_keep_like_count(
+        init_test_data_for_db: None,
+    ) -> None:
+        for i_like_details in user_did_not_like_tweet:
+            await TweetLike.like_tweet(**i_like_details)
+        for i_like_details in user_has_liked_tweet:
+            await TweetLike.dislike_tweet(**i_like_details)
+        all_tweets = await Tweet.get_all_tweet_feed_rows_sorted_by_likes()
+        likers = await TweetLike.get_likers_by_tweet_ids(
+            i_tweet.id for i_tweet in all_tweets
+        )
+        for i_tweet in all_tweets:
+            assert i_tweet.like_count == len(likers[i_tweet.id])
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_likers_by_tweet_ids(
+        init_test_data_for_db: None,
+    ) -> None:
+        likers = await TweetLike.get_likers_by_tweet_ids(
+            i_tweet["id"] for i_tweet in SORTED_TWEET_FEED
+        )
+        for i_tweet in SORTED_TWEET_FEED:
+            assert [
+                {"user_id": i_liker.user_id, "name": i_liker.name}
+                for i_liker in likers[i_tweet["id"]]
+            ] == i_tweet["likes"]
+        assert await TweetLike.get_likers_by_tweet_ids([]) == {}
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_likers_by_too_many_tweet_ids(
+        init_test_data_for_db: None,
+    ) -> None:
+        likers = await TweetLike.get_likers_by_tweet_ids(
+            range(1, TOO_MANY_IDS + 1), limit=1,
+        )
+        assert sorted(likers) == sorted(
+            i_tweet["id"] for i_tweet in SORTED_TWEET_FEED if i_tweet["likes"]
+        )
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_likers_by_tweet_ids_with_limit(
+        init_test_data_for_db: None,
+    ) -> None:
+        likers = await TweetLike.get_likers_by_tweet_ids(
+            (i_tweet["id"] for i_tweet in SORTED_TWEET_FEED), limit=1,
+        )
+        for i_tweet in SORTED_TWEET_FEED:
+            assert [
+                {"user_id": i_liker.user_id, "name": i_liker.name}
+                for i_liker in likers[i_tweet["id"]]
+            ] == i_tweet["likes"][:1]
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_likers_page(init_test_data_for_db: None) -> None:
+        tweet_likes = SORTED_TWEET_FEED[0]["likes"]
+        first_page = await TweetLike.get_likers_page(
+            SORTED_TWEET_FEED[0]["id"], limit=2,
+        )
+        assert [
+            {"user_id": i_liker.user_id, "name": i_liker.name}
+            for i_liker in first_page
+        ] == tweet_likes[:2]
+        second_page = await TweetLike.get_likers_page(
+            SORTED_TWEET_FEED[0]["id"], limit=2, after_id=first_page[-1].id,
+        )
+        assert [
+            {"user_id": i_liker.user_id, "name": i_liker.name}
+            for i_liker in second_page
+        ] == tweet_likes[2:]
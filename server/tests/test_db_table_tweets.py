@@ -1,7 +1,10 @@
 """Module for testing class Tweet from app.models.tweets.py ."""
 
 from pytest import mark as pytest_mark
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.tweet_likes import TweetLike
 from app.models.tweets import Tweet
 from .common import (
     DEFAULT_TOTAL_TWEETS,
@@ -9,6 +12,7 @@ from .common import (
     TWEET_2,
     TWEET_3,
     test_user_1,
+    test_user_3,
 )
 
 new_tweet = {
@@ -37,6 +41,12 @@ class TestTableTweetMethods:
             TWEET_1["tweet_media_ids"],
         )
 
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_is_existed_tweet(init_test_data_for_db: None) -> None:
+        assert await Tweet.is_existed_tweet(TWEET_1["id"]) is True
+        assert await Tweet.is_existed_tweet(DEFAULT_TOTAL_TWEETS + 1) is False
+
     @staticmethod
     @pytest_mark.asyncio
     async def test_get_total_tweets(init_test_data_for_db: None) -> None:
@@ -45,13 +55,55 @@ class TestTableTweetMethods:
 
     @staticmethod
     @pytest_mark.asyncio
-    async def test_get_all_tweets_sorted_by_likes(
+    async def test_get_all_tweet_feed_rows_sorted_by_likes(
+        init_test_data_for_db: None,
+    ) -> None:
+        all_tweets = await Tweet.get_all_tweet_feed_rows_sorted_by_likes()
+        assert [i_tweet.id for i_tweet in all_tweets] == [
+            TWEET_3["id"], TWEET_2["id"], TWEET_1["id"],
+        ]
+        assert all_tweets[0].author_id == test_user_3["id"]
+        assert all_tweets[0].author_name == TWEET_3["author_name"]
+        assert all_tweets[1].tweet_media_ids == TWEET_2["tweet_media_ids"]
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_tweet_feed_rows_by_ids(
         init_test_data_for_db: None,
     ) -> None:
-        all_tweets = await Tweet.get_all_tweets_sorted_by_likes()
-        assert len(all_tweets) == DEFAULT_TOTAL_TWEETS
+        tweet_ids = [TWEET_1["id"], TWEET_3["id"]]
+        tweets = await Tweet.get_tweet_feed_rows_by_ids(tweet_ids)
+        assert [i_tweet.id for i_tweet in tweets] == tweet_ids
+        assert await Tweet.get_tweet_feed_rows_by_ids([]) == []
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_tweets_page_sorted_by_likes(
+        init_test_data_for_db: None,
+    ) -> None:
+        first_page = await Tweet.get_tweets_page_sorted_by_likes(limit=2)
+        assert [i_tweet.id for i_tweet in first_page] == [
+            TWEET_3["id"], TWEET_2["id"],
+        ]
+        last_tweet = first_page[-1]
+        second_page = await Tweet.get_tweets_page_sorted_by_likes(
+            limit=2, after=(last_tweet.like_count, last_tweet.id),
+        )
+        assert [i_tweet.id for i_tweet in second_page] == [TWEET_1["id"]]
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_recalculate_like_counts(
+        init_test_data_for_db: None, test_session: AsyncSession,
+    ) -> None:
+        await test_session.execute(update(Tweet).values(like_count=0))
+        await test_session.commit()
+        repaired_tweets = await Tweet.recalculate_like_counts()
+        assert repaired_tweets == DEFAULT_TOTAL_TWEETS
+        all_tweets = await Tweet.get_all_tweet_feed_rows_sorted_by_likes()
+        likers = await TweetLike.get_likers_by_tweet_ids(
+            i_tweet.id for i_tweet in all_tweets
+        )
         for i_tweet in all_tweets:
-            assert isinstance(i_tweet, Tweet)
-        assert all_tweets[0].id == TWEET_3["id"]
-        assert all_tweets[1].id == TWEET_2["id"]
-        assert all_tweets[2].id == TWEET_1["id"]
+            assert i_tweet.like_count == len(likers[i_tweet.id])
+        assert await Tweet.recalculate_like_counts() == 0
@@ -26,22 +26,22 @@ user_can_follow_user = (
     {
         "user": test_user_1["id"],
         "followed": test_user_3["id"],
-        "result": (test_user_1["id"], test_user_3["id"]),
+        "result": 1,
     },
     {
         "user": test_user_2["id"],
         "followed": test_user_1["id"],
-        "result": (test_user_2["id"], test_user_1["id"]),
+        "result": 2,
     },
     {
         "user": test_user_2["id"],
         "followed": test_user_3["id"],
-        "result": (test_user_2["id"], test_user_3["id"]),
+        "result": 2,
     },
     {
         "user": test_user_3["id"],
         "followed": test_user_2["id"],
-        "result": (test_user_3["id"], test_user_2["id"]),
+        "result": 2,
     },
 )
 user_can_not_follow_user = (
@@ -53,12 +53,12 @@ user_can_unfollow_user = (
     {
         "user": test_user_1["id"],
         "followed": test_user_2["id"],
-        "result": (test_user_1["id"], test_user_2["id"]),
+        "result": 0,
     },
     {
         "user": test_user_3["id"],
         "followed": test_user_1["id"],
-        "result": (test_user_3["id"], test_user_1["id"]),
+        "result": 0,
     },
 )
 user_can_not_unfollow_user = (
@@ -169,3 +169,13 @@ class TestTableUserMethods:
                 i_data["user"], i_data["followed"],
             )
             assert result == i_data["result"]
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_recalculate_follower_counts(
+        init_test_data_for_db: None,
+    ) -> None:
+        assert await User.recalculate_follower_counts() == 0
+        for i_exist_user in exist_users:
+            user = await User.get_user_by_id(i_exist_user["id"])
+            assert user.follower_count == len(i_exist_user["followers"])
@@ -20,6 +20,7 @@ from .common import (
     MEDIA_FILE_UNSUPPORTED_FORMAT,
     SAVE_MEDIA_ABS_PATH,
     open_test_image,
+    assert_max_queries,
 )
 
 add_media_endpoint = APPLICATION_ENDPOINTS["add_media"]["endpoint"]
@@ -132,6 +133,7 @@ class TestAddMediaEndpoint:
             )
             assert response.json() == i_data["result"]["message"]
             assert response.status_code == i_data["result"]["status_code"]
+            assert_max_queries(response, "add_media")
 
     @staticmethod
     @pytest_mark.asyncio
@@ -11,6 +11,7 @@ from .common import (
     CREATED_STATUS_CODE,
     ERROR_MESSAGE,
     APPLICATION_ENDPOINTS,
+    assert_max_queries,
 )
 
 add_tweet_endpoint = APPLICATION_ENDPOINTS["add_tweet"]["endpoint"]
@@ -88,6 +89,7 @@ class TestAddTweetEndpoint:
             )
             assert response.json() == i_data["result"]["message"]
             assert response.status_code == i_data["result"]["status_code"]
+            assert_max_queries(response, "add_tweet")
 
     @staticmethod
     @pytest_mark.asyncio
@@ -20,6 +20,7 @@ from .common import (
     TWEET_1,
     TWEET_2,
     TWEET_3,
+    assert_max_queries,
 )
 
 delete_tweet_endpoint = APPLICATION_ENDPOINTS["delete_tweet"]["endpoint"]
@@ -99,6 +100,7 @@ class TestDeleteTweetEndpoint:
                     valid_delete_tweet_data["result"]["message"])
             assert (response.status_code ==
                     valid_delete_tweet_data["result"]["status_code"])
+            assert_max_queries(response, "delete_tweet")
 
     @staticmethod
     @pytest_mark.asyncio
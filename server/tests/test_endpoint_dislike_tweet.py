@@ -10,6 +10,7 @@ from .common import (
     CREATED_STATUS_CODE,
     ERROR_MESSAGE,
     APPLICATION_ENDPOINTS,
+    assert_max_queries,
 )
 
 dislike_tweet_endpoint = APPLICATION_ENDPOINTS["dislike_tweet"]["endpoint"]
@@ -75,6 +76,7 @@ class TestDislikeTweetEndpoint:
         assert response.json() == user_can_dislike_tweet["result"]["message"]
         assert (response.status_code ==
                 user_can_dislike_tweet["result"]["status_code"])
+        assert_max_queries(response, "dislike_tweet")
 
     @staticmethod
     @pytest_mark.asyncio
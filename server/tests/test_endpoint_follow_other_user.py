@@ -11,6 +11,7 @@ from .common import (
     ERROR_MESSAGE,
     APPLICATION_ENDPOINTS,
     test_user_1,
+    assert_max_queries,
 )
 
 follow_user_url = APPLICATION_ENDPOINTS["follow_user"]["endpoint"]
@@ -79,6 +80,7 @@ class TestFollowOtherUserEndpoint:
         assert response.json() == user_can_follow_user["result"]["message"]
         assert (response.status_code ==
                 user_can_follow_user["result"]["status_code"])
+        assert_max_queries(response, "follow_user")
 
     @staticmethod
     @pytest_mark.asyncio
@@ -5,8 +5,25 @@ from pytest import mark as pytest_mark
 
 from .common import (
     AUTHORIZED_HEADER,
+    BAD_REQUEST_STATUS_CODE,
     CORRECT_GET_TWEET_FEED_RESPONSE,
     APPLICATION_ENDPOINTS,
+    NOT_MODIFIED_STATUS_CODE,
+    OK_STATUS_CODE,
+    SORTED_TWEET_FEED,
+    TWEET_1,
+    test_user_2,
+    assert_max_queries,
+)
+
+get_tweet_feed_endpoint = APPLICATION_ENDPOINTS["get_tweet_feed"]["endpoint"]
+get_tweet_feed_method = APPLICATION_ENDPOINTS["get_tweet_feed"]["http_method"]
+invalid_page_params = (
+    {"limit": 0},
+    {"limit": "ten"},
+    {"limit": 2, "cursor": "invalid cursor"},
+    {"limit": 2, "cursor": "wrI6MQ"},  # non-ASCII digit
+    {"limit": 2, "cursor": "MjE0NzQ4MzY0ODox"},  # out of INTEGER range
 )
 
 
@@ -25,3 +42,96 @@ class TestGetTweetFeedEndpoint:
         assert response.json() == CORRECT_GET_TWEET_FEED_RESPONSE["tweet_feed"]
         assert (response.status_code ==
                 CORRECT_GET_TWEET_FEED_RESPONSE["status_code"])
+        assert_max_queries(response, "get_tweet_feed")
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_endpoint_streaming(
+        client: AsyncClient, init_test_data_for_db: None,
+    ) -> None:
+        response = await client.request(
+            method=get_tweet_feed_method,
+            url=get_tweet_feed_endpoint,
+            headers=AUTHORIZED_HEADER,
+        )
+        streamed_response = await client.request(
+            method=get_tweet_feed_method,
+            url=get_tweet_feed_endpoint,
+            headers=AUTHORIZED_HEADER,
+            params={"stream": True},
+        )
+        assert streamed_response.status_code == OK_STATUS_CODE
+        assert streamed_response.content == response.content
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_endpoint_not_modified(
+        client: AsyncClient, init_test_data_for_db: None,
+    ) -> None:
+        response = await client.request(
+            method=get_tweet_feed_method,
+            url=get_tweet_feed_endpoint,
+            headers=AUTHORIZED_HEADER,
+        )
+        etag = response.headers["ETag"]
+        response = await client.request(
+            method=get_tweet_feed_method,
+            url=get_tweet_feed_endpoint,
+            headers={**AUTHORIZED_HEADER, "If-None-Match": etag},
+        )
+        assert response.status_code == NOT_MODIFIED_STATUS_CODE
+        assert response.headers["ETag"] == etag
+        await client.request(
+            method=APPLICATION_ENDPOINTS["like_tweet"]["http_method"],
+            url=APPLICATION_ENDPOINTS["like_tweet"]["endpoint"].format(
+                id=TWEET_1["id"],
+            ),
+            headers={"api-key": test_user_2["name"]},
+        )
+        response = await client.request(
+            method=get_tweet_feed_method,
+            url=get_tweet_feed_endpoint,
+            headers={**AUTHORIZED_HEADER, "If-None-Match": etag},
+        )
+        assert response.status_code == OK_STATUS_CODE
+        assert response.headers["ETag"] != etag
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_endpoint_pagination(
+        client: AsyncClient, init_test_data_for_db: None,
+    ) -> None:
+        response = await client.request(
+            method=get_tweet_feed_method,
+            url=get_tweet_feed_endpoint,
+            headers=AUTHORIZED_HEADER,
+            params={"limit": 2},
+        )
+        first_page = response.json()
+        assert response.status_code == OK_STATUS_CODE
+        assert first_page["tweets"] == SORTED_TWEET_FEED[:2]
+        response = await client.request(
+            method=get_tweet_feed_method,
+            url=get_tweet_feed_endpoint,
+            headers=AUTHORIZED_HEADER,
+            params={"limit": 2, "cursor": first_page["next_cursor"]},
+        )
+        assert response.status_code == OK_STATUS_CODE
+        assert response.json() == {
+            "result": True, "tweets": SORTED_TWEET_FEED[2:],
+        }
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_endpoint_invalid_page_params(
+        client: AsyncClient, init_test_data_for_db: None,
+    ) -> None:
+        for i_params in invalid_page_params:
+            response = await client.request(
+                method=get_tweet_feed_method,
+                url=get_tweet_feed_endpoint,
+                headers=AUTHORIZED_HEADER,
+                params=i_params,
+            )
+            assert response.status_code == BAD_REQUEST_STATUS_CODE
+            assert response.json()["result"] is False
@@ -0,0 +1,74 @@
+"""Module for testing endpoint 'get tweet likes' from app.fastapi_app.py ."""
+
+from httpx import AsyncClient
+from pytest import mark as pytest_mark
+
+from .common import (
+    AUTHORIZED_HEADER,
+    BAD_REQUEST_STATUS_CODE,
+    APPLICATION_ENDPOINTS,
+    OK_STATUS_CODE,
+    SORTED_TWEET_FEED,
+    assert_max_queries,
+)
+
+get_tweet_likes_endpoint = (
+    APPLICATION_ENDPOINTS["get_tweet_likes"]["endpoint"]
+)
+get_tweet_likes_method = (
+    APPLICATION_ENDPOINTS["get_tweet_likes"]["http_method"]
+)
+invalid_page_params = (
+    {"limit": 0},
+    {"limit": "ten"},
+    {"limit": 2, "cursor": "invalid cursor"},
+    {"limit": 2, "cursor": "wrI"},  # non-ASCII digit
+    {"limit": 2, "cursor": "MjE0NzQ4MzY0OA"},  # out of INTEGER range
+)
+
+
+class TestGetTweetLikesEndpoint:
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_endpoint_pagination(
+        client: AsyncClient, init_test_data_for_db: None,
+    ) -> None:
+        tweet_details = SORTED_TWEET_FEED[0]
+        response = await client.request(
+            method=get_tweet_likes_method,
+            url=get_tweet_likes_endpoint.format(id=tweet_details["id"]),
+            headers=AUTHORIZED_HEADER,
+            params={"limit": 2},
+        )
+        first_page = response.json()
+        assert response.status_code == OK_STATUS_CODE
+        assert first_page["likes"] == tweet_details["likes"][:2]
+        response = await client.request(
+            method=get_tweet_likes_method,
+            url=get_tweet_likes_endpoint.format(id=tweet_details["id"]),
+            headers=AUTHORIZED_HEADER,
+            params={"limit": 2, "cursor": first_page["next_cursor"]},
+        )
+        assert response.status_code == OK_STATUS_CODE
+        assert response.json() == {
+            "result": True, "likes": tweet_details["likes"][2:],
+        }
+        assert_max_queries(response, "get_tweet_likes")
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_endpoint_invalid_page_params(
+        client: AsyncClient, init_test_data_for_db: None,
+    ) -> None:
+        for i_params in invalid_page_params:
+            response = await client.request(
+                method=get_tweet_likes_method,
+                url=get_tweet_likes_endpoint.format(
+                    id=SORTED_TWEET_FEED[0]["id"],
+                ),
+                headers=AUTHORIZED_HEADER,
+                params=i_params,
+            )
+            assert response.status_code == BAD_REQUEST_STATUS_CODE
+            assert response.json()["result"] is False
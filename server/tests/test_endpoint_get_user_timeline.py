@@ -0,0 +1,60 @@
+"""Module for testing endpoint 'get user timeline' from app.fastapi_app.py ."""
+
+from httpx import AsyncClient
+from pytest import mark as pytest_mark
+
+from .common import (
+    AUTHORIZED_HEADER,
+    BAD_REQUEST_STATUS_CODE,
+    CORRECT_GET_USER_TIMELINE_RESPONSE,
+    APPLICATION_ENDPOINTS,
+    assert_max_queries,
+)
+
+get_user_timeline_endpoint = (
+    APPLICATION_ENDPOINTS["get_user_timeline"]["endpoint"]
+)
+get_user_timeline_method = (
+    APPLICATION_ENDPOINTS["get_user_timeline"]["http_method"]
+)
+invalid_page_params = (
+    {"limit": 0},
+    {"limit": "ten"},
+    {"limit": 2, "cursor": "invalid cursor"},
+    {"limit": 2, "cursor": "wrI"},  # non-ASCII digit
+    {"limit": 2, "cursor": "MjE0NzQ4MzY0OA"},  # out of INTEGER range
+)
+
+
+class TestGetUserTimelineEndpoint:
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_endpoint_for_correct_response(
+        client: AsyncClient, init_test_data_for_db: None,
+    ) -> None:
+        response = await client.request(
+            method=get_user_timeline_method,
+            url=get_user_timeline_endpoint,
+            headers=AUTHORIZED_HEADER,
+        )
+        assert (response.json() ==
+                CORRECT_GET_USER_TIMELINE_RESPONSE["tweet_feed"])
+        assert (response.status_code ==
+                CORRECT_GET_USER_TIMELINE_RESPONSE["status_code"])
+        assert_max_queries(response, "get_user_timeline")
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_endpoint_invalid_page_params(
+        client: AsyncClient, init_test_data_for_db: None,
+    ) -> None:
+        for i_params in invalid_page_params:
+            response = await client.request(
+                method=get_user_timeline_method,
+                url=get_user_timeline_endpoint,
+                headers=AUTHORIZED_HEADER,
+                params=i_params,
+            )
+            assert response.status_code == BAD_REQUEST_STATUS_CODE
+            assert response.json()["result"] is False
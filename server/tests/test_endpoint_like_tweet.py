@@ -11,6 +11,7 @@ from .common import (
     ERROR_MESSAGE,
     APPLICATION_ENDPOINTS,
     test_user_1,
+    assert_max_queries,
 )
 
 like_tweet_endpoint = APPLICATION_ENDPOINTS["like_tweet"]["endpoint"]
@@ -76,6 +77,7 @@ class TestLikeTweetEndpoint:
         assert response.json() == user_can_like_tweet["result"]["message"]
         assert (response.status_code ==
                 user_can_like_tweet["result"]["status_code"])
+        assert_max_queries(response, "like_tweet")
 
     @staticmethod
     @pytest_mark.asyncio
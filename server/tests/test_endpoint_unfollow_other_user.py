@@ -11,6 +11,7 @@ from .common import (
     ERROR_MESSAGE,
     APPLICATION_ENDPOINTS,
     test_user_1,
+    assert_max_queries,
 )
 
 unfollow_user_endpoint = APPLICATION_ENDPOINTS["unfollow_user"]["endpoint"]
@@ -77,6 +78,7 @@ class TestUnfollowOtherUserEndpoint:
         assert response.json() == user_can_unfollow_user["result"]["message"]
         assert (response.status_code ==
                 user_can_unfollow_user["result"]["status_code"])
+        assert_max_queries(response, "unfollow_user")
 
     @staticmethod
     @pytest_mark.asyncio
@@ -6,6 +6,7 @@ from pytest import mark as pytest_mark
 from .common import (
     CORRECT_GET_OWN_PROFILE_RESPONSE,
     APPLICATION_ENDPOINTS,
+    assert_max_queries,
 )
 
 
@@ -25,3 +26,4 @@ class TestGetOwnProfileEndpoint:
         assert response.json() == CORRECT_GET_OWN_PROFILE_RESPONSE["profile"]
         assert (response.status_code ==
                 CORRECT_GET_OWN_PROFILE_RESPONSE["status_code"])
+        assert_max_queries(response, "get_own_profile")
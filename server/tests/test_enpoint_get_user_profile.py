@@ -9,6 +9,7 @@ from .common import (
     CORRECT_GET_USER_PROFILE_RESPONSE,
     ERROR_MESSAGE,
     APPLICATION_ENDPOINTS,
+    assert_max_queries,
 )
 
 get_user_profile_url = APPLICATION_ENDPOINTS["get_user_profile"]["endpoint"]
@@ -51,3 +52,4 @@ class TestGetUserProfileEndpoint:
         assert own_profile == CORRECT_GET_USER_PROFILE_RESPONSE["profile"]
         assert (response.status_code ==
                 CORRECT_GET_USER_PROFILE_RESPONSE["status_code"])
+        assert_max_queries(response, "get_user_profile")
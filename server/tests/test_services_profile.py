@@ -30,7 +30,7 @@ invalid_data_get_user_profile = {
     "result": unregister_response, "id": unexist_user["id"],
 }
 invalid_data_get_own_profile = {
-    "result": unregister_response, "api_key": unexist_user["name"],
+    "result": unregister_response, "user_id": unexist_user["id"],
 }
 
 
@@ -67,12 +67,12 @@ class TestServicesUser:
     @pytest_mark.asyncio
     async def test_get_own_profile(init_test_data_for_db: None) -> None:
         own_profile, status_code = await profile.get_own_profile(
-            CORRECT_GET_OWN_PROFILE_RESPONSE["profile"]["user"]["name"],
+            CORRECT_GET_OWN_PROFILE_RESPONSE["profile"]["user"]["id"],
         )
         assert own_profile == CORRECT_GET_OWN_PROFILE_RESPONSE["profile"]
         assert status_code == CORRECT_GET_OWN_PROFILE_RESPONSE["status_code"]
         message, status_code = await profile.get_own_profile(
-            invalid_data_get_own_profile["api_key"],
+            invalid_data_get_own_profile["user_id"],
         )
         assert (message.keys() ==
                 invalid_data_get_own_profile["result"]["message"].keys())
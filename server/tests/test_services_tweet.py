@@ -10,6 +10,8 @@ from .common import (
     ERROR_MESSAGE,
     FORBIDDEN_STATUS_CODE,
     LIKE_1_1,
+    OK_STATUS_CODE,
+    SORTED_TWEET_FEED,
     TWEET_1,
     TWEET_2,
     test_user_1,
@@ -146,3 +148,31 @@ class TestServicesTweet:
         assert (message["result"] ==
                 invalid_data_like_tweet["result"]["message"]["result"])
         assert status_code == invalid_data_like_tweet["result"]["status_code"]
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_tweet_likes(init_test_data_for_db: None) -> None:
+        tweet_details = SORTED_TWEET_FEED[0]
+        first_page, status_code = await tweet.get_tweet_likes(
+            tweet_details["id"], 2,
+        )
+        assert status_code == OK_STATUS_CODE
+        assert first_page["likes"] == tweet_details["likes"][:2]
+        second_page, status_code = await tweet.get_tweet_likes(
+            tweet_details["id"], 2, first_page["next_cursor"],
+        )
+        assert status_code == OK_STATUS_CODE
+        assert second_page["likes"] == tweet_details["likes"][2:]
+        assert second_page["next_cursor"] is None
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_tweet_likes_with_invalid_params(
+        init_test_data_for_db: None,
+    ) -> None:
+        for i_tweet_id, i_cursor in ((TWEET_1["id"], "invalid"), (404, None)):
+            message, status_code = await tweet.get_tweet_likes(
+                i_tweet_id, 2, i_cursor,
+            )
+            assert message.keys() == bad_request_response["message"].keys()
+            assert status_code == bad_request_response["status_code"]
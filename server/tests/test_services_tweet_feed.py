@@ -1,38 +1,302 @@
 """Module for testing logic for tweet feed from services/tweet_feed.py ."""
 
-from pytest import mark as pytest_mark
+from json import loads as json_loads
 
+from pytest import MonkeyPatch, mark as pytest_mark
+
+from app.cache import recent_writers_cache, tweet_feed_cache
 from app.models.tweets import Tweet
+from app.read_your_writes import primary_reads
+from app.schemas import AddTweetIn
 
-from ..app.services import tweet_feed
+from ..app.services import tweet, tweet_feed
 from .common import (
+    BAD_REQUEST_STATUS_CODE,
     CORRECT_GET_TWEET_FEED_RESPONSE,
     CORRECT_GET_TWEET_FEED_RESPONSE_2,
+    CORRECT_GET_USER_TIMELINE_RESPONSE,
+    ERROR_MESSAGE,
+    MEDIA_FILE_2,
+    MEDIA_FILE_3,
+    OK_STATUS_CODE,
     SORTED_TWEET_FEED,
+    test_user_1,
+    test_user_2,
 )
 
+PAGE_LIMIT = 2
+
 
 class TestServicesTweetFeed:
     @staticmethod
     @pytest_mark.asyncio
-    async def test_create_tweet_feed(init_test_data_for_db: None) -> None:
-        all_sorted_tweets = await Tweet.get_all_tweets_sorted_by_likes()
-        tweet_feed_data = await tweet_feed.create_tweet_feed(all_sorted_tweets)
+    async def test_create_tweet_feed_from_rows(
+        init_test_data_for_db: None,
+    ) -> None:
+        all_tweets = await Tweet.get_all_tweet_feed_rows_sorted_by_likes()
+        tweet_feed_data = await tweet_feed.create_tweet_feed_from_rows(
+            all_tweets,
+        )
         assert tweet_feed_data == SORTED_TWEET_FEED
 
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_create_tweet_feed_keeps_attachments_order(
+        init_test_data_for_db: None,
+    ) -> None:
+        tweet_id = await Tweet.add_tweet(
+            author_name=test_user_2["name"],
+            tweet_data="tweet with reversed media ids",
+            tweet_media_ids=[MEDIA_FILE_3["id"], MEDIA_FILE_2["id"]],
+        )
+        all_tweets = await Tweet.get_all_tweet_feed_rows_sorted_by_likes()
+        tweet_feed_data = await tweet_feed.create_tweet_feed_from_rows(
+            all_tweets,
+        )
+        new_tweet_details = next(
+            i_tweet for i_tweet in tweet_feed_data if i_tweet["id"] == tweet_id
+        )
+        assert new_tweet_details["attachments"] == [
+            MEDIA_FILE_3["file_name"], MEDIA_FILE_2["file_name"],
+        ]
+
     @staticmethod
     @pytest_mark.asyncio
     async def test_get_full_tweet_feed(init_test_data_for_db: None) -> None:
-        tweet_feed_data, status_code = await tweet_feed.get_full_tweet_feed()
+        tweet_feed_data, status_code, _ = (
+            await tweet_feed.get_full_tweet_feed()
+        )
         assert tweet_feed_data == CORRECT_GET_TWEET_FEED_RESPONSE["tweet_feed"]
         assert status_code == CORRECT_GET_TWEET_FEED_RESPONSE["status_code"]
 
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_full_tweet_feed_with_likes_limit(
+        init_test_data_for_db: None,
+    ) -> None:
+        tweet_feed_data, status_code, _ = await tweet_feed.get_full_tweet_feed(
+            likes_limit=1,
+        )
+        assert status_code == OK_STATUS_CODE
+        assert tweet_feed_data["tweets"] == [
+            {
+                **i_tweet,
+                "likes": i_tweet["likes"][:1],
+                "like_count": len(i_tweet["likes"]),
+            }
+            for i_tweet in SORTED_TWEET_FEED
+        ]
+
     @staticmethod
     @pytest_mark.asyncio
     async def test_get_full_tweet_feed_from_empty_tables(
             clear_test_db_tables: None,
     ) -> None:
-        tweet_feed_data, status_code = await tweet_feed.get_full_tweet_feed()
+        tweet_feed_data, status_code, _ = (
+            await tweet_feed.get_full_tweet_feed()
+        )
         assert (tweet_feed_data ==
                 CORRECT_GET_TWEET_FEED_RESPONSE_2["tweet_feed"])
         assert status_code == CORRECT_GET_TWEET_FEED_RESPONSE_2["status_code"]
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_stream_full_tweet_feed(init_test_data_for_db: None) -> None:
+        tweet_feed_data, *_ = await tweet_feed.get_full_tweet_feed()
+        fragments = [
+            i_fragment
+            async for i_fragment in tweet_feed.stream_full_tweet_feed(
+                chunk_size=PAGE_LIMIT,
+            )
+        ]
+        assert "".join(fragments) == tweet_feed.dump_json(tweet_feed_data)
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_stream_full_tweet_feed_from_empty_tables(
+            clear_test_db_tables: None,
+    ) -> None:
+        fragments = [
+            i_fragment
+            async for i_fragment in tweet_feed.stream_full_tweet_feed()
+        ]
+        assert json_loads("".join(fragments)) == (
+            CORRECT_GET_TWEET_FEED_RESPONSE_2["tweet_feed"]
+        )
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_tweet_feed_page(init_test_data_for_db: None) -> None:
+        first_page, status_code = await tweet_feed.get_tweet_feed_page(
+            PAGE_LIMIT,
+        )
+        assert status_code == OK_STATUS_CODE
+        assert first_page["tweets"] == SORTED_TWEET_FEED[:PAGE_LIMIT]
+        assert isinstance(first_page["next_cursor"], str)
+        second_page, status_code = await tweet_feed.get_tweet_feed_page(
+            PAGE_LIMIT, first_page["next_cursor"],
+        )
+        assert status_code == OK_STATUS_CODE
+        assert second_page["tweets"] == SORTED_TWEET_FEED[PAGE_LIMIT:]
+        assert second_page["next_cursor"] is None
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_tweet_feed_page_with_invalid_cursor(
+        init_test_data_for_db: None,
+    ) -> None:
+        message, status_code = await tweet_feed.get_tweet_feed_page(
+            PAGE_LIMIT, "invalid cursor",
+        )
+        assert message.keys() == ERROR_MESSAGE.keys()
+        assert status_code == BAD_REQUEST_STATUS_CODE
+
+    @staticmethod
+    def test_encode_and_decode_feed_cursor() -> None:
+        cursor = tweet_feed.encode_feed_cursor(3, 12)
+        assert tweet_feed.decode_feed_cursor(cursor) == (3, 12)
+        assert tweet_feed.decode_feed_cursor(cursor, position_size=1) is None
+        assert tweet_feed.decode_feed_cursor("not_a_cursor") is None
+        assert tweet_feed.decode_feed_cursor("wrI6MQ") is None
+        cursor = tweet_feed.encode_feed_cursor(2 ** 31, 12)
+        assert tweet_feed.decode_feed_cursor(cursor) is None
+        cursor = tweet_feed.encode_feed_cursor(12)
+        assert tweet_feed.decode_feed_cursor(cursor, position_size=1) == (12,)
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_full_tweet_feed_cache(init_test_data_for_db: None) -> None:
+        await tweet_feed.get_full_tweet_feed()
+        hits = tweet_feed_cache.hits
+        tweet_feed_data, *_ = await tweet_feed.get_full_tweet_feed()
+        assert tweet_feed_cache.hits == hits + 1
+        assert tweet_feed_data == CORRECT_GET_TWEET_FEED_RESPONSE["tweet_feed"]
+        new_tweet, _ = await tweet.add_tweet(
+            test_user_2["name"], AddTweetIn(tweet_data="new tweet"),
+        )
+        tweet_feed_data, *_ = await tweet_feed.get_full_tweet_feed()
+        assert tweet_feed_cache.hits == hits + 1
+        assert new_tweet["tweet_id"] in {
+            i_tweet["id"] for i_tweet in tweet_feed_data["tweets"]
+        }
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_full_tweet_feed_invalidated_while_built(
+        init_test_data_for_db: None, monkeypatch: MonkeyPatch,
+    ) -> None:
+        get_tweets = Tweet.get_all_tweet_feed_rows_sorted_by_likes
+
+        async def get_tweets_and_invalidate_cache() -> list:
+            tweets = await get_tweets()
+            tweet_feed.invalidate_tweet_feed_cache()
+            return tweets
+
+        monkeypatch.setattr(
+            Tweet,
+            "get_all_tweet_feed_rows_sorted_by_likes",
+            get_tweets_and_invalidate_cache,
+        )
+        tweet_feed_data, *_ = await tweet_feed.get_full_tweet_feed()
+        assert tweet_feed_data == CORRECT_GET_TWEET_FEED_RESPONSE["tweet_feed"]
+        assert tweet_feed_cache.get(("full", None)) is None
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_full_tweet_feed_cache_bypassed_by_primary_reads(
+        init_test_data_for_db: None,
+    ) -> None:
+        tweet_feed.invalidate_tweet_feed_cache()
+        token = primary_reads.set(True)
+        await tweet_feed.get_full_tweet_feed()
+        tweet_feed_data, *_ = await tweet_feed.get_full_tweet_feed()
+        primary_reads.reset(token)
+        assert tweet_feed_data == CORRECT_GET_TWEET_FEED_RESPONSE["tweet_feed"]
+        assert not len(tweet_feed_cache)
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_full_tweet_feed_from_replica_cached_after_window(
+        init_test_data_for_db: None, monkeypatch: MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(tweet_feed, "is_replica_read", lambda: True)
+        tweet_feed.invalidate_tweet_feed_cache()
+        await tweet_feed.get_full_tweet_feed()
+        assert not len(tweet_feed_cache)
+        monkeypatch.setattr(
+            tweet_feed.tweet_feed_version,
+            "changed_at",
+            tweet_feed.tweet_feed_version.changed_at - recent_writers_cache.ttl,
+        )
+        await tweet_feed.get_full_tweet_feed()
+        assert tweet_feed_cache.get(("full", None)) is not None
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_full_tweet_feed_etag(init_test_data_for_db: None) -> None:
+        *_, etag = await tweet_feed.get_full_tweet_feed()
+        *_, cached_etag = await tweet_feed.get_full_tweet_feed()
+        assert cached_etag == etag
+        *_, limited_etag = await tweet_feed.get_full_tweet_feed(likes_limit=1)
+        assert limited_etag != etag
+        assert tweet_feed.is_matched_etag(etag, etag)
+        assert tweet_feed.is_matched_etag(f'"old", W/{etag}', etag)
+        assert tweet_feed.is_matched_etag("*", etag)
+        assert not tweet_feed.is_matched_etag(None, etag)
+        tweet_feed.invalidate_tweet_feed_cache()
+        *_, rebuilt_etag = await tweet_feed.get_full_tweet_feed()
+        assert rebuilt_etag == etag
+        await tweet.add_tweet(
+            test_user_2["name"], AddTweetIn(tweet_data="new tweet"),
+        )
+        *_, changed_etag = await tweet_feed.get_full_tweet_feed()
+        assert not tweet_feed.is_matched_etag(etag, changed_etag)
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_user_tweet_feed(init_test_data_for_db: None) -> None:
+        tweet_feed_data, status_code = await tweet_feed.get_user_tweet_feed(
+            test_user_1["id"], PAGE_LIMIT,
+        )
+        correct_tweet_feed = CORRECT_GET_USER_TIMELINE_RESPONSE["tweet_feed"]
+        assert tweet_feed_data["tweets"] == correct_tweet_feed["tweets"]
+        assert tweet_feed_data["next_cursor"] is None
+        assert status_code == CORRECT_GET_USER_TIMELINE_RESPONSE["status_code"]
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_user_tweet_feed_pages(
+        init_test_data_for_db: None,
+    ) -> None:
+        new_tweet_ids = []
+        for i_tweet_data in ("new tweet 1", "new tweet 2"):
+            new_tweet, _ = await tweet.add_tweet(
+                test_user_2["name"], AddTweetIn(tweet_data=i_tweet_data),
+            )
+            new_tweet_ids.append(new_tweet["tweet_id"])
+        first_page, status_code = await tweet_feed.get_user_tweet_feed(
+            test_user_1["id"], PAGE_LIMIT,
+        )
+        assert status_code == OK_STATUS_CODE
+        assert [i_tweet["id"] for i_tweet in first_page["tweets"]] == (
+            new_tweet_ids[::-1]
+        )
+        second_page, status_code = await tweet_feed.get_user_tweet_feed(
+            test_user_1["id"], PAGE_LIMIT, first_page["next_cursor"],
+        )
+        assert status_code == OK_STATUS_CODE
+        assert second_page["tweets"] == (
+            CORRECT_GET_USER_TIMELINE_RESPONSE["tweet_feed"]["tweets"]
+        )
+        assert second_page["next_cursor"] is None
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_get_user_tweet_feed_with_invalid_params(
+        init_test_data_for_db: None,
+    ) -> None:
+        message, status_code = await tweet_feed.get_user_tweet_feed(
+            test_user_1["id"], PAGE_LIMIT, "invalid cursor",
+        )
+        assert message.keys() == ERROR_MESSAGE.keys()
+        assert status_code == BAD_REQUEST_STATUS_CODE
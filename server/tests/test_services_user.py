@@ -2,12 +2,17 @@
 
 from pytest import mark as pytest_mark
 
+from app.models.timelines import FAN_OUT_MAX_FOLLOWERS, Timeline
+from app.models.tweets import Tweet
+from app.models.users import User
 from ..app.services import user
 from .common import (
     BAD_REQUEST_STATUS_CODE,
     CREATED_STATUS_CODE,
     ERROR_MESSAGE,
     test_user_1,
+    test_user_2,
+    test_user_3,
 )
 
 unregister_response = {
@@ -17,49 +22,35 @@ bad_request_response = {
             "message": ERROR_MESSAGE, "status_code": BAD_REQUEST_STATUS_CODE,
         }
 user_can_follow_user = {
-    "api_key": test_user_1["name"],
+    "own_id": test_user_1["id"],
     "followed_id": 3,
     "result": {"message": None, "status_code": CREATED_STATUS_CODE},
 }
-unexist_user = {
-    "id": 0,
-    "name": "unexsit_user",
-}
 user_cannot_follow_user = (
     {
-        "api_key": test_user_1["name"],  # user has already followed him
+        "own_id": test_user_1["id"],  # user has already followed him
         "followed_id": test_user_1["followed"][0]["id"],
         "result": bad_request_response,
     },
     {
-        "api_key": unexist_user["name"],
-        "followed_id": test_user_1["followed"][0]["id"],
-        "result": unregister_response,
-    },
-    {
-        "api_key": test_user_1["name"],
+        "own_id": test_user_1["id"],
         "followed_id": 0,  # followed user is not existed
         "result": unregister_response,
     },
 )
 user_can_unfollow_user = {
-    "api_key": test_user_1["name"],
+    "own_id": test_user_1["id"],
     "followed_id": test_user_1["followed"][0]["id"],
     "result": {"message": None, "status_code": CREATED_STATUS_CODE},
 }
 user_cannot_unfollow_user = (
     {
-        "api_key": test_user_1["name"],  # user does not follow him
+        "own_id": test_user_1["id"],  # user does not follow him
         "followed_id": 3,
         "result": bad_request_response,
     },
     {
-        "api_key": unexist_user["name"],
-        "followed_id": test_user_1["followed"][0]["id"],
-        "result": unregister_response,
-    },
-    {
-        "api_key": test_user_1["name"],
+        "own_id": test_user_1["id"],
         "followed_id": 0,  # followed user is not existed
         "result": unregister_response,
     },
@@ -71,14 +62,14 @@ class TestServiceUser:
     @pytest_mark.asyncio
     async def test_follow_other_user(init_test_data_for_db: None) -> None:
         message, status_code = await user.follow_other_user(
-            user_can_follow_user["api_key"],
+            user_can_follow_user["own_id"],
             user_can_follow_user["followed_id"],
         )
         assert message == user_can_follow_user["result"]["message"]
         assert status_code == user_can_follow_user["result"]["status_code"]
         for i_data in user_cannot_follow_user:
             message, status_code = await user.follow_other_user(
-                i_data["api_key"], i_data["followed_id"],
+                i_data["own_id"], i_data["followed_id"],
             )
             assert message.keys() == i_data["result"]["message"].keys()
             assert message["result"] == i_data["result"]["message"]["result"]
@@ -88,15 +79,42 @@ class TestServiceUser:
     @pytest_mark.asyncio
     async def test_unfollow_other_user(init_test_data_for_db: None) -> None:
         message, status_code = await user.unfollow_user(
-            user_can_unfollow_user["api_key"],
+            user_can_unfollow_user["own_id"],
             user_can_unfollow_user["followed_id"],
         )
         assert message == user_can_unfollow_user["result"]["message"]
         assert status_code == user_can_unfollow_user["result"]["status_code"]
         for i_data in user_cannot_unfollow_user:
             message, status_code = await user.unfollow_user(
-                i_data["api_key"], i_data["followed_id"],
+                i_data["own_id"], i_data["followed_id"],
             )
             assert message.keys() == i_data["result"]["message"].keys()
             assert message["result"] == i_data["result"]["message"]["result"]
             assert status_code == i_data["result"]["status_code"]
+
+    @staticmethod
+    @pytest_mark.asyncio
+    async def test_unfollow_celebrity_pushes_his_tweets(
+        init_test_data_for_db: None,
+    ) -> None:
+        max_followers = 1
+        await User.follow_other_user(test_user_3["id"], test_user_2["id"])
+        tweet_id = await Tweet.add_tweet(
+            author_name=test_user_2["name"], tweet_data="celebrity tweet",
+        )
+        await Timeline.fan_out_tweet(
+            test_user_2["name"], tweet_id, max_followers=max_followers,
+        )
+        # nobody is a celebrity, so only tweets pushed on write are read
+        pushed_tweet_ids = await Timeline.get_tweet_ids(
+            test_user_1["id"], limit=10, max_followers=FAN_OUT_MAX_FOLLOWERS,
+        )
+        assert tweet_id not in pushed_tweet_ids
+        _, status_code = await user.unfollow_user(
+            test_user_3["id"], test_user_2["id"], max_followers,
+        )
+        assert status_code == CREATED_STATUS_CODE
+        pushed_tweet_ids = await Timeline.get_tweet_ids(
+            test_user_1["id"], limit=10, max_followers=FAN_OUT_MAX_FOLLOWERS,
+        )
+        assert tweet_id in pushed_tweet_ids